@@ -162,11 +162,11 @@ def create_tables(cursor):
 def migrate_config(cursor, data):
     print("Migrating game_config.json...")
     for key, value in data.items():
-        # If the value is a dictionary or list, store it as a JSON string
-        if isinstance(value, (dict, list)):
-            value_to_store = json.dumps(value)
+        # Store everything but plain strings as JSON, so booleans load back as booleans
+        if isinstance(value, str):
+            value_to_store = value
         else:
-            value_to_store = str(value)
+            value_to_store = json.dumps(value)
         cursor.execute("INSERT OR REPLACE INTO game_config (key, value) VALUES (?, ?)", (key, value_to_store))
     print(f"{cursor.rowcount} config entries migrated.")
 
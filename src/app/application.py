@@ -92,7 +92,13 @@ class ApplicationWindow(QMainWindow, GeometryManagerMixin):
         # --- Create long-lived application components ---
         self.data_manager = DataManager()
         self.signals = GameSignals()
-        self.save_manager = SaveManager()
+        game_config = self.data_manager.game_config
+        self.save_manager = SaveManager(
+            in_memory=game_config.get("live_session_in_memory", False),
+            checkpoint_interval=game_config.get("live_session_checkpoint_seconds", 60),
+            delta_saves=game_config.get("delta_saves", False),
+            compress_saves=game_config.get("save_compression", False)
+        )
 
         # --- Create the Composition Root for services ---
         self.service_container = ServiceContainer(self.data_manager, self.save_manager, self.signals)
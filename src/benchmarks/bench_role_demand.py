@@ -0,0 +1,57 @@
+"""
+Benchmarks pricing the eligible talent for a role, as the casting dialog does on opening.
+
+Usage (from src/):
+    python -m benchmarks.bench_role_demand [--sizes 1000 10000] [--sample 200]
+
+"scalar" calls calculate_talent_demand once per candidate, as the dialog
+did before calculate_role_demands; it is timed on `--sample` candidates
+and projected to all of them. "batch" is calculate_role_demands for every
+candidate and "kernel" its NumPy step, calculate_demands, on its own.
+The world and role are those of bench_role_eligibility.
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.bench_role_eligibility import CONFIG, DATA_MANAGER, populate_role
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from services.calculation.talent_availability_checker import TalentAvailabilityChecker
+from services.calculation.talent_demand_calculator import TalentDemandCalculator
+from services.query.game_query_service import GameQueryService
+from services.query.talent_query_service import TalentQueryService
+
+def run(sizes, sample: int):
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    rows = []
+    for size in sizes:
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, size)
+            populate_role(session_factory, size)
+            calculator = TalentDemandCalculator(session_factory, DATA_MANAGER, GameQueryService(session_factory), CONFIG, checker)
+            talent_ids = [row.id for row in TalentQueryService(session_factory, DATA_MANAGER, calculator, None, CONFIG,
+                                                               checker).get_eligible_talent_for_role(1, 1)]
+
+            elapsed = []
+            with timer(elapsed):
+                scalar = {talent_id: calculator.calculate_talent_demand(talent_id, 1, 1) for talent_id in talent_ids[:sample]}
+            with timer(elapsed):
+                batch = calculator.calculate_role_demands(1, 1, talent_ids)
+            assert all(batch[talent_id] == demand for talent_id, demand in scalar.items())
+
+            rng = np.random.default_rng(size)
+            arrays = (rng.uniform(0, 100, len(talent_ids)), rng.integers(1, 11, len(talent_ids)),
+                      rng.uniform(0, 200, len(talent_ids)), rng.uniform(0, 2, (len(talent_ids), 2)))
+            with timer(elapsed):
+                calculator.calculate_demands(*arrays, 1.7)
+
+            scalar_ms = elapsed[0] * 1000 / len(scalar) * len(talent_ids)
+            rows.append([size, len(talent_ids), f"{scalar_ms:,.0f}", f"{elapsed[1] * 1000:,.1f}", f"{elapsed[2] * 1000:,.2f}"])
+    print_table(["talents", "candidates", "scalar ms", "batch ms", "kernel ms"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.sample)
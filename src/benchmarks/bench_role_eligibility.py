@@ -0,0 +1,105 @@
+"""
+Benchmarks finding the eligible talent for a role, as the casting dialog does on opening.
+
+Usage (from src/):
+    python -m benchmarks.bench_role_eligibility [--sizes 1000 10000 50000] [--repeat 5]
+
+"per-talent" narrows candidates with candidate_filters, loads them as
+TalentDB objects with popularity and chemistry and runs check() on each,
+as get_eligible_talent_for_role did before the batch path. "batch" is the
+current get_eligible_talent_for_role. A tenth of the pool has a hard limit
+against the role and a tenth refuses it. Eligible counts differ slightly
+between paths because the low-tier pickiness rolls draw in a different order.
+"""
+import argparse
+import random
+from statistics import mean
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from data.game_state import Scene
+from database.db_models import (SceneDB, ShootingBlocDB, VirtualPerformerDB, ActionSegmentDB, SlotAssignmentDB,
+                                TalentDB, TalentHardLimitDB, TalentTagPreferenceDB)
+from services.calculation.talent_availability_checker import TalentAvailabilityChecker
+from services.query.talent_query_service import TalentQueryService
+
+CONFIG = SimpleNamespace(concurrency_default_limit=3, refusal_threshold=0.3, orientation_refusal_threshold=0.1,
+                         pickiness_popularity_scalar=0.05, pickiness_ambition_scalar=1.0,
+                         base_talent_demand=400, demand_perf_divisor=100.0, median_ambition=5.0,
+                         ambition_demand_divisor=10.0, popularity_demand_scalar=0.01, minimum_talent_demand=100)
+DATA_MANAGER = SimpleNamespace(
+    tag_definitions={'Anal': {'name': 'Anal', 'concept': 'Anal'}, 'Kissing': {'name': 'Kissing'}},
+    on_set_policies_data={'policy_condoms': {'id': 'policy_condoms', 'name': 'Condoms'}},
+    production_settings_data={'Camera': [{'tier_name': 'Budget', 'is_low_tier': True},
+                                         {'tier_name': 'Standard'}]},
+)
+
+def populate_role(session_factory, talent_count: int):
+    rng = random.Random(talent_count)
+    with session_factory() as session:
+        session.add(ShootingBlocDB(id=1, name="Bloc", scheduled_week=2, scheduled_year=2010,
+                                   production_settings={'Camera': 'Budget'}, on_set_policies=['policy_condoms']))
+        session.add(SceneDB(id=1, bloc_id=1, title="Scene", status='casting'))
+        session.add_all([VirtualPerformerDB(id=1, scene_id=1, name="Her", gender="Female", ethnicity="Any"),
+                         VirtualPerformerDB(id=2, scene_id=1, name="Him", gender="Male", ethnicity="Any")])
+        session.add_all([
+            ActionSegmentDB(id=1, scene_id=1, tag_name="Anal", runtime_percentage=60, parameters={'Giver': 1, 'Receiver': 1}),
+            ActionSegmentDB(id=2, scene_id=1, tag_name="Kissing", runtime_percentage=40, parameters={}),
+        ])
+        session.add_all([SlotAssignmentDB(segment_id=1, slot_id="Anal_Receiver_1", virtual_performer_id=1),
+                         SlotAssignmentDB(segment_id=1, slot_id="Anal_Giver_1", virtual_performer_id=2),
+                         SlotAssignmentDB(segment_id=2, slot_id="Kissing_Performer_1", virtual_performer_id=1),
+                         SlotAssignmentDB(segment_id=2, slot_id="Kissing_Performer_2", virtual_performer_id=2)])
+        limits, preferences = [], []
+        for talent_id in range(1, talent_count + 1):
+            roll = rng.random()
+            if roll < 0.1:
+                limits.append({'talent_id': talent_id, 'tag': 'Anal'})
+            elif roll < 0.2:
+                preferences.append({'talent_id': talent_id, 'tag': 'Anal', 'role': 'Receiver', 'score': 0.2})
+        if limits:
+            session.execute(insert(TalentHardLimitDB), limits)
+        if preferences:
+            session.execute(insert(TalentTagPreferenceDB), preferences)
+        session.commit()
+
+def eligible_per_talent(session_factory, checker: TalentAvailabilityChecker):
+    with session_factory() as session:
+        scene = session.get(SceneDB, 1).to_dataclass(Scene)
+        bloc_db = session.get(ShootingBlocDB, 1)
+        candidates = session.query(TalentDB).options(
+            selectinload(TalentDB.popularity_scores),
+            selectinload(TalentDB.chemistry_a),
+            selectinload(TalentDB.chemistry_b)
+        ).filter(TalentDB.gender == "Female", *checker.candidate_filters(scene, 1, bloc_db)).all()
+        eligible = [t for t in candidates if checker.check(t, scene, 1, bloc_db).is_available]
+        return sorted(eligible, key=lambda t: t.alias)
+
+def run(sizes, repeat: int):
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    rows = []
+    for size in sizes:
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, size)
+            populate_role(session_factory, size)
+            service = TalentQueryService(session_factory, DATA_MANAGER, None, None, CONFIG, checker)
+            paths = (("per-talent", lambda: eligible_per_talent(session_factory, checker)),
+                     ("batch", lambda: service.get_eligible_talent_for_role(1, 1)))
+            for name, find in paths:
+                elapsed = []
+                for _ in range(repeat):
+                    random.seed(size)
+                    with timer(elapsed):
+                        eligible = find()
+                rows.append([size, name, len(eligible), f"{mean(elapsed) * 1000:.1f}"])
+    print_table(["talents", "path", "eligible", "ms"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,65 @@
+"""
+Benchmarks full-copy autosaves against the delta SaveStore across talent pool sizes.
+
+Usage (from src/):
+    python -m benchmarks.bench_save_store [--sizes 1000 10000 50000] [--saves 8]
+
+Each round plays one week of talent updates and then autosaves. Reports the
+mean bytes written per autosave and the mean time to load one back into a
+live session file, for a full .sqlite copy and for the store with and
+without compression.
+"""
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+from statistics import mean
+from types import SimpleNamespace
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from data.save_store import SaveStore
+from services.command.talent_command_service import TalentCommandService
+from services.calculation.talent_affinity_calculator import TalentAffinityCalculator
+
+def run(sizes, saves: int):
+    config = SimpleNamespace(popularity_gain_scalar=0.05, age_based_affinity_rules=[])
+    service = TalentCommandService(None, config, TalentAffinityCalculator(config))
+    rows = []
+    for size in sizes:
+        with temp_session_factory() as session_factory, tempfile.TemporaryDirectory() as save_dir:
+            save_dir = Path(save_dir)
+            populate_world(session_factory, size)
+            db_path = session_factory.kw['bind'].url.database
+            stores = {'delta': SaveStore(save_dir / "raw.db"), 'delta+zlib': SaveStore(save_dir / "zlib.db", compress=True)}
+            written = {'full copy': [], **{name: [] for name in stores}}
+            loads = {name: [] for name in written}
+
+            for week in range(1, saves + 1):
+                with session_factory() as session:
+                    service.process_weekly_updates(session, 2010 * 52 + week, new_year=False)
+                    session.commit()
+                slot = f"autosave_{week % 4}"
+                shutil.copyfile(db_path, save_dir / f"{slot}.sqlite")
+                written['full copy'].append(Path(db_path).stat().st_size)
+                for name, store in stores.items():
+                    written[name].append(store.write_slot(slot, db_path).bytes_written)
+
+            live_path = save_dir / "session.sqlite"
+            for week in range(1, saves + 1):
+                slot = f"autosave_{week % 4}"
+                with timer(loads['full copy']):
+                    shutil.copyfile(save_dir / f"{slot}.sqlite", live_path)
+                for name, store in stores.items():
+                    with timer(loads[name]):
+                        store.restore_slot(slot, live_path)
+
+            for name in written:
+                rows.append([size, name, f"{mean(written[name]) / 1024:,.1f}", f"{mean(loads[name]) * 1000:.2f}"])
+    print_table(["talents", "format", "KB written/save", "load ms"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--saves", type=int, default=8)
+    args = parser.parse_args()
+    run(args.sizes, args.saves)
@@ -0,0 +1,75 @@
+"""
+Benchmarks loading the scenes tab's list of shot and released scenes.
+
+Usage (from src/):
+    python -m benchmarks.bench_scene_list [--scenes 100 500 2000] [--talents 2000]
+
+"orm" loads every scene with populate_existing, converts it to a Scene and
+looks up each cast member with get_talent_by_id, as the scenes tab did
+before SceneListRow. "rows" is the current get_shot_scenes. Both run
+without the query cache and count the SQL statements they issue.
+"""
+import argparse
+import random
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from data.game_state import Scene
+from database.db_models import SceneDB, SceneCastDB, VirtualPerformerDB
+from services.query.game_query_service import GameQueryService
+
+CAST_SIZE = 3
+
+def populate_scenes(session_factory, scene_count: int, talent_count: int):
+    rng = random.Random(scene_count)
+    scenes, performers, cast = [], [], []
+    for scene_id in range(1, scene_count + 1):
+        scenes.append({'id': scene_id, 'title': f"Scene {scene_id}", 'status': 'released', 'focus_target': 'Men',
+                       'scheduled_week': rng.randint(1, 52), 'scheduled_year': 2010, 'revenue': rng.randint(0, 100000)})
+        for slot, talent_id in enumerate(rng.sample(range(1, talent_count + 1), CAST_SIZE)):
+            vp_id = scene_id * CAST_SIZE + slot
+            performers.append({'id': vp_id, 'scene_id': scene_id, 'name': f"VP {slot}", 'gender': "Female", 'ethnicity': "Any"})
+            cast.append({'scene_id': scene_id, 'virtual_performer_id': vp_id, 'talent_id': talent_id, 'salary': 1000})
+    with session_factory() as session:
+        session.execute(insert(SceneDB), scenes)
+        session.execute(insert(VirtualPerformerDB), performers)
+        session.execute(insert(SceneCastDB), cast)
+        session.commit()
+
+def load_orm(service: GameQueryService):
+    with service.session_factory() as session:
+        scenes = [s.to_dataclass(Scene) for s in session.query(SceneDB).populate_existing().options(
+            selectinload(SceneDB.performer_contributions_rel)
+        ).filter(SceneDB.status.in_(['shot', 'in_editing', 'ready_to_release', 'released'])).all()]
+    for scene in scenes:
+        ", ".join(service.get_talent_by_id(talent_id).alias for talent_id in scene.final_cast.values())
+    return scenes
+
+def load_rows(service: GameQueryService):
+    return service.get_shot_scenes()
+
+def run(scene_counts, talent_count: int):
+    rows = []
+    for scene_count in scene_counts:
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, talent_count)
+            populate_scenes(session_factory, scene_count, talent_count)
+            statements = []
+            event.listen(session_factory.kw['bind'], 'before_cursor_execute', lambda *args: statements.append(args[2]))
+            service = GameQueryService(session_factory)
+            for name, load in (("orm", load_orm), ("rows", load_rows)):
+                elapsed = []
+                statements.clear()
+                with timer(elapsed):
+                    load(service)
+                rows.append([scene_count, name, len(statements), f"{elapsed[0] * 1000:,.1f}"])
+    print_table(["scenes", "path", "queries", "ms"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--talents", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.scenes, args.talents)
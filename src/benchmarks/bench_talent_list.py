@@ -0,0 +1,54 @@
+"""
+Benchmarks loading the talent tab's list.
+
+Usage (from src/):
+    python -m benchmarks.bench_talent_list [--sizes 1000 10000 50000]
+
+"orm" loads TalentDB objects with their popularity and chemistry eagerly,
+as get_filtered_talents did before TalentListRow, and sums popularity in
+Python. "rows" is the current projection query. Memory is the peak traced
+allocation while loading and the size kept alive by the returned list.
+"""
+import argparse
+import tracemalloc
+
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from database.db_models import TalentDB
+from services.query.game_query_service import GameQueryService
+
+def load_orm(session_factory):
+    with session_factory() as session:
+        talents = session.query(TalentDB).options(
+            selectinload(TalentDB.popularity_scores),
+            selectinload(TalentDB.chemistry_a),
+            selectinload(TalentDB.chemistry_b)
+        ).order_by(TalentDB.alias).all()
+        popularity = {t.id: round(sum(p.score for p in t.popularity_scores)) for t in talents}
+    return talents, popularity
+
+def load_rows(session_factory):
+    return GameQueryService(session_factory).get_filtered_talents({})
+
+def run(sizes):
+    rows = []
+    for size in sizes:
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, size)
+            for name, load in (("orm", load_orm), ("rows", load_rows)):
+                elapsed = []
+                tracemalloc.start()
+                with timer(elapsed):
+                    result = load(session_factory)
+                kept, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del result
+                rows.append([size, name, f"{elapsed[0]:.3f}", f"{peak / 2**20:,.1f}", f"{kept / size:,.0f}"])
+    print_table(["talents", "path", "seconds", "peak MB", "kept B/talent"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+    run(args.sizes)
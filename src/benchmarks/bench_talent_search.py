@@ -0,0 +1,55 @@
+"""
+Benchmarks talent name search, as typed into the talent tab and casting dialog.
+
+Usage (from src/):
+    python -m benchmarks.bench_talent_search [--talents 100000] [--repeat 20]
+
+"scan" is the LIKE '%text%' filter over the talents table that name search
+used before the alias index; "index" is the FTS5 trigram search. Queries of
+one or two characters are too short for a trigram and take the scan path
+either way.
+"""
+import argparse
+import random
+
+from sqlalchemy import update
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from database.db_models import TalentDB
+from database.migrations import run_migrations
+from database.talent_search import search_alias_ids
+
+SYLLABLES = ["ka", "ri", "na", "so", "lee", "mar", "ta", "vo", "el", "an", "ja", "de", "bel", "ro"]
+QUERIES = ["ka", "kar", "karina", "marbel so", "zzq"]
+
+def _alias(rng: random.Random) -> str:
+    first = "".join(rng.choice(SYLLABLES) for _ in range(3)).title()
+    last = "".join(rng.choice(SYLLABLES) for _ in range(3)).title()
+    return f"{first} {last}"
+
+def run(talent_count: int, repeat: int):
+    rows = []
+    with temp_session_factory() as session_factory:
+        populate_world(session_factory, talent_count)
+        run_migrations(session_factory.kw['bind'])
+        rng = random.Random(talent_count)
+        with session_factory() as session:
+            session.execute(update(TalentDB), [{'id': i, 'alias': _alias(rng)} for i in range(1, talent_count + 1)])
+            session.commit()
+
+        with session_factory() as session:
+            for query in QUERIES:
+                for name, indexed in (("scan", False), ("index", True)):
+                    elapsed = []
+                    with timer(elapsed):
+                        for _ in range(repeat):
+                            matches = search_alias_ids(session, query, indexed=indexed)
+                    rows.append([query, name, len(matches), f"{elapsed[0] / repeat * 1000:.2f}"])
+    print_table(["query", "path", "matches", "ms/search"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--talents", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.talents, args.repeat)
@@ -0,0 +1,55 @@
+"""
+Benchmarks converting loaded TalentDB rows to Talent dataclasses.
+
+Usage (from src/):
+    python -m benchmarks.bench_to_dataclass [--sizes 1000 10000] [--repeats 3]
+
+Rows are loaded (with popularity and chemistry) before timing, so only the
+conversion is measured. "from_dict" is the dataclasses_json round trip that
+DataclassMapper.to_dataclass used before converters were generated per type.
+"""
+import argparse
+from statistics import mean
+
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from data.game_state import Talent
+from database.db_models import TalentDB
+
+def from_dict_to_talent(row: TalentDB) -> Talent:
+    data = {key: getattr(row, key) for key in Talent.__annotations__ if hasattr(row, key)}
+    data['popularity'] = {p.market_group_name: p.score for p in row.popularity_scores}
+    chemistry = {c.talent_b_id: c.chemistry_score for c in row.chemistry_a}
+    chemistry.update({c.talent_a_id: c.chemistry_score for c in row.chemistry_b})
+    data['chemistry'] = chemistry
+    return Talent.from_dict(data)
+
+def run(sizes, repeats: int):
+    rows = []
+    for size in sizes:
+        old_times, new_times = [], []
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, size)
+            with session_factory() as session:
+                talents = session.query(TalentDB).options(
+                    selectinload(TalentDB.popularity_scores),
+                    selectinload(TalentDB.chemistry_a),
+                    selectinload(TalentDB.chemistry_b)
+                ).all()
+                for _ in range(repeats):
+                    with timer(old_times):
+                        old = [from_dict_to_talent(t) for t in talents]
+                    with timer(new_times):
+                        new = [t.to_dataclass(Talent) for t in talents]
+                assert old == new
+        old_ms, new_ms = mean(old_times) * 1000, mean(new_times) * 1000
+        rows.append([size, f"{old_ms:.1f}", f"{new_ms:.1f}", f"{old_ms / new_ms:.1f}x"])
+    print_table(["talents", "from_dict ms", "generated ms", "speedup"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
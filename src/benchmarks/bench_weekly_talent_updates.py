@@ -0,0 +1,48 @@
+"""
+Benchmarks TalentCommandService.process_weekly_updates across talent pool sizes.
+
+Usage (from src/):
+    python -m benchmarks.bench_weekly_talent_updates [--sizes 150 1000 10000 100000] [--weeks 10]
+
+Reports the mean time of an ordinary week and of a new-year week for each pool size.
+"""
+import argparse
+from statistics import mean
+from types import SimpleNamespace
+
+from benchmarks.common import temp_session_factory, populate_world, timer, print_table
+from services.command.talent_command_service import TalentCommandService
+from services.calculation.talent_affinity_calculator import TalentAffinityCalculator
+
+AGE_RULES = [
+    {'tag': 'Teen', 'min_age': 18, 'max_age': 19, 'affinity_score': 5},
+    {'tag': 'MILF', 'min_age': 35, 'max_age': 99, 'affinity_score': 4},
+]
+
+def run(sizes, weeks: int):
+    config = SimpleNamespace(popularity_gain_scalar=0.05, age_based_affinity_rules=AGE_RULES)
+    service = TalentCommandService(None, config, TalentAffinityCalculator(config))
+    rows = []
+    for size in sizes:
+        week_times, new_year_times = [], []
+        with temp_session_factory() as session_factory:
+            populate_world(session_factory, size)
+            for week in range(1, weeks + 1):
+                with session_factory() as session:
+                    with timer(week_times):
+                        service.process_weekly_updates(session, 2010 * 52 + week, new_year=False)
+                        session.commit()
+            with session_factory() as session:
+                with timer(new_year_times):
+                    service.process_weekly_updates(session, 2010 * 52 + 52, new_year=True)
+                    session.commit()
+        per_week = mean(week_times)
+        rows.append([size, f"{per_week * 1000:.2f}", f"{per_week / size * 1e6:.2f}", f"{new_year_times[0] * 1000:.2f}"])
+    print_table(["talents", "week ms", "us/talent", "new-year ms"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 1000, 10000, 100000])
+    parser.add_argument("--weeks", type=int, default=10)
+    args = parser.parse_args()
+    run(args.sizes, args.weeks)
@@ -0,0 +1,63 @@
+"""
+Benchmarks writing a new game's starting talent pool.
+
+Usage (from src/):
+    python -m benchmarks.bench_world_builder [--sizes 150 10000 50000] [--orm-limit 10000]
+
+"orm" adds one TalentDB.from_dataclass object per talent to the session, as
+start_new_game did before the WorldBuilder. "bulk" streams talents from the
+generator into the WorldBuilder's batched INSERTs. Both include generating
+the talents and committing; the ORM path is skipped above --orm-limit.
+"""
+import argparse
+import random
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import temp_session_factory, BENCH_MARKET_GROUPS, timer, print_table
+from core.talent_generator import TalentGenerator
+from data.data_manager import DataManager
+from database.db_models import TalentDB
+from services.builders.world_builder import WorldBuilder
+
+def build_orm(session_factory, generator: TalentGenerator, size: int):
+    with session_factory() as session:
+        for talent in generator.generate_multiple_talents(size, start_id=1):
+            session.add(TalentDB.from_dataclass(talent))
+        session.commit()
+
+def build_bulk(session_factory, generator: TalentGenerator, size: int):
+    with session_factory() as session:
+        world = WorldBuilder(session)
+        world.add_market_groups(BENCH_MARKET_GROUPS)
+        world.add_talents(generator.iter_talents(size, start_id=1))
+        session.commit()
+
+def run(sizes, orm_limit: int):
+    data_manager = DataManager()
+    generator = TalentGenerator(data_manager.game_config, data_manager.generator_data, data_manager.affinity_data,
+                                data_manager.tag_definitions, data_manager.talent_archetypes)
+    rows = []
+    for size in sizes:
+        for name, build in (("orm", build_orm), ("bulk", build_bulk)):
+            if name == "orm" and size > orm_limit:
+                continue
+            random.seed(size)
+            np.random.seed(size)
+            elapsed = []
+            with temp_session_factory() as session_factory:
+                tracemalloc.start()
+                with timer(elapsed):
+                    build(session_factory, generator, size)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            rows.append([size, name, f"{elapsed[0]:.2f}", f"{peak / 2**20:,.1f}"])
+    print_table(["talents", "path", "seconds", "peak MB"], rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 10000, 50000])
+    parser.add_argument("--orm-limit", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.sizes, args.orm_limit)
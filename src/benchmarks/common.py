@@ -0,0 +1,86 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks are plain scripts, run from the `src` directory, e.g.:
+    python -m benchmarks.bench_weekly_talent_updates
+They build throwaway SQLite databases in a temporary directory and never
+touch the player's save folder.
+"""
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import Base, GameInfoDB, MarketGroupStateDB, TalentDB, TalentPopularityDB
+
+BENCH_MARKET_GROUPS = [
+    "Straight Men", "Straight Women", "Gay Men", "Lesbians", "Bisexuals", "Fetish Fans"
+]
+
+@contextmanager
+def temp_session_factory() -> Iterator[sessionmaker]:
+    """Yields a sessionmaker bound to a fresh file-backed SQLite database."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'bench.sqlite'}")
+        Base.metadata.create_all(engine)
+        try:
+            yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        finally:
+            engine.dispose()
+
+def populate_world(session_factory, talent_count: int, week: int = 1, year: int = 2010, seed: int = 1234):
+    """Bulk inserts a synthetic talent pool with popularity rows for every market group."""
+    rng = random.Random(seed)
+    talent_rows: List[dict] = []
+    popularity_rows: List[dict] = []
+    for talent_id in range(1, talent_count + 1):
+        fatigued = rng.random() < 0.1
+        fatigue_end_week = rng.randint(1, 52) if fatigued else 0
+        talent_rows.append({
+            'id': talent_id, 'alias': f"Talent {talent_id}", 'age': rng.randint(18, 60),
+            'ethnicity': rng.choice(["White", "Black", "Asian", "Latina"]),
+            'gender': rng.choice(["Female", "Male"]),
+            'performance': rng.uniform(10, 100), 'acting': rng.uniform(10, 100),
+            'stamina': rng.uniform(10, 100), 'dom_skill': rng.uniform(10, 100),
+            'sub_skill': rng.uniform(10, 100), 'experience': rng.uniform(0, 100),
+            'ambition': rng.randint(1, 10), 'professionalism': rng.randint(1, 10),
+            'orientation_score': rng.randint(-100, 100), 'disposition_score': rng.randint(-100, 100),
+            'max_scene_partners': 10,
+            'fatigue': rng.randint(1, 50) if fatigued else 0,
+            'fatigue_end_week': fatigue_end_week,
+            'fatigue_end_year': year if fatigued else 0,
+            'fatigue_end_date': year * 52 + fatigue_end_week if fatigued else 0,
+        })
+        for group_name in BENCH_MARKET_GROUPS:
+            popularity_rows.append({'talent_id': talent_id, 'market_group_name': group_name,
+                                    'base_score': rng.uniform(0, 100), 'last_updated_week': year * 52 + week})
+
+    with session_factory() as session:
+        session.add_all([
+            GameInfoDB(key='week', value=str(week)),
+            GameInfoDB(key='year', value=str(year)),
+            GameInfoDB(key='money', value="1000000"),
+        ])
+        session.add_all([MarketGroupStateDB(name=name, current_saturation=1.0) for name in BENCH_MARKET_GROUPS])
+        session.execute(insert(TalentDB), talent_rows)
+        session.execute(insert(TalentPopularityDB), popularity_rows)
+        session.commit()
+
+@contextmanager
+def timer(results: list):
+    """Appends the elapsed wall-clock time of the block, in seconds, to `results`."""
+    start = time.perf_counter()
+    yield
+    results.append(time.perf_counter() - start)
+
+def print_table(headers: List[str], rows: List[List]):
+    """Prints a simple fixed-width table to stdout."""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
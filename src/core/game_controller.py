@@ -1,11 +1,12 @@
 import logging
 from typing import List, Dict, Optional, Tuple, Set
-from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QObject, QThreadPool
 from sqlalchemy import func
 
 from core.service_container import ServiceContainer
 from core.game_signals import GameSignals
 from core.interfaces import IGameController
+from core.week_advance_worker import WeekAdvanceWorker
 from data.game_state import *
 from data.save_manager import SaveManager
 from core.talent_generator import TalentGenerator
@@ -17,6 +18,7 @@ from database.db_models import *
 from services.query.tag_query_service import TagQueryService
 from services.query.game_query_service import GameQueryService
 from services.query.talent_query_service import TalentQueryService
+from services.models.list_rows import TalentListRow, SceneListRow
 from services.calculation.tag_validation_checker import TagValidationChecker
 from services.calculation.talent_demand_calculator import TalentDemandCalculator
 from services.calculation.bloc_cost_calculator import BlocCostCalculator
@@ -29,7 +31,7 @@ from services.command.go_to_list_service import GoToListService
 from services.game_session_service import GameSessionService
 from services.player_settings_service import PlayerSettingsService
 from services.command.email_service import EmailService
-from services.models.results import EventAction
+from services.models.results import EventAction, WeekAdvancementResult, FastForwardStop
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +85,11 @@ class GameController(QObject):
         self._available_ethnicities = None
         self.game_over = False
 
+        # --- Asynchronous week advancement ---
+        self.thread_pool = QThreadPool.globalInstance()
+        self._week_worker: Optional[WeekAdvanceWorker] = None
+        self._week_continuation_requested = False
+
     def get_current_theme(self) -> Theme:
         """Convenience method to get the current theme object."""
         theme_name = self.settings_manager.get_setting("theme", "dark")
@@ -101,10 +108,14 @@ class GameController(QObject):
         if not self.query_service: return None
         return self.query_service.get_talent_by_id(talent_id)
     
-    def get_filtered_talents(self, filters: dict) -> List[Talent]:
+    def get_filtered_talents(self, filters: dict) -> List[TalentListRow]:
         if not self.query_service: return []
         return self.query_service.get_filtered_talents(filters)
 
+    def search_talent_ids(self, text: str) -> List[int]:
+        if not self.query_service: return []
+        return self.query_service.search_talent_ids(text)
+
     def get_blocs_for_schedule_view(self, year: int) -> List[ShootingBloc]:
         if not self.query_service: return []
         return self.query_service.get_blocs_for_schedule_view(year)
@@ -117,7 +128,7 @@ class GameController(QObject):
         if not self.query_service: return None
         return self.query_service.get_scene_for_planner(scene_id)
         
-    def get_shot_scenes(self) -> List[Scene]:
+    def get_shot_scenes(self) -> List[SceneListRow]:
         if not self.query_service: return []
         return self.query_service.get_shot_scenes()
         
@@ -165,8 +176,27 @@ class GameController(QObject):
         return self.query_service.get_all_emails()
 
     # --- Game Logic ---
+    @property
+    def is_advancing_week(self) -> bool:
+        return self._week_worker is not None
+
+    def _refuse_while_advancing(self) -> bool:
+        """
+        Write commands check this first. While the worker advances the week it
+        holds the write transaction, and its result overwrites game_state.money,
+        so the command is refused (telling the player) instead.
+        """
+        if not self.is_advancing_week: return False
+        self.signals.notification_posted.emit("Please wait for the week to finish advancing.")
+        return True
+
     def advance_week(self):
-        if self.game_over: return
+        """
+        Starts advancing the week on a worker thread. Progress is reported
+        through week_advance_progress and the result is applied on the GUI
+        thread by _on_week_advanced. Ignored while a week is already running.
+        """
+        if self.game_over or self.is_advancing_week: return
 
         # Pre-flight check
         incomplete_scenes = self.query_service.get_incomplete_scenes_for_week(
@@ -176,20 +206,61 @@ class GameController(QObject):
             self.signals.incomplete_scene_check_requested.emit(incomplete_scenes)
             return
 
-        # Delegate everything to TimeService
-        result = self.time_service.advance_week()
+        # Delegate everything to TimeService (and the autosave) on the pool
+        worker = WeekAdvanceWorker(self.time_service, self.save_manager)
+        worker.signals.phase_started.connect(self.signals.week_advance_progress)
+        worker.signals.finished.connect(self._on_week_advanced)
+        worker.signals.failed.connect(self._on_week_advance_failed)
+        self._week_worker = worker
+        self.signals.week_advance_running.emit(True)
+        self.thread_pool.start(worker)
+
+    def _continue_week(self):
+        """
+        Resumes a week paused by an interactive event. The event can be resolved
+        before the worker that raised it has reported back, in which case the
+        week is restarted as soon as it does.
+        """
+        if self.is_advancing_week:
+            self._week_continuation_requested = True
+        else:
+            self.advance_week()
+
+    def wait_for_week_advance(self):
+        """
+        Blocks until a running week has finished and drops its pending result.
+        Used before the live session is replaced or torn down.
+        """
+        if not self.is_advancing_week: return
+        self.thread_pool.waitForDone()
+        self._week_worker.signals.finished.disconnect()
+        self._week_worker.signals.failed.disconnect()
+        self._week_continuation_requested = False
+        self._finish_week_worker()
+
+    def _finish_week_worker(self):
+        self._week_worker = None
+        self.signals.week_advance_running.emit(False)
+
+    def _on_week_advance_failed(self, message: str):
+        self._finish_week_worker()
+        self._week_continuation_requested = False
+        self.signals.notification_posted.emit(f"Could not advance the week: {message}")
+
+    def _on_week_advanced(self, result: WeekAdvancementResult):
+        self._finish_week_worker()
 
         # Update local state
         self.game_state.week = result.new_week
         self.game_state.year = result.new_year
         self.game_state.money = result.new_money
 
-        # Autosave with a fresh session (SaveManager handles this)
-        self.save_manager.auto_save()
-
         # Handle pauses
         if result.was_paused:
             if result.scenes_shot > 0: self.signals.scenes_changed.emit()
+            if self._week_continuation_requested:
+                self._week_continuation_requested = False
+                self.advance_week()
             return
 
         # Check game over
@@ -204,14 +275,62 @@ class GameController(QObject):
         if result.market_changed: self.signals.market_changed.emit()
         if result.talent_pool_changed: self.signals.talent_pool_changed.emit()
 
+    def fast_forward(self, max_weeks: Optional[int] = None):
+        """
+        Skips quiet weeks until a scene is due to shoot, an edit is about to
+        finish, or `max_weeks` (default: the 'fast_forward_max_weeks' setting)
+        have passed, then autosaves once. If the current week already has
+        something to do, this is a regular advance_week.
+        """
+        if self.game_over or self.is_advancing_week: return
+        if max_weeks is None:
+            max_weeks = self.game_constant.get('fast_forward_max_weeks', 52)
+
+        # Same pre-flight check as a normal week
+        incomplete_scenes = self.query_service.get_incomplete_scenes_for_week(
+            self.game_state.week, self.game_state.year
+        )
+        if incomplete_scenes:
+            self.signals.incomplete_scene_check_requested.emit(incomplete_scenes)
+            return
+
+        result = self.time_service.fast_forward(max_weeks)
+        if result is None:
+            self.signals.notification_posted.emit("Could not fast-forward.")
+            return
+        if result.weeks_advanced == 0:
+            self.advance_week()
+            return
+
+        self.game_state.week = result.new_week
+        self.game_state.year = result.new_year
+        self.game_state.money = result.new_money
+        self.save_manager.auto_save()
+
+        reasons = {
+            FastForwardStop.SCHEDULED_SCENE: "a shoot is scheduled this week",
+            FastForwardStop.EDITING_COMPLETE: "a scene finishes editing this week",
+            FastForwardStop.WEEK_LIMIT: "fast-forward limit reached",
+        }
+        self.signals.notification_posted.emit(
+            f"Skipped {result.weeks_advanced} week(s): {reasons[result.stop_reason]}."
+        )
+        self.signals.time_changed.emit(result.new_week, result.new_year)
+        self.signals.money_changed.emit(self.game_state.money)
+        if result.scenes_in_editing > 0: self.signals.scenes_changed.emit()
+        if result.market_changed: self.signals.market_changed.emit()
+        if result.talent_pool_changed: self.signals.talent_pool_changed.emit()
+
     def start_editing_scene(self, scene_id: int, editing_tier_id: str):
         """
         Starts the editing process for a shot scene. The controller is responsible for
         committing the transaction and emitting signals after the service runs.
         """
+        if self._refuse_while_advancing(): return
         success, cost = self.scene_command_service.start_editing_scene(scene_id, editing_tier_id)
 
     def release_scene(self, scene_id: int):
+        if self._refuse_while_advancing(): return
         # Capture the returned dictionary of discoveries
         result = self.scene_command_service.release_scene(scene_id)
         if not result:
@@ -236,6 +355,7 @@ class GameController(QObject):
         Calculates the cost authoritatively and creates a shooting bloc.
         This version does NOT accept a 'cost' parameter from the UI.
         """
+        if self._refuse_while_advancing(): return False
         return self.scene_command_service.create_shooting_bloc(week, year, num_scenes, settings, name, policies)
     
     def calculate_shooting_bloc_cost(self, num_scenes: int, settings: Dict, policies: List[str]) -> int:
@@ -243,23 +363,30 @@ class GameController(QObject):
         if not self.bloc_cost_calculator: return 0
         return self.bloc_cost_calculator.calculate_shooting_bloc_cost(num_scenes, settings, policies)
 
-    def create_blank_scene(self, week: Optional[int] = None, year: Optional[int] = None) -> int:
+    def create_blank_scene(self, week: Optional[int] = None, year: Optional[int] = None) -> Optional[int]:
+        if self._refuse_while_advancing(): return None
         use_week = week if week is not None else self.game_state.week
         use_year = year if year is not None else self.game_state.year
         return self.scene_command_service.create_blank_scene(use_week, use_year)
     
     def delete_scene(self, scene_id: int, penalty_percentage: float = 0.0): 
+        if self._refuse_while_advancing(): return
         self.scene_command_service.delete_scene(scene_id, penalty_percentage)
 
     def update_scene_full(self, scene_data: Scene) -> Dict:
         """Receives a full Scene dataclass from the presenter and updates the database."""
+        if self._refuse_while_advancing(): return {}
         return self.scene_command_service.update_scene_full(scene_data)
 
     def calculate_talent_demand(self, talent_id: int, scene_id: int, vp_id: int) -> int:
         if not self.talent_demand_calculator: return 0
         return self.talent_demand_calculator.calculate_talent_demand(talent_id, scene_id, vp_id)
+
+    def calculate_role_demands(self, scene_id: int, vp_id: int, talent_ids: List[int]) -> Dict[int, int]:
+        if not self.talent_demand_calculator: return {}
+        return self.talent_demand_calculator.calculate_role_demands(scene_id, vp_id, talent_ids)
     
-    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentDB]:
+    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentListRow]:
         if not self.talent_query_service: return []
         return self.talent_query_service.get_eligible_talent_for_role(scene_id, vp_id)
     
@@ -268,10 +395,12 @@ class GameController(QObject):
         return self.talent_query_service.get_role_details_for_ui(scene_id, vp_id)
 
     def cast_talent_for_virtual_performer(self, talent_id: int, scene_id: int, virtual_performer_id: int, cost: int):
+        if self._refuse_while_advancing(): return
         self.scene_command_service.cast_talent_for_role(talent_id, scene_id, virtual_performer_id, cost)
 
     def cast_talent_for_multiple_roles(self, talent_id: int, roles: List[Dict]):
         """Casts a single talent into multiple roles across different scenes."""
+        if self._refuse_while_advancing(): return
 
         # Server-side validation as a safeguard against client-side errors or other entry points
         scene_ids = [role['scene_id'] for role in roles]
@@ -321,7 +450,7 @@ class GameController(QObject):
         if result.next_action == EventAction.CANCEL_SCENE:
             # The controller, not the event service, calls the scene command service.
             self.scene_command_service.delete_scene(scene_id, result.cancellation_penalty)
-            self.advance_week() # Continue the week after cancellation.
+            self._continue_week() # Continue the week after cancellation.
         
         elif result.next_action == EventAction.CHAIN_EVENT:
             # The controller, not the event service, emits the signal for the new event.
@@ -332,12 +461,13 @@ class GameController(QObject):
 
         elif result.next_action == EventAction.CONTINUE_SHOOT:
             self.scene_command_service.continue_shoot_scene_after_event(scene_id, result.shoot_modifiers)
-            self.advance_week() # Continue the week after a successful shoot.
+            self._continue_week() # Continue the week after a successful shoot.
 
     # --- Game Session Management (Delegated to GameSessionService) ---
 
     def new_game_started(self):
         """Initializes a new game session."""
+        self.wait_for_week_advance()
         result = self.game_session_service.start_new_game()
         if result:
             self.game_state, self.current_save_path = result
@@ -351,6 +481,7 @@ class GameController(QObject):
         
     def load_game(self, save_name: str):
         """Loads a game session from a file."""
+        self.wait_for_week_advance()
         result = self.game_session_service.load_game(save_name)
         if result:
             self.game_state, self.current_save_path = result
@@ -364,12 +495,14 @@ class GameController(QObject):
             self.signals.show_main_window_requested.emit()
 
     def save_game(self, save_name: str):
+        if self._refuse_while_advancing(): return
         self.game_session_service.save_game(save_name)
 
     def delete_save_file(self, save_name: str) -> bool:
         return self.game_session_service.delete_save(save_name)
 
     def continue_game(self):
+        self.wait_for_week_advance()
         result = self.game_session_service.continue_game()
         if result:
             self.game_state, self.current_save_path = result
@@ -383,9 +516,11 @@ class GameController(QObject):
             self.signals.show_main_window_requested.emit()
 
     def quick_save(self):
+        if self._refuse_while_advancing(): return
         self.game_session_service.quick_save()
 
     def quick_load(self):
+        self.wait_for_week_advance()
         result = self.game_session_service.quick_load()
         if result:
             self.game_state, self.current_save_path = result
@@ -399,6 +534,7 @@ class GameController(QObject):
 
     def return_to_main_menu(self, exit_save: bool):
         self._graceful_shutdown_in_progress = True
+        self.wait_for_week_advance()
         self.game_session_service.handle_exit_save(exit_save and not self.game_over)
         self.service_container.cleanup_services(self)
         self.current_save_path = None
@@ -408,6 +544,7 @@ class GameController(QObject):
 
     def quit_game(self, exit_save: bool = False):
         self._graceful_shutdown_in_progress = True
+        self.wait_for_week_advance()
         self.game_session_service.handle_exit_save(exit_save and not self.game_over)
         self.service_container.cleanup_services(self)
         self._graceful_shutdown_in_progress = False # Reset
@@ -415,10 +552,12 @@ class GameController(QObject):
     
     def handle_application_shutdown(self):
         if self.current_save_path and not self._graceful_shutdown_in_progress:
+            self.wait_for_week_advance()
             self.service_container.cleanup_services(self)
 
     def handle_game_over(self):
         self.game_over = True
+        self.wait_for_week_advance()
         self.service_container.cleanup_services(self)
         self.current_save_path = None
         self.signals.game_over_triggered.emit("Your studio has gone bankrupt.")
@@ -434,44 +573,54 @@ class GameController(QObject):
         return self.query_service.get_unread_email_count()
 
     def mark_email_as_read(self, email_id: int):
+        if self._refuse_while_advancing(): return
         if not self.email_service: return
         self.email_service.mark_email_as_read(email_id)
 
     def delete_emails(self, email_ids: list[int]):
+        if self._refuse_while_advancing(): return
         if not self.email_service: return
         self.email_service.delete_emails(email_ids)
 
     # --- Go-To List Actions (Proxy Methods) ---
 
     def remove_talents_from_go_to_list(self, talent_ids: list[int]):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.remove_talents_from_all_categories(talent_ids)
 
     def create_go_to_list_category(self, name: str):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.create_category(name)
 
     def rename_go_to_list_category(self, category_id: int, new_name: str):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.rename_category(category_id, new_name)
 
     def delete_go_to_list_category(self, category_id: int):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.delete_category(category_id)
 
     def add_talent_to_go_to_category(self, talent_id: int, category_id: int):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.add_talents_to_category([talent_id], category_id)
 
     def add_talents_to_go_to_category(self, talent_ids: list[int], category_id: int):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.add_talents_to_category(talent_ids, category_id)
 
     def remove_talent_from_go_to_category(self, talent_id: int, category_id: int):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.remove_talents_from_category([talent_id], category_id)
 
     def remove_talents_from_go_to_category(self, talent_ids: list[int], category_id: int):
+        if self._refuse_while_advancing(): return
         if not self.go_to_list_service: return
         self.go_to_list_service.remove_talents_from_category(talent_ids, category_id)
 
@@ -481,9 +630,11 @@ class GameController(QObject):
         return self.player_settings_service.get_favorite_tags(tag_type)
 
     def toggle_favorite_tag(self, tag_name: str, tag_type: str):
+        if self._refuse_while_advancing(): return
         if not self.player_settings_service: return
         self.player_settings_service.toggle_favorite_tag(tag_name, tag_type)
 
     def reset_favorite_tags(self, tag_type: str):
+        if self._refuse_while_advancing(): return
         if not self.player_settings_service: return
         self.player_settings_service.reset_favorite_tags(tag_type)
\ No newline at end of file
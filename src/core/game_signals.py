@@ -23,4 +23,6 @@ class GameSignals(QObject):
     market_changed = pyqtSignal()
     favorites_changed = pyqtSignal()
     incomplete_scene_check_requested = pyqtSignal(list)
-    show_help_requested = pyqtSignal(str)
\ No newline at end of file
+    show_help_requested = pyqtSignal(str)
+    week_advance_running = pyqtSignal(bool)
+    week_advance_progress = pyqtSignal(str)
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import Any, Callable, List
+
+class HeadlessSignal:
+    """A minimal stand-in for a bound pyqtSignal: synchronous, same-thread delivery."""
+    def __init__(self, name: str):
+        self.name = name
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable):
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Callable = None):
+        if slot is None:
+            self._slots.clear()
+        elif slot in self._slots:
+            self._slots.remove(slot)
+
+    def emit(self, *args: Any):
+        for slot in list(self._slots):
+            slot(*args)
+
+class HeadlessSignals:
+    """
+    A drop-in replacement for GameSignals that does not require PyQt or a
+    QApplication. It exposes the same signal names so the ServiceContainer
+    and every service can be wired against it unchanged (e.g. by the headless
+    simulation runner or in tests).
+    """
+    SIGNAL_NAMES = (
+        'show_start_screen_requested', 'show_main_window_requested', 'money_changed',
+        'time_changed', 'roster_changed', 'scenes_changed', 'talent_pool_changed',
+        'talent_generated', 'notification_posted', 'interactive_event_triggered',
+        'new_game_started', 'saves_changed', 'go_to_list_changed', 'go_to_categories_changed',
+        'emails_changed', 'game_over_triggered', 'quit_game_requested', 'market_changed',
+        'favorites_changed', 'incomplete_scene_check_requested', 'show_help_requested',
+        'week_advance_running', 'week_advance_progress',
+    )
+
+    def __init__(self):
+        for name in self.SIGNAL_NAMES:
+            setattr(self, name, HeadlessSignal(name))
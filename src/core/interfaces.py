@@ -8,6 +8,7 @@ from data.game_state import (
 from services.query.talent_query_service import TalentQueryService
 from data.data_manager import DataManager
 from database.db_models import TalentDB
+from services.models.list_rows import TalentListRow, SceneListRow
 from data.settings_manager import SettingsManager
 from ui.theme_manager import ThemeManager, Theme
     
@@ -41,7 +42,7 @@ class IGameController(Protocol):
 
     # --- UI Data Access ---
     def get_current_theme(self) -> 'Theme': ...
-    def get_shot_scenes(self) -> List[Scene]: ...
+    def get_shot_scenes(self) -> List[SceneListRow]: ...
     def get_all_market_states(self) -> Dict[str, 'MarketGroupState']: ...
     def get_scene_history_for_talent(self, talent_id: int) -> List[Scene]: ...
     def get_talent_by_id(self, talent_id: int) -> Optional[Talent]: ...
@@ -51,7 +52,8 @@ class IGameController(Protocol):
     # --- Talent ---
     def get_castable_scenes(self) -> List[Dict]: ...
     def get_uncast_roles_for_scene(self, scene_id: int) -> List[Dict]: ...
-    def get_filtered_talents(self, all_filters: dict) -> List[Talent]: ...
+    def get_filtered_talents(self, all_filters: dict) -> List[TalentListRow]: ...
+    def search_talent_ids(self, text: str) -> List[int]: ...
     def cast_talent_for_multiple_roles(self, talent_id: int, roles: list): ...
     def get_available_ethnicities(self) -> list[str]: ...
     def get_available_boob_cups(self) -> list[str]: ...
@@ -71,15 +73,16 @@ class IGameController(Protocol):
 
     # --- Hiring ---
     def calculate_talent_demand(self, talent_id: int, scene_id: int, vp_id: int) -> int: ...
+    def calculate_role_demands(self, scene_id: int, vp_id: int, talent_ids: List[int]) -> Dict[int, int]: ...
     def cast_talent_for_virtual_performer(self, talent_id: int, scene_id: int, virtual_performer_id: int, cost: int): ...
-    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentDB]: ...
+    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentListRow]: ...
     def get_role_details_for_ui(self, scene_id: int, vp_id: int) -> Dict: ...
 
     # --- Scene Planner ---
     def create_shooting_bloc(self, week: int, year: int, num_scenes: int, settings: Dict[str, str], name: str, policies: List[str]) -> bool: ...
     def calculate_shooting_bloc_cost(self, num_scenes: int, settings: Dict[str, str], policies: List[str]) -> int: ...
     def get_blocs_for_schedule_view(self, year: int) -> List[ShootingBloc]: ...
-    def create_blank_scene(self, week: Optional[int] = None, year: Optional[int] = None) -> int: ...
+    def create_blank_scene(self, week: Optional[int] = None, year: Optional[int] = None) -> Optional[int]: ...
     def update_scene_full(self, scene_data: Scene) -> Dict: ...
     def get_bloc_by_id(self, bloc_id: int) -> Optional[ShootingBloc]: ...
     def get_thematic_tags_for_planner(self) -> Tuple[List[Dict], Set[str], Set[str]]: ...
@@ -1,7 +1,6 @@
 import logging
 from typing import Optional, TYPE_CHECKING
 
-from core.game_signals import GameSignals
 from data.data_manager import DataManager
 from data.save_manager import SaveManager
 from data.game_state import GameState
@@ -24,6 +23,7 @@ from services.command.scene_event_command_service import SceneEventCommandServic
 from services.events.scene_event_trigger_service import SceneEventTriggerService
 from services.models.configs import HiringConfig, MarketConfig, SceneCalculationConfig
 from services.query.game_query_service import GameQueryService
+from services.query.query_cache import QueryCache
 from services.query.talent_query_service import TalentQueryService
 from services.query.tag_query_service import TagQueryService
 from services.calculation.market_group_resolver import MarketGroupResolver
@@ -34,6 +34,7 @@ from services.calculation.bloc_cost_calculator import BlocCostCalculator
 
 if TYPE_CHECKING:
     from core.game_controller import GameController
+    from core.game_signals import GameSignals
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +44,7 @@ class ServiceContainer:
     This class is responsible for creating, configuring, and managing the
     lifecycle of all services.
     """
-    def __init__(self, data_manager: DataManager, save_manager: SaveManager, signals: GameSignals):
+    def __init__(self, data_manager: DataManager, save_manager: SaveManager, signals: 'GameSignals'):
         self.data_manager = data_manager
         self.save_manager = save_manager
         self.signals = signals
@@ -84,8 +85,10 @@ class ServiceContainer:
         This is the main entry point for starting a game session's services.
         """
         logger.info("Initializing service layer...")
-        # Get the session factory from the database manager
+        # Get the session factories from the database manager; read-only
+        # services use a separate pool, so the UI never waits on a write.
         session_factory = self.save_manager.db_manager.get_session_factory()
+        read_session_factory = self.save_manager.db_manager.get_read_session_factory()
         
         # --- Create Configs ---
         self._create_configs()
@@ -95,12 +98,12 @@ class ServiceContainer:
         self.market_service = MarketService(market_resolver, self.data_manager.tag_definitions, config=self.market_config)
         self.talent_affinity_calculator = TalentAffinityCalculator(self.scene_calc_config)
         self.availability_checker = TalentAvailabilityChecker(self.data_manager, self.hiring_config)
-        self.query_service = GameQueryService(session_factory)
+        self.query_service = GameQueryService(read_session_factory, QueryCache(self.save_manager.db_manager.table_versions))
         self.tag_query_service = TagQueryService(self.data_manager)
         self.talent_command_service = TalentCommandService(self.signals, self.scene_calc_config, self.talent_affinity_calculator)
-        self.talent_demand_calculator = TalentDemandCalculator(session_factory, self.data_manager, self.query_service, self.hiring_config, self.availability_checker)
+        self.talent_demand_calculator = TalentDemandCalculator(read_session_factory, self.data_manager, self.query_service, self.hiring_config, self.availability_checker)
         self.bloc_cost_calculator = BlocCostCalculator(self.data_manager)
-        self.talent_query_service = TalentQueryService(session_factory, self.data_manager, self.talent_demand_calculator, self.query_service, self.hiring_config, self.availability_checker)
+        self.talent_query_service = TalentQueryService(read_session_factory, self.data_manager, self.talent_demand_calculator, self.query_service, self.hiring_config, self.availability_checker)
         self.role_performance_calculator = RolePerformanceCalculator()
         self.player_settings_service = PlayerSettingsService(session_factory, self.signals)
         self.go_to_list_service = GoToListService(session_factory, self.signals)
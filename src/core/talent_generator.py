@@ -1,7 +1,6 @@
 import random
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import numpy as np
-from collections import defaultdict
 
 from data.game_state import Talent
 
@@ -25,6 +24,18 @@ class TalentGenerator:
             "Female": {"first": ["Jane"], "last": ["Doe"], "single": ["Angel"]}
         }
 
+        # Everything below depends only on the data files, so it is worked out once
+        # instead of per talent; this keeps generating large starting pools fast.
+        age_config = self.gen_config.get("age", {"min": 18, "max": 61, "weight_start": 1.0, "weight_end": 0.1})
+        self._ages = list(range(age_config['min'], age_config['max']))
+        # Younger ages are more likely
+        self._age_weights = np.linspace(age_config['weight_start'], age_config['weight_end'], len(self._ages))
+        self._age_weights /= self._age_weights.sum()
+        self._base_preferences_cache: Dict[tuple, list] = {}
+        self._orientation_multipliers: Dict[tuple, float] = {}
+        self._age_affinities: Dict[tuple, Dict[str, int]] = {}
+        self._dick_size_affinities: Dict[int, Dict[str, int]] = {}
+
     def _weighted_choice(self, options: List[Dict[str, Any]]) -> str:
         if not options:
             return "N/A"
@@ -35,12 +46,7 @@ class TalentGenerator:
         return random.choices(choices, weights=weights, k=1)[0]
 
     def _generate_age(self) -> int:
-        age_config = self.gen_config.get("age", {"min": 18, "max": 61, "weight_start": 1.0, "weight_end": 0.1})
-        ages = list(range(age_config['min'], age_config['max']))
-        # Younger ages are more likely
-        weights = np.linspace(age_config['weight_start'], age_config['weight_end'], len(ages))
-        weights /= weights.sum()
-        return int(np.random.choice(ages, p=weights))
+        return int(np.random.choice(self._ages, p=self._age_weights))
 
     def _generate_skill(self) -> int:
         """Generates a random skill value, weighted towards the middle."""
@@ -130,54 +136,33 @@ class TalentGenerator:
         weights = [item.get('weight', 1) for item in choices]
         return random.choices(choices, weights=weights, k=1)[0]
 
-    def _generate_preferences_and_limits(self, gender: str, orientation_score: int, disposition_score: int, archetype_data: dict) -> tuple[Dict[str, Dict[str, float]], List[str]]:
+    def _base_preferences(self, gender: str, archetype_data: dict) -> list:
         """
-        Generates role-based tag preferences and hard limits based on an archetype,
-        orientation, and D/S disposition, using a Specific > Base > Concept hierarchy.
+        The Action tags a talent of `gender` can perform with the archetype's
+        preference for each of their roles, before disposition and orientation,
+        as (full_name, orientation, [(role, dynamic_role, base_pref), ...]).
         """
-        prefs: Dict[str, Dict[str, float]] = defaultdict(dict)
-        limits = archetype_data.get("hard_limits", []).copy()
-        
-        preference_shift_intensity = self.game_constant.get('preference_shift_intensity', 0.5)
-        hard_limit_threshold = self.game_constant.get('hard_limit_threshold', 0.1)
+        # Archetypes are the dicts held in self.talent_archetypes, so their identity is stable.
+        key = (gender, id(archetype_data))
+        if (base_preferences := self._base_preferences_cache.get(key)) is not None:
+            return base_preferences
+        base_preferences = self._base_preferences_cache[key] = []
         archetype_action_prefs = archetype_data.get("action_preferences", {})
-
-        # Calculate shifters once
-        ds_balance = disposition_score / 100.0
-        
         for full_name, tag_def in self.tag_definitions.items():
             if tag_def.get('type') != 'Action':
                 continue
-
-            slots = tag_def.get('slots', [])
-            if not any(slot.get('gender') == gender or slot.get('gender') == "Any" for slot in slots):
-                continue
-
-            # Calculate orientation multiplier for the tag
-            orientation_targets = {"Straight": -100, "Gay": 100, "Lesbian": 100}
-            tag_orientation = tag_def.get('orientation')
-            curve_config = self.gen_config.get("orientation_multiplier_curve", {"distance": [0, 150, 200], "multiplier": [1.0, 0.4, 0.05]})
-            orientation_multiplier = 1.0
-            if tag_orientation and tag_orientation in orientation_targets:
-                target_score = orientation_targets[tag_orientation]
-                distance = abs(orientation_score - target_score)
-                orientation_multiplier = np.interp(distance, curve_config['distance'], curve_config['multiplier'])
-
-            # Iterate through each specific role (slot) in the tag
-            for slot_def in slots:
+            base_name = tag_def.get('name')
+            concept = tag_def.get('concept')
+            roles = []
+            for slot_def in tag_def.get('slots', []):
                 if not (slot_def.get('gender') == gender or slot_def.get('gender') == "Any"):
                     continue
-
                 role = slot_def['role']
-                dynamic_role = slot_def.get('dynamic_role', 'Neutral')
-                
+
                 # THREE-TIER HIERARCHICAL PREFERENCE LOOKUP
-                base_name = tag_def.get('name')
-                concept = tag_def.get('concept')
-                
                 # Start with a neutral default
                 base_pref = 1.0
-                
+
                 # 1. Check for Concept preference (most general)
                 if concept and concept in archetype_action_prefs and role in archetype_action_prefs[concept]:
                     base_pref = archetype_action_prefs[concept][role]
@@ -189,31 +174,55 @@ class TalentGenerator:
                 # 3. Check for Full Name preference (most specific, overwrites all others)
                 if full_name in archetype_action_prefs and role in archetype_action_prefs[full_name]:
                     base_pref = archetype_action_prefs[full_name][role]
-                # --- END NEW LOGIC ---
 
-                # Apply D/S disposition shifter based on the dynamic_role
-                adjusted_pref = base_pref
-                if dynamic_role == "Dominant":
-                    adjusted_pref = base_pref * (1 + ds_balance * preference_shift_intensity)
-                elif dynamic_role == "Submissive":
-                    adjusted_pref = base_pref * (1 - ds_balance * preference_shift_intensity)
-                
-                # Combine with orientation and store
-                final_score = round(adjusted_pref * orientation_multiplier, 2)
-                prefs[full_name][role] = final_score
+                roles.append((role, slot_def.get('dynamic_role', 'Neutral'), base_pref))
+            if roles:
+                base_preferences.append((full_name, tag_def.get('orientation'), roles))
+        return base_preferences
 
-        # Finalize hard limits: if any role for a tag is below the threshold, the whole tag is a limit.
-        tags_to_make_limits = set()
-        for tag_name, roles_prefs in prefs.items():
-            if any(score < hard_limit_threshold for score in roles_prefs.values()):
-                tags_to_make_limits.add(tag_name)
+    def _orientation_multiplier(self, tag_orientation: Optional[str], orientation_score: int) -> float:
+        key = (tag_orientation, orientation_score)
+        if (multiplier := self._orientation_multipliers.get(key)) is None:
+            orientation_targets = {"Straight": -100, "Gay": 100, "Lesbian": 100}
+            curve_config = self.gen_config.get("orientation_multiplier_curve", {"distance": [0, 150, 200], "multiplier": [1.0, 0.4, 0.05]})
+            multiplier = 1.0
+            if tag_orientation and tag_orientation in orientation_targets:
+                distance = abs(orientation_score - orientation_targets[tag_orientation])
+                multiplier = float(np.interp(distance, curve_config['distance'], curve_config['multiplier']))
+            self._orientation_multipliers[key] = multiplier
+        return multiplier
 
-        for tag_name in tags_to_make_limits:
-            if tag_name not in limits:
-                limits.append(tag_name)
-            del prefs[tag_name]
+    def _generate_preferences_and_limits(self, gender: str, orientation_score: int, disposition_score: int, archetype_data: dict) -> tuple[Dict[str, Dict[str, float]], List[str]]:
+        """
+        Generates role-based tag preferences and hard limits based on an archetype,
+        orientation, and D/S disposition, using a Specific > Base > Concept hierarchy.
+        """
+        prefs: Dict[str, Dict[str, float]] = {}
+        limits = archetype_data.get("hard_limits", []).copy()
+        
+        preference_shift_intensity = self.game_constant.get('preference_shift_intensity', 0.5)
+        hard_limit_threshold = self.game_constant.get('hard_limit_threshold', 0.1)
+
+        # Calculate shifters once
+        ds_balance = disposition_score / 100.0
+        shifters = {"Dominant": 1 + ds_balance * preference_shift_intensity,
+                    "Submissive": 1 - ds_balance * preference_shift_intensity}
+        
+        for full_name, tag_orientation, roles in self._base_preferences(gender, archetype_data):
+            orientation_multiplier = self._orientation_multiplier(tag_orientation, orientation_score)
 
-        return dict(prefs), limits
+            # Apply the D/S disposition shifter based on each role's dynamic_role, then orientation
+            roles_prefs = {role: round(base_pref * shifters.get(dynamic_role, 1.0) * orientation_multiplier, 2)
+                           for role, dynamic_role, base_pref in roles}
+
+            # If any role for a tag is below the threshold, the whole tag is a hard limit.
+            if min(roles_prefs.values()) < hard_limit_threshold:
+                if full_name not in limits:
+                    limits.append(full_name)
+            else:
+                prefs[full_name] = roles_prefs
+
+        return prefs, limits
 
 
     def _generate_policy_requirements(self, professionalism: int) -> Dict[str, List[str]]:
@@ -237,6 +246,12 @@ class TalentGenerator:
         return reqs
 
     def _calculate_age_affinities(self, age: int, gender: str) -> Dict[str, int]:
+        key = (age, gender)
+        if key not in self._age_affinities:
+            self._age_affinities[key] = self._compute_age_affinities(age, gender)
+        return self._age_affinities[key]
+
+    def _compute_age_affinities(self, age: int, gender: str) -> Dict[str, int]:
         affinities = {}
         gender_data = self.affinity_data.get(gender)
         if not gender_data:
@@ -265,6 +280,11 @@ class TalentGenerator:
 
     def _calculate_dick_size_affinities(self, size: int) -> Dict[str, int]:
         """Calculates dick size-based tag affinities."""
+        if size not in self._dick_size_affinities:
+            self._dick_size_affinities[size] = self._compute_dick_size_affinities(size)
+        return self._dick_size_affinities[size]
+
+    def _compute_dick_size_affinities(self, size: int) -> Dict[str, int]:
         dick_size_data = self.affinity_data.get("DickSize", {})
         size_points = dick_size_data.get("size_points", [])
         tags_data = dick_size_data.get("tags", {})
@@ -370,4 +390,9 @@ class TalentGenerator:
 
     def generate_multiple_talents(self, count: int, start_id: int) -> List[Talent]:
         """Generates a list of new Talent objects."""
-        return [self.generate_talent(start_id + i) for i in range(count)]
\ No newline at end of file
+        return list(self.iter_talents(count, start_id))
+
+    def iter_talents(self, count: int, start_id: int) -> Iterator[Talent]:
+        """Generates new Talent objects one at a time, for pools too large to hold at once."""
+        for i in range(count):
+            yield self.generate_talent(start_id + i)
\ No newline at end of file
@@ -0,0 +1,44 @@
+import logging
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from data.save_manager import SaveManager
+from services.models.results import WeekAdvancementResult
+from services.time_service import TimeService
+
+logger = logging.getLogger(__name__)
+
+PHASE_SAVE = "save"
+
+class WeekAdvanceWorkerSignals(QObject):
+    """
+    Signals for WeekAdvanceWorker. The object is created on the GUI thread, so
+    connected slots run there (queued) while the worker itself runs in the pool.
+    """
+    phase_started = pyqtSignal(str)
+    finished = pyqtSignal(object)  # WeekAdvancementResult
+    failed = pyqtSignal(str)
+
+class WeekAdvanceWorker(QRunnable):
+    """
+    Runs TimeService.advance_week, followed by the autosave, on a QThreadPool
+    thread. TimeService opens its own session from the DBManager session
+    factory, so nothing here touches a session owned by the GUI thread.
+    Results are only reported through signals; all state updates and UI
+    signals are left to the controller on the GUI thread.
+    """
+    def __init__(self, time_service: TimeService, save_manager: SaveManager):
+        super().__init__()
+        self.time_service = time_service
+        self.save_manager = save_manager
+        self.signals = WeekAdvanceWorkerSignals()
+
+    def run(self):
+        try:
+            result: WeekAdvancementResult = self.time_service.advance_week(on_phase=self.signals.phase_started.emit)
+            self.signals.phase_started.emit(PHASE_SAVE)
+            self.save_manager.auto_save()
+        except Exception as e:
+            logger.error(f"Week advancement worker failed: {e}", exc_info=True)
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
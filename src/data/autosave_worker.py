@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from data.save_manifest import describe_image, describe_save_file, LOCATION_FILE, LOCATION_STORE
+from data.save_store import SaveStore
+
+logger = logging.getLogger(__name__)
+
+AUTOSAVE_MANIFEST_NAME = "autosave_manifest.json"
+BACKUP_PAGES_PER_STEP = 256
+
+class AutosaveWorker:
+    """
+    Snapshots the live session database into a ring of autosave slots on a
+    background thread, using SQLite's online backup API.
+
+    The backup runs over its own read-only connection in steps of
+    `pages_per_step` pages, so the game's engine stays connected and can keep
+    writing; SQLite restarts the copy if the source changes mid-backup, which
+    keeps every snapshot consistent. Each snapshot is written to a temporary
+    file and moved into place with os.replace(), so a slot on disk is always
+    either the previous complete save or the new one.
+
+    Slot order is kept in a small JSON manifest (newest first) instead of being
+    derived from file modification times. Requests that arrive while a backup
+    is running are coalesced: only the most recent one is kept.
+
+    With a `store`, slots are written to the SaveStore instead of to files,
+    which stores only the pages that changed since earlier saves.
+
+    `on_saved` is called on the worker thread after each snapshot with the
+    slot name, its describe_image() result and where it was written.
+    """
+    def __init__(self, save_dir: Path, slot_prefix: str, slot_count: int,
+                 pages_per_step: int = BACKUP_PAGES_PER_STEP, store: Optional[SaveStore] = None,
+                 on_saved: Optional[Callable[[str, Dict, str], None]] = None):
+        self.save_dir = Path(save_dir)
+        self.slot_prefix = slot_prefix
+        self.slot_count = slot_count
+        self.pages_per_step = pages_per_step
+        self.store = store
+        self.on_saved = on_saved
+        self.manifest_path = self.save_dir / AUTOSAVE_MANIFEST_NAME
+
+        self._condition = threading.Condition()
+        self._pending_source: Optional[str] = None
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, source_path: str):
+        """
+        Queues a snapshot of `source_path`, a database file or an SQLite URI
+        (e.g. an in-memory live session). Returns immediately.
+        """
+        with self._condition:
+            self._pending_source = source_path
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="AutosaveWorker", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until no snapshot is queued or running. Must be called before
+        the live session file is replaced or deleted. Returns False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending_source is None and not self._busy, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._pending_source is None:
+                    self._thread = None
+                    return
+                source_path, self._pending_source = self._pending_source, None
+                self._busy = True
+            try:
+                self._snapshot(source_path)
+            except Exception as e:
+                logger.error(f"Autosave of '{source_path}' failed: {e}", exc_info=True)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _snapshot(self, source_path: str):
+        if source_path.startswith("file:"):
+            source_uri = source_path
+        elif os.path.exists(source_path):
+            source_uri = f"{Path(source_path).as_uri()}?mode=ro"
+        else:
+            logger.warning(f"Autosave skipped, live session '{source_path}' no longer exists.")
+            return
+
+        slots = self._read_manifest()
+        slot_name = self._next_slot(slots)
+        slot_path = self.save_dir / f"{slot_name}.sqlite"
+        temp_path = self.save_dir / f"{slot_name}.sqlite.tmp"
+
+        source = sqlite3.connect(source_uri, uri=True)
+        try:
+            if not source.execute("SELECT count(*) FROM sqlite_master").fetchone()[0]:
+                # An in-memory session that has since been closed opens as empty.
+                logger.warning(f"Autosave skipped, live session '{source_path}' is empty.")
+                return
+            if self.store is None:
+                dest = sqlite3.connect(temp_path)
+                try:
+                    source.backup(dest, pages=self.pages_per_step)
+                    # Keeps the copy out of the live session's WAL mode.
+                    dest.execute("PRAGMA journal_mode = DELETE")
+                finally:
+                    dest.close()
+        finally:
+            source.close()
+        if self.store is not None:
+            describe = describe_image if self.on_saved else None
+            description = self.store.write_slot(slot_name, source_uri, describe).description
+            # A full-copy autosave from before the store would shadow the new slot.
+            slot_path.unlink(missing_ok=True)
+        else:
+            os.replace(temp_path, slot_path)
+
+        slots = [slot_name] + [s for s in slots if s != slot_name]
+        self._write_manifest(slots)
+        if self.on_saved:
+            if self.store is None:
+                self.on_saved(slot_name, describe_save_file(slot_path), LOCATION_FILE)
+            else:
+                self.on_saved(slot_name, description, LOCATION_STORE)
+        logger.debug(f"Autosaved to {slot_path}")
+
+    def _next_slot(self, slots: List[str]) -> str:
+        """Reuses the oldest slot once the ring is full, else the first unused name."""
+        if len(slots) >= self.slot_count:
+            return slots[-1]
+        used = set(slots)
+        return next(f"{self.slot_prefix}_{i}" for i in range(self.slot_count) if f"{self.slot_prefix}_{i}" not in used)
+
+    def _read_manifest(self) -> List[str]:
+        """
+        Returns the autosave slots, newest first, dropping any whose file has
+        been deleted. Without a readable manifest (e.g. saves from an older
+        version) the order is rebuilt once from file modification times.
+        """
+        valid_names = {f"{self.slot_prefix}_{i}" for i in range(self.slot_count)}
+        stored = {s['name']: s['date'].timestamp() for s in self.store.list_slots()} if self.store else {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                slots = json.load(f)['slots']
+        except (OSError, ValueError, KeyError, TypeError):
+            saved_times = {p.stem: p.stat().st_mtime for p in self.save_dir.glob(f"{self.slot_prefix}_*.sqlite")}
+            saved_times.update(stored)
+            slots = sorted(saved_times, key=saved_times.get, reverse=True)
+        return [s for s in slots if s in valid_names and (s in stored or (self.save_dir / f"{s}.sqlite").exists())]
+
+    def _write_manifest(self, slots: List[str]):
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'slots': slots, 'updated': datetime.now().isoformat()}, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
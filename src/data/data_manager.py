@@ -69,8 +69,11 @@ class DataManager:
                 # Attempt to parse as JSON first (for lists/dicts)
                 config[row['key']] = json.loads(row['value'])
             except (json.JSONDecodeError, TypeError):
-                # Fallback to float, int, or string
+                # Fallback to bool (as older migrations stored it), float, int, or string
                 val = row['value']
+                if val in ('True', 'False'):
+                    config[row['key']] = val == 'True'
+                    continue
                 try:
                     if '.' in val: config[row['key']] = float(val)
                     else: config[row['key']] = int(val)
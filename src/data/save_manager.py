@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -8,7 +9,11 @@ from typing import List, Dict, Optional
 import gc  # <--- IMPORT GARBAGE COLLECTOR
 
 from data.game_state import *
-from database.db_manager import DBManager
+from data.autosave_worker import AutosaveWorker
+from data.save_manifest import SaveManifest, describe_image, describe_save_file, LOCATION_FILE, LOCATION_STORE
+from data.save_store import SaveStore, SAVE_STORE_NAME
+from database.db_manager import DBManager, wal_file_paths
+from database.live_session import copy_database, journal_path, memory_db_supported
 from database.db_models import GameInfoDB
 from utils.paths import SAVE_DIR
 
@@ -18,15 +23,41 @@ AUTOSAVE_NAME = "autosave"
 QUICKSAVE_NAME = "quicksave"
 EXITSAVE_NAME = "exitsave"
 LIVE_SESSION_NAME = "session" # The name of the temporary DB file for the live game
+RECOVERED_SAVE_NAME = "recovered" # Last checkpoint of a session that did not shut down cleanly
 AUTOSAVE_COUNT = 4
 
 class SaveManager:
     """
     Manages game save/load operations and database file management.
+
+    With `in_memory`, the live game runs in an in-memory database instead of
+    session.sqlite. session.sqlite then holds its latest checkpoint, which is
+    refreshed on autosave, on save and every `checkpoint_interval` seconds.
+
+    With `delta_saves`, saves go into a SaveStore that keeps each database
+    page once across all slots (zlib-compressed with `compress_saves`), rather
+    than into one full .sqlite copy per slot. Full-copy saves from earlier
+    versions stay listed and loadable; compact_saves() moves them into the store.
+
+    Every save is indexed in a SaveManifest as it is written, so listing saves
+    reads one JSON file instead of opening each save.
     """
-    def __init__(self):
-        Path(SAVE_DIR).mkdir(exist_ok=True)
+    def __init__(self, save_dir: Path = SAVE_DIR, in_memory: bool = False,
+                 checkpoint_interval: Optional[float] = None, delta_saves: bool = False,
+                 compress_saves: bool = False):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        if in_memory and not memory_db_supported():
+            logger.warning("In-memory live session needs SQLite 3.36 or newer; using session.sqlite on disk.")
+            in_memory = False
+        self.in_memory = in_memory
+        self.checkpoint_interval = checkpoint_interval
+        self.store = SaveStore(self.save_dir / SAVE_STORE_NAME, compress_saves) if delta_saves else None
+        self.manifest = SaveManifest(self.save_dir, self._scan_saves)
         self.db_manager = DBManager()
+        self.autosave_worker = AutosaveWorker(self.save_dir, AUTOSAVE_NAME, AUTOSAVE_COUNT, store=self.store,
+                                              on_saved=self.manifest.record)
+        self.recover_crashed_session()
         self.cleanup_session_file()
     
     def get_current_session_path(self) -> Optional[str]:
@@ -36,78 +67,92 @@ class SaveManager:
         return None
 
     def get_save_path(self, save_name: str) -> Path:
-        return Path(SAVE_DIR) / f"{save_name}.sqlite"
+        return self.save_dir / f"{save_name}.sqlite"
 
     def create_new_save_db(self, save_name: str):
         """Creates a new, blank database file for a new game."""
         path = self.get_save_path(save_name)
-        self.db_manager.create_database(str(path))
+        self.autosave_worker.wait()
+        if self.in_memory and save_name == LIVE_SESSION_NAME:
+            self.db_manager.disconnect()
+            if path.exists(): path.unlink()
+            self.db_manager.connect_in_memory(str(path), checkpoint_interval=self.checkpoint_interval)
+        else:
+            self.db_manager.create_database(str(path))
         return str(path)
 
-    def copy_save(self, source_path: str, dest_save_name: str):
-        """Copies the currently active DB file to a new named save."""
+    def copy_save(self, source_path: str, dest_save_name: str) -> bool:
+        """Copies the currently active DB file to a new named save. Returns False on failure."""
         if not source_path or not os.path.exists(source_path):
             logger.error(f"ERROR: Cannot copy save, source path '{source_path}' does not exist.")
-            return
+            return False
         dest_path = self.get_save_path(dest_save_name)
         try:
-            shutil.copyfile(source_path, dest_path)
-        except IOError as e:
+            if self.store:
+                description = self.store.write_slot(dest_save_name, source_path, describe_image).description
+                dest_path.unlink(missing_ok=True)
+                self.manifest.record(dest_save_name, description, LOCATION_STORE)
+            else:
+                # Not a file copy: commits still in the live session's WAL must be included.
+                copy_database(source_path, dest_path)
+                self.manifest.record(dest_save_name, describe_save_file(dest_path), LOCATION_FILE)
+            return True
+        except (IOError, sqlite3.Error, ValueError) as e:
             logger.error(f"Error copying save file: {e}")
+            return False
     
     def auto_save(self):
-        """Manages rolling autosaves and commits the current session."""
-        
-        # This disconnect is crucial on some systems to release the lock before copying
+        """
+        Queues a snapshot of the committed live session into the next rolling
+        autosave slot. The copy runs on a background thread via the SQLite
+        backup API, so this returns immediately and the engine stays connected.
+        An in-memory live session is snapshotted straight from memory and also
+        checkpointed.
+        """
         live_db_path = self.db_manager.db_path
-        self.db_manager.disconnect()
-        
-        self._manage_rolling_autosaves()
-        
-        # Copy the committed live DB to the new autosave_0 slot
         if live_db_path:
-            self.copy_save(live_db_path, f"{AUTOSAVE_NAME}_0")
-
-        # Reconnect to the live session file
-        self.db_manager.connect_to_db(live_db_path)
-
-
-    def _manage_rolling_autosaves(self):
-        """Rotates existing autosave files."""
-        autosave_files = sorted(Path(SAVE_DIR).glob(f"{AUTOSAVE_NAME}_*.sqlite"), 
-                                key=lambda p: os.path.getmtime(p), reverse=True)
-
-        # Rename older files
-        for i in range(len(autosave_files) - 1, -1, -1):
-            file_path = autosave_files[i]
-            # Simple numeric rename based on position
-            new_index = i + 1
-            if new_index < AUTOSAVE_COUNT:
-                new_path = self.get_save_path(f"{AUTOSAVE_NAME}_{new_index}")
-                if new_path.exists(): new_path.unlink() # Avoid errors if target exists
-                file_path.rename(new_path)
-            else:
-                # Delete the oldest if we exceed the count
-                file_path.unlink()
+            self.db_manager.checkpoint()
+            self.autosave_worker.submit(self.db_manager.memory_uri or live_db_path)
+
+    def checkpoint_live_session(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the live session file on disk is current, so it can be
+        copied. Only in-memory sessions need this. Returns False on timeout.
+        """
+        return self.db_manager.checkpoint(wait=True, timeout=timeout)
+
+    def wait_for_autosave(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until any queued or running autosave has finished."""
+        return self.autosave_worker.wait(timeout)
     
     def load_game(self, save_name: str) -> GameState:
         """
-        Copies the specified save DB to a temporary live session file,
-        connects to it, and loads only the simple GameInfo.
+        Copies the specified save DB to a temporary live session file (or into
+        memory), connects to it, and loads only the simple GameInfo.
         """
         source_path = self.get_save_path(save_name)
-        if not source_path.exists():
+        in_store = self._in_store(save_name)
+        if not in_store and not source_path.exists():
+            self.manifest.remove(save_name)
             raise FileNotFoundError(f"Save file {source_path} not found")
         
         live_session_path = self.get_save_path(LIVE_SESSION_NAME)
         
-        # Disconnect from any previous session before overwriting the file
+        # Let a pending autosave finish reading the old session, then disconnect
+        # from it before overwriting the file
+        self.autosave_worker.wait()
         self.db_manager.disconnect()
         
         # Copy the selected save to be the new live session
-        shutil.copyfile(source_path, live_session_path)
-
-        self.db_manager.connect_to_db(str(live_session_path))
+        if in_store:
+            self.store.restore_slot(save_name, live_session_path)
+            source_path = live_session_path
+        if self.in_memory:
+            self.db_manager.connect_in_memory(str(live_session_path), str(source_path), self.checkpoint_interval)
+        else:
+            if source_path != live_session_path:
+                shutil.copyfile(source_path, live_session_path)
+            self.db_manager.connect_to_db(str(live_session_path))
         session = self.db_manager.get_session()
         
         game_info = {row.key: row.value for row in session.query(GameInfoDB).all()}
@@ -127,39 +172,117 @@ class SaveManager:
         if not save_files: return None
         return save_files[0]['name']
 
+    def _in_store(self, save_name: str) -> bool:
+        return self.store is not None and self.store.has_slot(save_name)
+
+    def _listed_saves(self) -> Dict[str, Dict]:
+        """Manifest entries of the saves this manager can load."""
+        return {name: entry for name, entry in self.manifest.entries().items()
+                # Do not show the internal session file to the player
+                if name != LIVE_SESSION_NAME and (self.store or entry['location'] != LOCATION_STORE)}
+
     def quick_load_exists(self) -> bool:
-        return self.get_save_path(QUICKSAVE_NAME).exists()
+        return QUICKSAVE_NAME in self._listed_saves()
 
     def has_saves(self) -> bool:
-        # Check for any save file that isn't the live session file
-        return any(p.stem != LIVE_SESSION_NAME for p in Path(SAVE_DIR).glob("*.sqlite"))
+        return bool(self._listed_saves())
 
     def delete_save(self, save_name: str) -> bool:
+        deleted = self.store.delete_slot(save_name) if self.store else False
         path = self.get_save_path(save_name)
         if path.exists():
             try:
                 path.unlink()
-                return True
+                deleted = True
             except OSError as e:
                 logger.error(f"Error deleting save file {path}: {e}")
                 return False
-        return False
+        if deleted:
+            self.manifest.remove(save_name)
+        return deleted
     
     def get_save_files(self) -> List[Dict]:
+        """
+        Every save, newest first, with its in-game date, money and studio
+        stats. Read from the save manifest; no save database is opened.
+        """
         saves = []
-        for file in Path(SAVE_DIR).glob("*.sqlite"):
-            # Do not show the internal session file to the player
+        for name, entry in self._listed_saves().items():
+            path = self.store.path if entry['location'] == LOCATION_STORE else self.get_save_path(name)
+            saves.append({**entry, 'path': str(path), 'date': datetime.fromisoformat(entry['saved'])})
+        return sorted(saves, key=lambda x: x['date'], reverse=True)
+
+    def _scan_saves(self) -> Dict[str, Dict]:
+        """Manifest entries rebuilt by reading every save; used when the manifest is lost."""
+        entries = {}
+        for file in self.save_dir.glob("*.sqlite"):
             if file.stem == LIVE_SESSION_NAME:
                 continue
-            stats = file.stat()
-            saves.append({
-                'name': file.stem,
-                'path': str(file),
-                'date': datetime.fromtimestamp(stats.st_mtime),
-                'size': stats.st_size
-            })
-        return sorted(saves, key=lambda x: x['date'], reverse=True)
+            try:
+                description = describe_save_file(file)
+            except (OSError, sqlite3.Error, ValueError) as e:
+                logger.error(f"Skipping unreadable save file {file}: {e}")
+                continue
+            saved = datetime.fromtimestamp(file.stat().st_mtime)
+            entries[file.stem] = {'name': file.stem, **description, 'location': LOCATION_FILE, 'saved': saved.isoformat()}
+        if self.store:
+            # Saving into the store removes any full copy of the same name, so the slot is the newer one.
+            for slot in self.store.list_slots():
+                try:
+                    description = describe_image(self.store.read_slot(slot['name']))
+                except (sqlite3.Error, ValueError) as e:
+                    logger.error(f"Skipping unreadable save slot '{slot['name']}': {e}")
+                    continue
+                entries[slot['name']] = {'name': slot['name'], **description, 'location': LOCATION_STORE,
+                                         'saved': slot['date'].isoformat()}
+        logger.info(f"Rebuilt the save manifest from {len(entries)} saves.")
+        return entries
+
+    def compact_saves(self) -> int:
+        """
+        Moves full-copy .sqlite saves into the store and drops the pages no
+        save uses any more. Returns the number of saves moved. Does nothing
+        without delta saves.
+        """
+        if not self.store:
+            return 0
+        self.autosave_worker.wait()
+        moved = 0
+        for file in self.save_dir.glob("*.sqlite"):
+            if file.stem == LIVE_SESSION_NAME or self.store.has_slot(file.stem):
+                continue
+            try:
+                saved = datetime.fromtimestamp(file.stat().st_mtime)
+                description = self.store.write_slot(file.stem, str(file), describe_image).description
+                file.unlink()
+                # Keeps the original save time, so the order of saves does not change.
+                self.manifest.record(file.stem, description, LOCATION_STORE, saved)
+                moved += 1
+            except (OSError, sqlite3.Error, ValueError) as e:
+                logger.error(f"Could not move save '{file.stem}' into the save store: {e}")
+        self.store.compact()
+        return moved
     
+    def recover_crashed_session(self) -> Optional[str]:
+        """
+        A checkpoint journal left behind means the last in-memory session did
+        not shut down cleanly. Its checkpoint is kept as a regular save, so the
+        player loses at most one checkpoint interval. Returns the save name.
+        """
+        session_path = self.get_save_path(LIVE_SESSION_NAME)
+        journal = journal_path(session_path)
+        if not journal.exists():
+            return None
+        recovered = None
+        if session_path.exists():
+            if self.copy_save(str(session_path), RECOVERED_SAVE_NAME):
+                recovered = RECOVERED_SAVE_NAME
+                logger.warning(f"Previous session did not shut down cleanly; its last checkpoint was saved as '{RECOVERED_SAVE_NAME}'.")
+            else:
+                logger.error("Could not recover the previous session.")
+        journal.unlink(missing_ok=True)
+        return recovered
+
     def cleanup_session_file(self):
         """Deletes the temporary live session database file if it exists.
         This method is the single point of truth for session cleanup. It
@@ -169,6 +292,14 @@ class SaveManager:
         import time
         
         session_path = self.get_save_path(LIVE_SESSION_NAME)
+        self.autosave_worker.wait()
+        # Stop checkpointing before its journal goes: a clean shutdown leaves none.
+        if self.db_manager:
+            self.db_manager.disconnect()
+        journal_path(session_path).unlink(missing_ok=True)
+        # A crashed disk session leaves its WAL behind, which would be replayed into the next one.
+        for path in wal_file_paths(session_path):
+            path.unlink(missing_ok=True)
         if not session_path.exists():
             logger.debug("cleanup_session_file called, but no session.sqlite exists. Nothing to do.")
             return
@@ -222,4 +353,4 @@ class SaveManager:
 
         # 4. Re-initialize the DBManager for future operations (e.g., starting a new game).
         logger.debug("Re-initializing DBManager for future use.")
-        self.db_manager = DBManager()
\ No newline at end of file
+        self.db_manager = DBManager()
\ No newline at end of file
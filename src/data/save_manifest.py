@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SAVE_MANIFEST_NAME = "save_manifest.json"
+MANIFEST_VERSION = 1
+# Where a save's database lives: a slot in the SaveStore or a full-copy .sqlite file.
+LOCATION_STORE = "store"
+LOCATION_FILE = "file"
+
+def summarize_save(conn: sqlite3.Connection) -> Dict:
+    """The in-game date, money and studio stats of the save open on `conn`."""
+    info = dict(conn.execute("SELECT key, value FROM game_info WHERE key IN ('week', 'year', 'money')"))
+    released, revenue = conn.execute(
+        "SELECT count(*), coalesce(sum(revenue), 0) FROM scenes WHERE status = 'released'"
+    ).fetchone()
+    return {
+        'week': int(info.get('week', 1)),
+        'year': int(info.get('year', 0)),
+        'money': int(info.get('money', 0)),
+        'stats': {'scenes_released': released, 'total_revenue': revenue},
+    }
+
+def describe_image(image: bytes) -> Dict:
+    """Summary, size and checksum of a serialized save database."""
+    with closing(sqlite3.connect(":memory:")) as conn:
+        conn.deserialize(image)
+        summary = summarize_save(conn)
+    return {**summary, 'size': len(image), 'checksum': blake2b(image, digest_size=16).hexdigest()}
+
+def describe_save_file(path: Path) -> Dict:
+    """Like describe_image(), for a full-copy .sqlite save; opens the file once."""
+    return describe_image(Path(path).read_bytes())
+
+class SaveManifest:
+    """
+    An index of every save with what the start screen and the save browser
+    show for it, kept in one JSON file so listing saves opens that file and
+    no save database.
+
+    The index is updated whenever a save is written or deleted and replaced
+    atomically with os.replace(), so a crash leaves either the old or the new
+    version. If it is missing or unreadable it is rebuilt once with `rescan`,
+    which returns the entries by reading the saves themselves.
+    """
+    def __init__(self, save_dir: Path, rescan: Callable[[], Dict[str, Dict]]):
+        self.path = Path(save_dir) / SAVE_MANIFEST_NAME
+        self._rescan = rescan
+        # The autosave thread records its slots while the main thread lists or saves.
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    def entries(self) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._load())
+
+    def get(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            return self._load().get(name)
+
+    def record(self, name: str, description: Dict, location: str, saved: Optional[datetime] = None):
+        """Adds or replaces the entry for save `name` from its describe_image() result."""
+        entry = {'name': name, **description, 'location': location,
+                 'saved': (saved or datetime.now()).isoformat()}
+        with self._lock:
+            self._load()[name] = entry
+            self._write()
+
+    def remove(self, name: str):
+        with self._lock:
+            if self._load().pop(name, None) is not None:
+                self._write()
+
+    def rebuild(self) -> Dict[str, Dict]:
+        """Discards the index and rebuilds it from the saves on disk."""
+        with self._lock:
+            self._entries = None
+            self.path.unlink(missing_ok=True)
+            return dict(self._load())
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data['version'] != MANIFEST_VERSION:
+                    raise ValueError(f"unsupported version {data['version']}")
+                self._entries = dict(data['saves'])
+            except FileNotFoundError:
+                self._entries = self._rescan()
+                self._write()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Save manifest {self.path} is unreadable ({e}); rebuilding it from the saves.")
+                self._entries = self._rescan()
+                self._write()
+        return self._entries
+
+    def _write(self):
+        temp_path = self.path.with_suffix(".json.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'saves': self._entries}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # The saves themselves are intact; without a stale index the next start rebuilds it.
+            logger.error(f"Could not write save manifest {self.path}: {e}")
+            self.path.unlink(missing_ok=True)
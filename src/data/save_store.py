@@ -0,0 +1,212 @@
+import logging
+import os
+import sqlite3
+import zlib
+from array import array
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from database.live_session import without_wal_header
+
+logger = logging.getLogger(__name__)
+
+SAVE_STORE_NAME = "save_store.db"
+BACKUP_PAGES_PER_STEP = 256
+# Digests and page ids are looked up in chunks to stay under SQLite's variable limit.
+LOOKUP_CHUNK = 500
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY, digest BLOB NOT NULL UNIQUE, "
+    "codec INTEGER NOT NULL, data BLOB NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS slots (name TEXT PRIMARY KEY, page_size INTEGER NOT NULL, "
+    "page_ids BLOB NOT NULL, db_size INTEGER NOT NULL, saved TEXT NOT NULL)",
+)
+
+@dataclass(frozen=True)
+class SlotWriteResult:
+    """What one write_slot() call stored."""
+    page_count: int
+    new_pages: int
+    bytes_written: int
+    # What write_slot()'s `describe` returned for the stored image.
+    description: Optional[Dict] = None
+
+def _source_uri(source: str) -> str:
+    return source if source.startswith("file:") else f"{Path(source).resolve().as_uri()}?mode=ro"
+
+def _page_size(image: bytes) -> int:
+    # Big-endian at offset 16 of the database header; 1 stands for 65536.
+    size = int.from_bytes(image[16:18], 'big')
+    return 65536 if size == 1 else size
+
+def _chunks(items: list, size: int = LOOKUP_CHUNK) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class SaveStore:
+    """
+    Save slots kept as lists of database pages in one content-addressed store.
+
+    Writing a slot takes a consistent image of the source database with the
+    backup API, splits it into SQLite pages and stores only the pages the store
+    does not already hold, identified by their digest. A slot is the list of
+    its page ids, so a save that differs from an earlier one by a few pages
+    costs those pages plus the list, and every slot restores in one pass with
+    no chain of deltas to replay. Pages are optionally zlib-compressed.
+
+    Overwriting or deleting slots leaves unreferenced pages behind until
+    compact() is run. The store is itself an SQLite database, so each write is
+    a single transaction and a crash leaves the previous slot intact.
+    """
+    def __init__(self, path: Path, compress: bool = False):
+        self.path = Path(path)
+        self.compress = compress
+        with closing(self._connect()) as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        # The autosave thread and the main thread each open their own connection.
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _encode(self, page: bytes) -> Tuple[int, bytes]:
+        if self.compress:
+            packed = zlib.compress(page, 1)
+            if len(packed) < len(page):
+                return CODEC_ZLIB, packed
+        return CODEC_RAW, page
+
+    def write_slot(self, name: str, source: str,
+                   describe: Optional[Callable[[bytes], Dict]] = None) -> SlotWriteResult:
+        """
+        Stores the committed state of `source`, a database file or SQLite URI,
+        as slot `name`. `describe` is called with the exact image stored, so
+        anything derived from it matches the slot.
+        """
+        snapshot = sqlite3.connect(":memory:")
+        try:
+            src = sqlite3.connect(_source_uri(source), uri=True)
+            try:
+                src.backup(snapshot, pages=BACKUP_PAGES_PER_STEP)
+            finally:
+                src.close()
+            image = without_wal_header(snapshot.serialize())
+        finally:
+            snapshot.close()
+        if not image:
+            raise ValueError(f"'{source}' is an empty database")
+
+        page_size = _page_size(image)
+        pages = [image[offset:offset + page_size] for offset in range(0, len(image), page_size)]
+        digests = [blake2b(page, digest_size=16).digest() for page in pages]
+        description = describe(image) if describe else None
+
+        conn = self._connect()
+        try:
+            # Immediate, so compaction cannot drop a page between lookup and commit.
+            conn.execute("BEGIN IMMEDIATE")
+            ids: Dict[bytes, int] = {}
+            for chunk in _chunks(list(set(digests))):
+                ids.update(conn.execute(
+                    f"SELECT digest, id FROM pages WHERE digest IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            new_pages, bytes_written = 0, 0
+            for page, digest in zip(pages, digests):
+                if digest in ids: continue
+                codec, data = self._encode(page)
+                ids[digest] = conn.execute(
+                    "INSERT INTO pages (digest, codec, data) VALUES (?, ?, ?)", (digest, codec, data)
+                ).lastrowid
+                new_pages += 1
+                bytes_written += len(data)
+            page_ids = array('q', (ids[digest] for digest in digests)).tobytes()
+            conn.execute(
+                "INSERT OR REPLACE INTO slots (name, page_size, page_ids, db_size, saved) VALUES (?, ?, ?, ?, ?)",
+                (name, page_size, page_ids, len(image), datetime.now().isoformat())
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return SlotWriteResult(len(pages), new_pages, bytes_written + len(page_ids), description)
+
+    def read_slot(self, name: str) -> bytes:
+        """The database image of slot `name`."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT page_ids, db_size FROM slots WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Save slot '{name}' not found in {self.path}")
+            page_ids = array('q')
+            page_ids.frombytes(row[0])
+            pages: Dict[int, bytes] = {}
+            for chunk in _chunks(list(set(page_ids))):
+                for page_id, codec, data in conn.execute(
+                    f"SELECT id, codec, data FROM pages WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    pages[page_id] = zlib.decompress(data) if codec == CODEC_ZLIB else data
+        finally:
+            conn.close()
+
+        image = b"".join(pages[page_id] for page_id in page_ids)
+        if len(image) != row[1]:
+            raise ValueError(f"Save slot '{name}' is damaged: expected {row[1]} bytes, rebuilt {len(image)}")
+        return image
+
+    def restore_slot(self, name: str, dest_path: Path):
+        """Rebuilds slot `name` as a database file at `dest_path`."""
+        image = self.read_slot(name)
+        temp_path = Path(dest_path).with_suffix(".sqlite.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(image)
+        os.replace(temp_path, dest_path)
+
+    def has_slot(self, name: str) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM slots WHERE name = ?", (name,)).fetchone() is not None
+
+    def list_slots(self) -> List[Dict]:
+        """Every slot with its database size and when it was saved."""
+        with closing(self._connect()) as conn:
+            return [{'name': name, 'size': db_size, 'date': datetime.fromisoformat(saved)}
+                    for name, db_size, saved in conn.execute("SELECT name, db_size, saved FROM slots")]
+
+    def delete_slot(self, name: str) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("DELETE FROM slots WHERE name = ?", (name,)).rowcount > 0
+
+    def compact(self) -> int:
+        """
+        Drops pages no slot references any more and shrinks the store file.
+        Returns the number of pages removed.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            referenced = set()
+            for (blob,) in conn.execute("SELECT page_ids FROM slots"):
+                page_ids = array('q')
+                page_ids.frombytes(blob)
+                referenced.update(page_ids)
+            orphans = [page_id for (page_id,) in conn.execute("SELECT id FROM pages") if page_id not in referenced]
+            for chunk in _chunks(orphans):
+                conn.execute(f"DELETE FROM pages WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            conn.execute("COMMIT")
+            conn.execute("VACUUM")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        logger.info(f"Compacted save store {self.path}: removed {len(orphans)} unreferenced pages")
+        return len(orphans)
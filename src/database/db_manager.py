@@ -1,13 +1,33 @@
 import logging
 import os
-from sqlalchemy import create_engine
+import sqlite3
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
+from typing import List, Optional
 
 from database.db_models import Base
+from database.live_session import LiveSessionCheckpointer, new_memory_db_uri
+from database.migrations import run_migrations
+from database.table_versions import TableVersions
 
 logger = logging.getLogger(__name__)
 
+def wal_file_paths(db_path) -> List[Path]:
+    """The write-ahead log and shared-memory files SQLite keeps next to a WAL-mode database."""
+    return [Path(f"{db_path}-wal"), Path(f"{db_path}-shm")]
+
+def _read_only_connection(uri: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    # Also refuses writes where the URI cannot be opened read-only (the memdb VFS).
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+def _use_normal_sync(dbapi_connection, connection_record):
+    # Safe in WAL mode: a power loss can drop the last commits but not corrupt the file.
+    dbapi_connection.execute("PRAGMA synchronous = NORMAL")
+
 class DBManager:
     """
     Handles SQLAlchemy engine and session creation for a given database file.
@@ -18,20 +38,98 @@ class DBManager:
     
     Services should use get_session_factory() and create sessions as needed
     for each operation to ensure proper transaction boundaries.
+
+    Read-only services get get_read_session_factory() instead, which is bound
+    to a second engine with its own pool of read-only connections. A live
+    session file runs in WAL mode, so these readers see the last committed
+    state without waiting while a week is processed in a long write
+    transaction. The in-memory database cannot use WAL: there the pools are
+    still separate and readers cannot write, but they wait while a write
+    transaction is open, as they did before.
     """
     def __init__(self):
         self.engine = None
+        self.read_engine = None
         self.SessionLocal = None
+        self.ReadSessionLocal = None
+        # Per-table commit counters of the connected database, for query caches.
+        self.table_versions: Optional[TableVersions] = None
         self.db_path = None
+        # Set while connected to an in-memory live session (see connect_in_memory).
+        self.memory_uri = None
+        self.checkpointer: Optional[LiveSessionCheckpointer] = None
+        self._memory_anchor: Optional[sqlite3.Connection] = None
 
     def connect_to_db(self, db_path: str):
         """Connects to a specific SQLite database file and creates the sessionmaker."""
         self.db_path = db_path
         db_url = f"sqlite:///{db_path}"
-        self.engine = create_engine(db_url, connect_args={"check_same_thread": False})
+        engine = create_engine(db_url, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _use_normal_sync)
+        with engine.connect() as conn:
+            # Persistent: the file stays in WAL mode for every later connection.
+            conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+        self._bind_engine(engine)
+        read_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self._bind_read_engine(read_uri)
+
+    def connect_in_memory(self, checkpoint_path: str, source_path: Optional[str] = None,
+                          checkpoint_interval: Optional[float] = None):
+        """
+        Connects to a new in-memory database, optionally filled from the save at
+        `source_path` with the backup API. Commits then cost no disk I/O; the
+        database is checkpointed to `checkpoint_path` in the background, every
+        `checkpoint_interval` seconds and whenever checkpoint() is called.
+
+        The database lives as long as an anchor connection held here, and is
+        shared by the engine's pooled connections through the memdb VFS.
+        """
+        self.db_path = checkpoint_path
+        self.memory_uri = new_memory_db_uri()
+        self._memory_anchor = sqlite3.connect(self.memory_uri, uri=True, check_same_thread=False)
+        if source_path:
+            source = sqlite3.connect(f"{Path(source_path).resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                source.backup(self._memory_anchor)
+            finally:
+                source.close()
+
+        memory_uri = self.memory_uri
+        self._bind_engine(create_engine(
+            "sqlite://", poolclass=QueuePool,
+            creator=lambda: sqlite3.connect(memory_uri, uri=True, check_same_thread=False)
+        ))
+        self._bind_read_engine(memory_uri)
+        self.checkpointer = LiveSessionCheckpointer(self.memory_uri, Path(checkpoint_path), checkpoint_interval)
+        self.checkpointer.request()
+
+    def _bind_engine(self, engine):
+        self.engine = engine
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.table_versions = TableVersions()
+        self.table_versions.track(self.SessionLocal)
         # Ensure the schema exists if the file is new/empty, but don't drop existing data.
         Base.metadata.create_all(bind=self.engine)
+        # Bring saves from older versions up to the current schema version.
+        run_migrations(self.engine)
+
+    def _bind_read_engine(self, uri: str):
+        """Binds the read-only engine; only after _bind_engine has created and migrated the schema."""
+        self.read_engine = create_engine(
+            "sqlite://", poolclass=QueuePool, creator=lambda: _read_only_connection(uri)
+        )
+        self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+
+    def checkpoint(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Writes an in-memory live session to its checkpoint file. With `wait`,
+        blocks until the file is current; returns False on timeout. A no-op
+        for file-backed databases, which are always current.
+        """
+        if not self.checkpointer:
+            return True
+        self.checkpointer.request()
+        return self.checkpointer.wait(timeout) if wait else True
 
     def get_session(self) -> Session:
         """
@@ -67,6 +165,16 @@ class DBManager:
             raise ConnectionError("Database not connected. Call connect_to_db first.")
         return self.SessionLocal
 
+    def get_read_session_factory(self):
+        """
+        Returns the sessionmaker for read-only services and the UI. Its sessions
+        cannot write, and each sees the last state committed before it started
+        reading, without blocking or being blocked by the writer.
+        """
+        if not self.ReadSessionLocal:
+            raise ConnectionError("Database not connected. Call connect_to_db first.")
+        return self.ReadSessionLocal
+
     def create_database(self, db_path: str):
         """Creates a new, empty database file with the required schema."""
         # Ensure the directory exists
@@ -74,15 +182,31 @@ class DBManager:
         # If file exists, remove it to ensure a fresh start
         if os.path.exists(db_path):
             os.remove(db_path)
+        # A log left by a crashed session would be replayed into the new file.
+        for path in wal_file_paths(db_path):
+            path.unlink(missing_ok=True)
             
         self.connect_to_db(db_path)
         # The connection logic already handles schema creation
         
     def disconnect(self):
         """Disposes of the engine connection."""
+        if self.checkpointer:
+            self.checkpointer.stop()
+            self.checkpointer = None
+        if self.read_engine:
+            # Readers go first, so the writer's last connection checkpoints and removes the WAL file.
+            self.read_engine.dispose()
+            self.read_engine = None
+            self.ReadSessionLocal = None
         if self.engine:
             logger.debug(f"Disposing of engine for database: {self.db_path}")
             self.engine.dispose() # This is the crucial step to close all connections
             self.engine = None
             self.session_factory = None
-            self.db_path = None
\ No newline at end of file
+            self.db_path = None
+        if self._memory_anchor:
+            # Closing the last connection frees the in-memory database.
+            self._memory_anchor.close()
+            self._memory_anchor = None
+            self.memory_uri = None
\ No newline at end of file
@@ -1,10 +1,14 @@
 import json
+import math
+import sqlite3
 from sqlalchemy import ( create_engine, Column, Integer, String, Float, Boolean,
-ForeignKey, JSON, CheckConstraint, PrimaryKeyConstraint )
-from sqlalchemy.orm import relationship, sessionmaker, declarative_base, ColumnProperty
+ForeignKey, JSON, CheckConstraint, PrimaryKeyConstraint, Index, event, select, cast, func )
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import relationship, sessionmaker, declarative_base, ColumnProperty, column_property
 from typing import Type, TypeVar, Any, Dict, List
 
 from data.game_state import *
+from database.row_mapper import compile_row_converter
 
 Base = declarative_base()
 T = TypeVar('T')
@@ -17,6 +21,10 @@ class DataclassMapper:
         db_instance = cls()
         for key, value in data_obj.__dict__.items():
             if hasattr(db_instance, key):
+                if isinstance(getattr(cls, key), property):
+                    # Plain Python views over child tables, e.g. TalentDB.hard_limits
+                    setattr(db_instance, key, value)
+                    continue
                 prop = getattr(cls, key).property
                 if isinstance(prop, ColumnProperty):
                     if isinstance(prop.columns[0].type, JSON):
@@ -32,40 +40,28 @@ class DataclassMapper:
         return db_instance
 
     def to_dataclass(self, dataclass_type: Type[T]) -> T:
-        """Creates a dataclass instance from a DB model instance."""
-        data = {}
-        for key in dataclass_type.__annotations__.keys():
-            if hasattr(self, key):
-                value = getattr(self, key)
-                data[key] = value
-        
-        if dataclass_type == Scene:
-            data['virtual_performers'] = [vp.to_dataclass(VirtualPerformer) for vp in self.virtual_performers]
-            data['action_segments'] = [seg.to_dataclass(ActionSegment) for seg in self.action_segments]
-            data['performer_contributions'] = [c.to_dataclass(ScenePerformerContribution) for c in self.performer_contributions_rel]
-            
-            # Re-create the dictionaries from the SceneCastDB relationship
-            data['final_cast'] = {str(c.virtual_performer_id): c.talent_id for c in self.cast}
-            data['pps_salaries'] = {str(c.talent_id): c.salary for c in self.cast}
-
-        elif dataclass_type == Talent:
-            # Re-create the popularity dictionary from the TalentPopularityDB relationship
-            data['popularity'] = {p.market_group_name: p.score for p in self.popularity_scores}
-            # Combine the two-way chemistry relationships into one dictionary
-            chem_dict = {}
-            for chem in self.chemistry_a:
-                chem_dict[chem.talent_b_id] = chem.chemistry_score
-            for chem in self.chemistry_b:
-                chem_dict[chem.talent_a_id] = chem.chemistry_score
-            data['chemistry'] = chem_dict
-        
-        elif dataclass_type == ActionSegment:
-            data['slot_assignments'] = [sa.to_dataclass(SlotAssignment) for sa in self.slot_assignments]
-        elif dataclass_type == ShootingBloc:
-            data['scenes'] = [s.to_dataclass(Scene) for s in self.scenes]
-        
-        # Use from_dict for dataclasses_json compatibility
-        return dataclass_type.from_dict(data)
+        """
+        Creates a dataclass instance from a DB model instance, using the
+        converter generated for this model and dataclass (see row_mapper).
+        """
+        key = (type(self), dataclass_type)
+        converter = _ROW_CONVERTERS.get(key)
+        if converter is None:
+            converter = _ROW_CONVERTERS[key] = compile_row_converter(
+                type(self), dataclass_type, _DERIVED_FIELDS.get(dataclass_type)
+            )
+        return converter(self)
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    """Provides power() on SQLite builds compiled without the math functions."""
+    if not isinstance(dbapi_connection, sqlite3.Connection): return
+    try:
+        dbapi_connection.execute("SELECT power(2, 2)")
+    except sqlite3.OperationalError:
+        dbapi_connection.create_function(
+            "power", 2, lambda x, y: None if x is None or y is None else math.pow(x, y), deterministic=True
+        )
 
 class GameInfoDB(Base):
     """Stores simple key-value game state like week, year, money."""
@@ -73,6 +69,17 @@ class GameInfoDB(Base):
     key = Column(String, primary_key=True)
     value = Column(String)
 
+POPULARITY_DECAY_RATE_KEY = 'popularity_decay_rate'
+DEFAULT_POPULARITY_DECAY_RATE = 0.95
+
+def game_info_value(key: str, type_=Integer):
+    """A scalar subquery reading one game_info value, cast to `type_`."""
+    return select(cast(GameInfoDB.value, type_)).where(GameInfoDB.key == key).scalar_subquery()
+
+def current_date_value():
+    """SQL expression for the current absolute week (year * 52 + week)."""
+    return game_info_value('year') * 52 + game_info_value('week')
+
 class ShootingBlocDB(Base, DataclassMapper):
     __tablename__ = 'shooting_blocs'
     id = Column(Integer, primary_key=True)
@@ -98,6 +105,60 @@ class TalentChemistryDB(Base):
     talent_a = relationship("TalentDB", foreign_keys=[talent_a_id], back_populates="chemistry_a")
     talent_b = relationship("TalentDB", foreign_keys=[talent_b_id], back_populates="chemistry_b")
 
+# --- Talent preferences, limits and affinities ---
+# One row per entry of the Talent dataclass's dictionaries and lists, so casting
+# can filter on them in SQL. TalentDB exposes them under the dataclass names.
+
+class TalentTagPreferenceDB(Base):
+    """How much a talent likes a role in a tag. Roles without a row score 1.0."""
+    __tablename__ = 'talent_tag_preferences'
+    talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
+    tag = Column(String, primary_key=True)
+    role = Column(String, primary_key=True)
+    score = Column(Float, nullable=False)
+
+class TalentHardLimitDB(Base):
+    __tablename__ = 'talent_hard_limits'
+    talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
+    tag = Column(String, primary_key=True)
+
+class TalentTagAffinityDB(Base):
+    __tablename__ = 'talent_tag_affinities'
+    talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
+    tag = Column(String, primary_key=True)
+    score = Column(Integer, nullable=False)
+
+class TalentConcurrencyLimitDB(Base):
+    """The most givers a talent accepts at once for a tag concept."""
+    __tablename__ = 'talent_concurrency_limits'
+    talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
+    concept = Column(String, primary_key=True)
+    max_givers = Column(Integer, nullable=False)
+
+class TalentPolicyRequirementDB(Base):
+    """An on-set policy a talent 'requires' or 'refuses'."""
+    __tablename__ = 'talent_policy_requirements'
+    talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
+    policy_id = Column(String, primary_key=True)
+    requirement = Column(String, nullable=False)
+
+def _sync_child_rows(rows: list, model_cls, key_columns: tuple, values_by_key: Dict[tuple, dict]):
+    """
+    Makes a child collection hold exactly `values_by_key`. Rows whose key is
+    kept are updated in place, since deleting and re-adding the same primary
+    key in one flush would collide.
+    """
+    existing = {tuple(getattr(row, c) for c in key_columns): row for row in rows}
+    for key, row in existing.items():
+        if key not in values_by_key:
+            rows.remove(row)
+    for key, values in values_by_key.items():
+        if (row := existing.get(key)) is not None:
+            for name, value in values.items():
+                setattr(row, name, value)
+        else:
+            rows.append(model_cls(**dict(zip(key_columns, key)), **values))
+
 class TalentDB(Base, DataclassMapper):
     __tablename__ = 'talents'
     id = Column(Integer, primary_key=True)
@@ -117,21 +178,84 @@ class TalentDB(Base, DataclassMapper):
     disposition_score = Column(Integer, default=0, nullable=False)
     boob_cup = Column(String, nullable=True)
     dick_size = Column(Integer, nullable=True)
-    tag_affinities = Column(JSON, default=dict)
     popularity_scores = relationship("TalentPopularityDB", back_populates="talent", cascade="all, delete-orphan")
     fatigue = Column(Integer, default=0)
     fatigue_end_week = Column(Integer, default=0)
     fatigue_end_year = Column(Integer, default=0)
+    # Absolute date (year * 52 + week) the fatigue wears off, 0 when rested.
+    # Indexed so weekly expiry and the fatigue filters are range scans.
+    fatigue_end_date = Column(Integer, nullable=False, default=0, index=True)
     chemistry_a = relationship("TalentChemistryDB", foreign_keys=[TalentChemistryDB.talent_a_id], back_populates="talent_a", cascade="all, delete-orphan")
     chemistry_b = relationship("TalentChemistryDB", foreign_keys=[TalentChemistryDB.talent_b_id], back_populates="talent_b", cascade="all, delete-orphan")
-    tag_preferences = Column(JSON, default=dict)
-    hard_limits = Column(JSON, default=list)
     max_scene_partners = Column(Integer, default=10, nullable=False)
-    concurrency_limits = Column(JSON, default=dict)
-    policy_requirements = Column(JSON, default=dict)
+    # Always needed with the talent, so loaded alongside it in one query per table.
+    tag_preference_rows = relationship("TalentTagPreferenceDB", cascade="all, delete-orphan", lazy="selectin")
+    hard_limit_rows = relationship("TalentHardLimitDB", cascade="all, delete-orphan", lazy="selectin",
+                                   order_by=TalentHardLimitDB.tag)
+    tag_affinity_rows = relationship("TalentTagAffinityDB", cascade="all, delete-orphan", lazy="selectin")
+    concurrency_limit_rows = relationship("TalentConcurrencyLimitDB", cascade="all, delete-orphan", lazy="selectin")
+    policy_requirement_rows = relationship("TalentPolicyRequirementDB", cascade="all, delete-orphan", lazy="selectin",
+                                           order_by=TalentPolicyRequirementDB.policy_id)
     # New relationship to assignments
     go_to_list_assignments = relationship("GoToListAssignmentDB", back_populates="talent", cascade="all, delete-orphan")
 
+    __table_args__ = (Index('ix_talents_gender_ethnicity', 'gender', 'ethnicity'),)
+
+    @property
+    def tag_preferences(self) -> Dict[str, Dict[str, float]]:
+        preferences: Dict[str, Dict[str, float]] = {}
+        for row in self.tag_preference_rows:
+            preferences.setdefault(row.tag, {})[row.role] = row.score
+        return preferences
+
+    @tag_preferences.setter
+    def tag_preferences(self, value: Dict[str, Dict[str, float]]):
+        _sync_child_rows(self.tag_preference_rows, TalentTagPreferenceDB, ('tag', 'role'), {
+            (tag, role): {'score': score} for tag, roles in (value or {}).items() for role, score in roles.items()
+        })
+
+    @property
+    def hard_limits(self) -> List[str]:
+        return [row.tag for row in self.hard_limit_rows]
+
+    @hard_limits.setter
+    def hard_limits(self, value: List[str]):
+        _sync_child_rows(self.hard_limit_rows, TalentHardLimitDB, ('tag',), {(tag,): {} for tag in value or []})
+
+    @property
+    def tag_affinities(self) -> Dict[str, int]:
+        return {row.tag: row.score for row in self.tag_affinity_rows}
+
+    @tag_affinities.setter
+    def tag_affinities(self, value: Dict[str, int]):
+        _sync_child_rows(self.tag_affinity_rows, TalentTagAffinityDB, ('tag',), {
+            (tag,): {'score': score} for tag, score in (value or {}).items()
+        })
+
+    @property
+    def concurrency_limits(self) -> Dict[str, int]:
+        return {row.concept: row.max_givers for row in self.concurrency_limit_rows}
+
+    @concurrency_limits.setter
+    def concurrency_limits(self, value: Dict[str, int]):
+        _sync_child_rows(self.concurrency_limit_rows, TalentConcurrencyLimitDB, ('concept',), {
+            (concept,): {'max_givers': limit} for concept, limit in (value or {}).items()
+        })
+
+    @property
+    def policy_requirements(self) -> Dict[str, List[str]]:
+        requirements: Dict[str, List[str]] = {}
+        for row in self.policy_requirement_rows:
+            requirements.setdefault(row.requirement, []).append(row.policy_id)
+        return requirements
+
+    @policy_requirements.setter
+    def policy_requirements(self, value: Dict[str, List[str]]):
+        _sync_child_rows(self.policy_requirement_rows, TalentPolicyRequirementDB, ('policy_id',), {
+            (policy_id,): {'requirement': requirement}
+            for requirement, policy_ids in (value or {}).items() for policy_id in policy_ids
+        })
+
 class SceneCastDB(Base, DataclassMapper):
     __tablename__ = 'scene_cast'
     id = Column(Integer, primary_key=True)
@@ -143,6 +267,11 @@ class SceneCastDB(Base, DataclassMapper):
     virtual_performer = relationship("VirtualPerformerDB")
     talent = relationship("TalentDB")
 
+    __table_args__ = (
+        Index('ix_scene_cast_scene_id', 'scene_id'),
+        Index('ix_scene_cast_talent_scene', 'talent_id', 'scene_id'),
+    )
+
 class ScenePerformerContributionDB(Base, DataclassMapper):
     __tablename__ = 'scene_performer_contributions'
     id = Column(Integer, primary_key=True)
@@ -153,6 +282,8 @@ class ScenePerformerContributionDB(Base, DataclassMapper):
     scene = relationship("SceneDB", back_populates="performer_contributions_rel")
     talent = relationship("TalentDB")
 
+    __table_args__ = (Index('ix_scene_performer_contributions_scene_id', 'scene_id'),)
+
 class SceneDB(Base, DataclassMapper):
     __tablename__ = 'scenes'
     id = Column(Integer, primary_key=True)
@@ -184,6 +315,8 @@ class SceneDB(Base, DataclassMapper):
     action_segments = relationship("ActionSegmentDB", back_populates="scene", cascade="all, delete-orphan")
     performer_contributions_rel = relationship("ScenePerformerContributionDB", back_populates="scene", cascade="all, delete-orphan")
 
+    __table_args__ = (Index('ix_scenes_status_schedule', 'status', 'scheduled_year', 'scheduled_week'),)
+
 class VirtualPerformerDB(Base, DataclassMapper):
     __tablename__ = 'virtual_performers'
     id = Column(Integer, primary_key=True)
@@ -194,6 +327,8 @@ class VirtualPerformerDB(Base, DataclassMapper):
     disposition = Column(String, default="Switch")
     scene = relationship("SceneDB", back_populates="virtual_performers")
 
+    __table_args__ = (Index('ix_virtual_performers_scene_id', 'scene_id'),)
+
 class ActionSegmentDB(Base, DataclassMapper):
     __tablename__ = 'action_segments'
     id = Column(Integer, primary_key=True)
@@ -204,6 +339,8 @@ class ActionSegmentDB(Base, DataclassMapper):
     scene = relationship("SceneDB", back_populates="action_segments")
     slot_assignments = relationship("SlotAssignmentDB", back_populates="segment", cascade="all, delete-orphan")
 
+    __table_args__ = (Index('ix_action_segments_scene_id', 'scene_id'),)
+
 class SlotAssignmentDB(Base, DataclassMapper):
     __tablename__ = 'slot_assignments'
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -212,6 +349,8 @@ class SlotAssignmentDB(Base, DataclassMapper):
     virtual_performer_id = Column(Integer)
     segment = relationship("ActionSegmentDB", back_populates="slot_assignments")
 
+    __table_args__ = (Index('ix_slot_assignments_segment_id', 'segment_id'),)
+
 class EmailMessageDB(Base, DataclassMapper):
     __tablename__ = 'emails'
     id = Column(Integer, primary_key=True)
@@ -219,7 +358,7 @@ class EmailMessageDB(Base, DataclassMapper):
     body = Column(String)
     week = Column(Integer)
     year = Column(Integer)
-    is_read = Column(Boolean, default=False)
+    is_read = Column(Boolean, default=False, index=True)
 
 class MarketGroupStateDB(Base, DataclassMapper):
     __tablename__ = 'market_state'
@@ -232,10 +371,24 @@ class TalentPopularityDB(Base, DataclassMapper):
     id = Column(Integer, primary_key=True)
     talent_id = Column(Integer, ForeignKey('talents.id'), nullable=False)
     market_group_name = Column(String, ForeignKey('market_state.name'), nullable=False)
-    score = Column(Float, default=0.0)
+    # The score as of `last_updated_week` (absolute week, year * 52 + week). Popularity
+    # decays every week, but rows are only written when a release changes them.
+    base_score = Column('score', Float, default=0.0)
+    last_updated_week = Column(Integer, nullable=False, default=0)
+    # The current, decayed score: base_score * rate ^ (weeks since last update), computed
+    # by SQLite on load from the clock and decay rate in game_info. Read-only.
+    score = column_property(
+        base_score * func.power(
+            func.coalesce(game_info_value(POPULARITY_DECAY_RATE_KEY, Float), DEFAULT_POPULARITY_DECAY_RATE),
+            current_date_value() - last_updated_week,
+            type_=Float
+        )
+    )
     talent = relationship("TalentDB", back_populates="popularity_scores")
     market_group = relationship("MarketGroupStateDB")
 
+    __table_args__ = (Index('ix_talent_popularity_talent_group', 'talent_id', 'market_group_name'),)
+
 class GoToListCategoryDB(Base):
     __tablename__ = 'go_to_list_categories'
     id = Column(Integer, primary_key=True)
@@ -248,4 +401,45 @@ class GoToListAssignmentDB(Base):
     category_id = Column(Integer, ForeignKey('go_to_list_categories.id'), primary_key=True)
     talent_id = Column(Integer, ForeignKey('talents.id'), primary_key=True)
     category = relationship("GoToListCategoryDB", back_populates="assignments")
-    talent = relationship("TalentDB", back_populates="go_to_list_assignments")
\ No newline at end of file
+    talent = relationship("TalentDB", back_populates="go_to_list_assignments")
+
+# --- Row -> dataclass conversion ---
+
+def _nested(dataclass_type, relationship_name: str):
+    return lambda row: [item.to_dataclass(dataclass_type) for item in getattr(row, relationship_name)]
+
+def _talent_chemistry(row) -> Dict[int, int]:
+    # Combine the two-way chemistry relationships into one dictionary
+    chem_dict = {chem.talent_b_id: chem.chemistry_score for chem in row.chemistry_a}
+    chem_dict.update({chem.talent_a_id: chem.chemistry_score for chem in row.chemistry_b})
+    return chem_dict
+
+# Dataclass fields built from relationships rather than same-named columns.
+_DERIVED_FIELDS = {
+    Scene: {
+        'virtual_performers': _nested(VirtualPerformer, 'virtual_performers'),
+        'action_segments': _nested(ActionSegment, 'action_segments'),
+        'performer_contributions': _nested(ScenePerformerContribution, 'performer_contributions_rel'),
+        # Re-create the dictionaries from the SceneCastDB relationship
+        'final_cast': lambda row: {str(c.virtual_performer_id): c.talent_id for c in row.cast},
+        'pps_salaries': lambda row: {str(c.talent_id): c.salary for c in row.cast},
+    },
+    Talent: {
+        'popularity': lambda row: {p.market_group_name: p.score for p in row.popularity_scores},
+        'chemistry': _talent_chemistry,
+    },
+    ActionSegment: {'slot_assignments': _nested(SlotAssignment, 'slot_assignments')},
+    ShootingBloc: {'scenes': _nested(Scene, 'scenes')},
+}
+
+# Converters for every pair the game uses are generated once at import;
+# any other pair is generated on first use.
+_ROW_CONVERTERS = {
+    (model_cls, dataclass_type): compile_row_converter(model_cls, dataclass_type, _DERIVED_FIELDS.get(dataclass_type))
+    for model_cls, dataclass_type in (
+        (TalentDB, Talent), (SceneDB, Scene), (VirtualPerformerDB, VirtualPerformer),
+        (ActionSegmentDB, ActionSegment), (SlotAssignmentDB, SlotAssignment),
+        (ScenePerformerContributionDB, ScenePerformerContribution), (ShootingBlocDB, ShootingBloc),
+        (EmailMessageDB, EmailMessage), (MarketGroupStateDB, MarketGroupState),
+    )
+}
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PAGES_PER_STEP = 256
+# The memdb VFS lets several connections share one named in-memory database
+# with normal file-style locking. It was added in SQLite 3.36.
+MEMDB_MIN_SQLITE_VERSION = (3, 36, 0)
+
+def memory_db_supported() -> bool:
+    return sqlite3.sqlite_version_info >= MEMDB_MIN_SQLITE_VERSION
+
+def new_memory_db_uri() -> str:
+    """A URI for a fresh, uniquely named in-memory database."""
+    return f"file:/psm_live_{uuid.uuid4().hex}?vfs=memdb"
+
+def without_wal_header(image: bytes) -> bytes:
+    """
+    A serialized database with its header switched from WAL to rollback
+    journal mode (file format versions 2 to 1, what PRAGMA journal_mode=DELETE
+    writes). Copies of a WAL-mode live session carry its header, and SQLite
+    refuses to open such an image in memory, where there is no WAL.
+    """
+    if image[18:20] != b"\x02\x02":
+        return image
+    return image[:18] + b"\x01\x01" + image[20:]
+
+def copy_database(source: str, dest_path: Path, pages: int = BACKUP_PAGES_PER_STEP):
+    """
+    Copies the committed state of `source`, a database file or SQLite URI,
+    to `dest_path` with the backup API. Unlike a file copy this includes
+    commits still in the source's WAL; the copy is in rollback journal mode.
+    """
+    source_uri = source if source.startswith("file:") else f"{Path(source).resolve().as_uri()}?mode=ro"
+    src = sqlite3.connect(source_uri, uri=True)
+    try:
+        dest = sqlite3.connect(dest_path)
+        try:
+            src.backup(dest, pages=pages)
+            dest.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            dest.close()
+    finally:
+        src.close()
+
+def journal_path(checkpoint_path: Path) -> Path:
+    return Path(checkpoint_path).with_suffix(".journal.json")
+
+class LiveSessionCheckpointer:
+    """
+    Keeps an on-disk copy of an in-memory live session database up to date.
+
+    Checkpoints run on a background thread over the SQLite backup API, either
+    on request (autosave, quicksave, exit save) or every `interval` seconds.
+    A checkpoint is skipped when nothing was committed since the last one
+    (PRAGMA data_version). Like the autosaves, each copy goes to a temporary
+    file that is moved into place, so the checkpoint is always complete.
+
+    After every checkpoint a small journal next to it records when it was
+    taken and the game date it holds. The journal is removed on a clean
+    shutdown, so finding one at startup means the previous session crashed
+    and its checkpoint, at most one interval old, can be recovered.
+    """
+    def __init__(self, source_uri: str, checkpoint_path: Path, interval: Optional[float] = None,
+                 pages_per_step: int = BACKUP_PAGES_PER_STEP):
+        self.source_uri = source_uri
+        self.checkpoint_path = Path(checkpoint_path)
+        self.journal_path = journal_path(self.checkpoint_path)
+        self.interval = interval if interval and interval > 0 else None
+        self.pages_per_step = pages_per_step
+
+        self._condition = threading.Condition()
+        self._requested = False
+        self._busy = False
+        self._stopped = False
+        self._last_version: Optional[int] = None
+        self._thread = threading.Thread(target=self._run, name="LiveSessionCheckpointer", daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Queues a checkpoint. Returns immediately."""
+        with self._condition:
+            if self._stopped: return
+            self._requested = True
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until no checkpoint is queued or running. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._requested and not self._busy, timeout)
+
+    def stop(self):
+        """Lets a running checkpoint finish, drops any queued one and ends the thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        source = sqlite3.connect(self.source_uri, uri=True, check_same_thread=False)
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._requested or self._stopped, self.interval)
+                    if self._stopped:
+                        return
+                    self._requested = False
+                    self._busy = True
+                try:
+                    self._checkpoint(source)
+                except Exception as e:
+                    logger.error(f"Checkpoint of the live session failed: {e}", exc_info=True)
+                finally:
+                    with self._condition:
+                        self._busy = False
+                        self._condition.notify_all()
+        finally:
+            source.close()
+            with self._condition:
+                self._requested = False
+                self._condition.notify_all()
+
+    def _checkpoint(self, source: sqlite3.Connection):
+        version = source.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._last_version and self.checkpoint_path.exists():
+            return
+
+        temp_path = self.checkpoint_path.with_suffix(".sqlite.tmp")
+        dest = sqlite3.connect(temp_path)
+        try:
+            source.backup(dest, pages=self.pages_per_step)
+        finally:
+            dest.close()
+        os.replace(temp_path, self.checkpoint_path)
+        self._last_version = version
+        self._write_journal(source)
+        logger.debug(f"Checkpointed live session to {self.checkpoint_path}")
+
+    def _write_journal(self, source: sqlite3.Connection):
+        try:
+            game_info = dict(source.execute("SELECT key, value FROM game_info WHERE key IN ('week', 'year')"))
+        except sqlite3.Error:
+            game_info = {}
+        temp_path = self.journal_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'checkpointed': datetime.now().isoformat(), 'week': game_info.get('week'),
+                       'year': game_info.get('year')}, f, indent=2)
+        os.replace(temp_path, self.journal_path)
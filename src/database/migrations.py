@@ -0,0 +1,192 @@
+import logging
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Tuple
+from sqlalchemy.engine import Connection, Engine
+
+from database.talent_search import ALIAS_INDEX_TABLE, trigram_search_supported
+
+logger = logging.getLogger(__name__)
+
+# game_info key holding the version of the last migration applied to a database.
+SCHEMA_VERSION_KEY = 'schema_version'
+
+@dataclass(frozen=True)
+class Migration:
+    """One ordered schema change. `apply` runs inside the migration transaction."""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+def _columns(conn, table: str) -> set:
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+def _create_indexes(conn, *statements: str):
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+
+# Migrations may also run on a database that create_all has just built from the
+# current models, so every step must tolerate its change already being there.
+
+def _add_popularity_last_updated_week(conn):
+    """Popularity is decayed on read; existing scores are current as of the save's date."""
+    if 'last_updated_week' in _columns(conn, 'talent_popularity'):
+        return
+    conn.exec_driver_sql("ALTER TABLE talent_popularity ADD COLUMN last_updated_week INTEGER NOT NULL DEFAULT 0")
+    conn.exec_driver_sql(
+        "UPDATE talent_popularity SET last_updated_week = "
+        "(SELECT CAST(value AS INTEGER) FROM game_info WHERE key = 'year') * 52 + "
+        "(SELECT CAST(value AS INTEGER) FROM game_info WHERE key = 'week')"
+    )
+
+def _add_talent_fatigue_end_date(conn):
+    """Fatigue expiry is looked up through an indexed absolute date."""
+    if 'fatigue_end_date' not in _columns(conn, 'talents'):
+        conn.exec_driver_sql("ALTER TABLE talents ADD COLUMN fatigue_end_date INTEGER NOT NULL DEFAULT 0")
+        conn.exec_driver_sql(
+            "UPDATE talents SET fatigue_end_date = fatigue_end_year * 52 + fatigue_end_week WHERE fatigue > 0"
+        )
+    _create_indexes(conn, "CREATE INDEX IF NOT EXISTS ix_talents_fatigue_end_date ON talents (fatigue_end_date)")
+
+def _add_hot_path_indexes(conn):
+    """Indexes for the weekly shoot, casting, popularity, talent filter and inbox queries."""
+    _create_indexes(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_scenes_status_schedule ON scenes (status, scheduled_year, scheduled_week)",
+        "CREATE INDEX IF NOT EXISTS ix_scene_cast_scene_id ON scene_cast (scene_id)",
+        "CREATE INDEX IF NOT EXISTS ix_scene_cast_talent_scene ON scene_cast (talent_id, scene_id)",
+        "CREATE INDEX IF NOT EXISTS ix_talent_popularity_talent_group ON talent_popularity (talent_id, market_group_name)",
+        "CREATE INDEX IF NOT EXISTS ix_talents_gender_ethnicity ON talents (gender, ethnicity)",
+        "CREATE INDEX IF NOT EXISTS ix_emails_is_read ON emails (is_read)",
+    )
+
+def _add_scene_child_indexes(conn):
+    """Indexes for loading a scene's performers, segments, assignments and contributions."""
+    _create_indexes(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_virtual_performers_scene_id ON virtual_performers (scene_id)",
+        "CREATE INDEX IF NOT EXISTS ix_action_segments_scene_id ON action_segments (scene_id)",
+        "CREATE INDEX IF NOT EXISTS ix_slot_assignments_segment_id ON slot_assignments (segment_id)",
+        "CREATE INDEX IF NOT EXISTS ix_scene_performer_contributions_scene_id ON scene_performer_contributions (scene_id)",
+    )
+
+_TALENT_JSON_COLUMNS = ('tag_preferences', 'hard_limits', 'tag_affinities', 'concurrency_limits', 'policy_requirements')
+
+def _normalize_talent_preferences(conn):
+    """Moves the talent JSON columns into child tables that casting can filter on."""
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS talent_tag_preferences (talent_id INTEGER NOT NULL, tag VARCHAR NOT NULL, "
+        "role VARCHAR NOT NULL, score FLOAT NOT NULL, PRIMARY KEY (talent_id, tag, role), "
+        "FOREIGN KEY(talent_id) REFERENCES talents (id))"
+    )
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS talent_hard_limits (talent_id INTEGER NOT NULL, tag VARCHAR NOT NULL, "
+        "PRIMARY KEY (talent_id, tag), FOREIGN KEY(talent_id) REFERENCES talents (id))"
+    )
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS talent_tag_affinities (talent_id INTEGER NOT NULL, tag VARCHAR NOT NULL, "
+        "score INTEGER NOT NULL, PRIMARY KEY (talent_id, tag), FOREIGN KEY(talent_id) REFERENCES talents (id))"
+    )
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS talent_concurrency_limits (talent_id INTEGER NOT NULL, concept VARCHAR NOT NULL, "
+        "max_givers INTEGER NOT NULL, PRIMARY KEY (talent_id, concept), FOREIGN KEY(talent_id) REFERENCES talents (id))"
+    )
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS talent_policy_requirements (talent_id INTEGER NOT NULL, policy_id VARCHAR NOT NULL, "
+        "requirement VARCHAR NOT NULL, PRIMARY KEY (talent_id, policy_id), FOREIGN KEY(talent_id) REFERENCES talents (id))"
+    )
+
+    if 'tag_preferences' not in _columns(conn, 'talents'):
+        return
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO talent_tag_preferences (talent_id, tag, role, score) "
+        "SELECT t.id, tag.key, role.key, role.value FROM talents t, json_each(t.tag_preferences) tag, json_each(tag.value) role "
+        "WHERE json_type(t.tag_preferences) = 'object' AND json_type(tag.value) = 'object'"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO talent_hard_limits (talent_id, tag) "
+        "SELECT t.id, lim.value FROM talents t, json_each(t.hard_limits) lim WHERE json_type(t.hard_limits) = 'array'"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO talent_tag_affinities (talent_id, tag, score) "
+        "SELECT t.id, aff.key, aff.value FROM talents t, json_each(t.tag_affinities) aff "
+        "WHERE json_type(t.tag_affinities) = 'object'"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO talent_concurrency_limits (talent_id, concept, max_givers) "
+        "SELECT t.id, lim.key, lim.value FROM talents t, json_each(t.concurrency_limits) lim "
+        "WHERE json_type(t.concurrency_limits) = 'object'"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO talent_policy_requirements (talent_id, policy_id, requirement) "
+        "SELECT t.id, policy.value, req.key FROM talents t, json_each(t.policy_requirements) req, json_each(req.value) policy "
+        "WHERE json_type(t.policy_requirements) = 'object' AND req.key IN ('requires', 'refuses') "
+        "AND json_type(req.value) = 'array'"
+    )
+    # DROP COLUMN needs SQLite 3.35; older builds keep the columns, which nothing reads any more.
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        for column in _TALENT_JSON_COLUMNS:
+            conn.exec_driver_sql(f"ALTER TABLE talents DROP COLUMN {column}")
+
+def _add_talent_alias_index(conn):
+    """A trigram FTS5 index over talent aliases for name search, kept current by triggers."""
+    if not trigram_search_supported():
+        # Name search falls back to LIKE; this SQLite build has no FTS5 trigram tokenizer.
+        logger.warning("SQLite lacks FTS5 trigram support; talent name search will not be indexed.")
+        return
+    conn.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {ALIAS_INDEX_TABLE} USING fts5("
+        "alias, content='talents', content_rowid='id', tokenize='trigram')"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS talents_alias_index_insert AFTER INSERT ON talents BEGIN "
+        f"INSERT INTO {ALIAS_INDEX_TABLE} (rowid, alias) VALUES (new.id, new.alias); END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS talents_alias_index_delete AFTER DELETE ON talents BEGIN "
+        f"INSERT INTO {ALIAS_INDEX_TABLE} ({ALIAS_INDEX_TABLE}, rowid, alias) VALUES ('delete', old.id, old.alias); END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS talents_alias_index_update AFTER UPDATE OF id, alias ON talents BEGIN "
+        f"INSERT INTO {ALIAS_INDEX_TABLE} ({ALIAS_INDEX_TABLE}, rowid, alias) VALUES ('delete', old.id, old.alias); "
+        f"INSERT INTO {ALIAS_INDEX_TABLE} (rowid, alias) VALUES (new.id, new.alias); END"
+    )
+    conn.exec_driver_sql(f"INSERT INTO {ALIAS_INDEX_TABLE} ({ALIAS_INDEX_TABLE}) VALUES ('rebuild')")
+
+# Append only: a released version number must never be reused or reordered.
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "talent_popularity.last_updated_week for lazy popularity decay", _add_popularity_last_updated_week),
+    Migration(2, "talents.fatigue_end_date for indexed fatigue expiry", _add_talent_fatigue_end_date),
+    Migration(3, "hot-path indexes", _add_hot_path_indexes),
+    Migration(4, "scene child table indexes", _add_scene_child_indexes),
+    Migration(5, "talent preferences, limits and affinities in child tables", _normalize_talent_preferences),
+    Migration(6, "FTS5 trigram index over talent aliases", _add_talent_alias_index),
+)
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(conn: Connection) -> int:
+    """The stored schema version; 0 for databases from before versioning."""
+    value = conn.exec_driver_sql(
+        "SELECT value FROM game_info WHERE key = ?", (SCHEMA_VERSION_KEY,)
+    ).scalar()
+    return int(value) if value is not None else 0
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Brings a database up to LATEST_SCHEMA_VERSION by applying, in order, every
+    migration newer than its stored version, then records the new version.
+    All pending migrations share one transaction, so a failure leaves the
+    database at its old version. Returns the number of migrations applied.
+    """
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        pending = [m for m in MIGRATIONS if m.version > version]
+        for migration in pending:
+            logger.info(f"Migrating database to schema version {migration.version}: {migration.description}")
+            migration.apply(conn)
+        if pending:
+            conn.exec_driver_sql(
+                "INSERT OR REPLACE INTO game_info (key, value) VALUES (?, ?)",
+                (SCHEMA_VERSION_KEY, str(pending[-1].version))
+            )
+        return len(pending)
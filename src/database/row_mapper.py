@@ -0,0 +1,98 @@
+"""
+Generated converters from ORM rows to the game_state dataclasses.
+
+compile_row_converter() writes the source of one specialized function per
+(model, dataclass) pair from the dataclass's type hints and compiles it once.
+The function reads each column straight off the row and builds the dataclass
+with a single constructor call, applying the same conversions
+dataclasses_json's from_dict would: scalars are coerced to their annotated
+type, and JSON dicts and lists are copied with their keys and items coerced.
+Fields that come from relationships instead of same-named columns are
+supplied as `derived` callables taking the row.
+"""
+import typing
+from dataclasses import fields, is_dataclass, MISSING
+from typing import Any, Callable, Dict, Type, TypeVar
+
+T = TypeVar('T')
+
+_SCALARS = (int, float, str, bool)
+
+def _coerce(type_, value):
+    """Slow path for scalar values whose class is not exactly `type_`."""
+    if value is None or isinstance(value, type_):
+        return value
+    return type_(value)
+
+def _decode_dataclass(type_, value):
+    if value is None or isinstance(value, type_):
+        return value
+    return type_.from_dict(value)
+
+class _SourceWriter:
+    """Builds value expressions for one converter, collecting the names they reference."""
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {'_coerce': _coerce, '_decode_dataclass': _decode_dataclass}
+        self._loop_vars = 0
+
+    def ref(self, obj, hint: str) -> str:
+        name = f"_{hint}_{len(self.namespace)}"
+        self.namespace[name] = obj
+        return name
+
+    def _loop_var(self) -> str:
+        self._loop_vars += 1
+        return f"_x{self._loop_vars}"
+
+    def value(self, type_, var: str) -> str:
+        origin = typing.get_origin(type_)
+        args = typing.get_args(type_)
+        if origin is typing.Union:
+            # Optional[X]; None already passes through every expression below.
+            non_none = [a for a in args if a is not type(None)]
+            return self.value(non_none[0], var) if len(non_none) == 1 else var
+        if type_ in _SCALARS:
+            name = type_.__name__
+            return f"({var} if {var}.__class__ is {name} else _coerce({name}, {var}))"
+        if origin in (dict, typing.Dict):
+            key_type, value_type = args or (Any, Any)
+            k, v = self._loop_var(), self._loop_var()
+            return (f"(None if {var} is None else "
+                    f"{{{self.value(key_type, k)}: {self.value(value_type, v)} for {k}, {v} in {var}.items()}})")
+        if origin in (list, typing.List):
+            item_type = args[0] if args else Any
+            x = self._loop_var()
+            return f"(None if {var} is None else [{self.value(item_type, x)} for {x} in {var}])"
+        if is_dataclass(type_):
+            return f"_decode_dataclass({self.ref(type_, 'dc')}, {var})"
+        return var
+
+def compile_row_converter(model_cls: type, dataclass_type: Type[T],
+                          derived: Dict[str, Callable[[Any], Any]] = None) -> Callable[[Any], T]:
+    """
+    Returns a function building `dataclass_type` from an instance of
+    `model_cls`. Dataclass fields the model has no attribute for, and that
+    are not in `derived`, keep their defaults.
+    """
+    derived = derived or {}
+    hints = typing.get_type_hints(dataclass_type)
+    writer = _SourceWriter()
+    cls_name = writer.ref(dataclass_type, 'cls')
+
+    body, kwargs = [], []
+    for i, field in enumerate(f for f in fields(dataclass_type) if f.init):
+        if field.name in derived:
+            kwargs.append(f"{field.name}={writer.ref(derived[field.name], 'derived')}(row)")
+        elif hasattr(model_cls, field.name):
+            var = f"v{i}"
+            body.append(f"    {var} = row.{field.name}")
+            kwargs.append(f"{field.name}={writer.value(hints[field.name], var)}")
+        elif field.default is MISSING and field.default_factory is MISSING:
+            raise TypeError(f"{model_cls.__name__} has no value for required field {dataclass_type.__name__}.{field.name}")
+
+    func_name = f"{model_cls.__name__}_to_{dataclass_type.__name__}"
+    source = "\n".join([f"def {func_name}(row):", *body, f"    return {cls_name}({', '.join(kwargs)})"])
+    exec(compile(source, f"<row converter {func_name}>", "exec"), writer.namespace)
+    converter = writer.namespace[func_name]
+    converter.__source__ = source
+    return converter
@@ -0,0 +1,112 @@
+import re
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, sessionmaker
+
+_WRITTEN_TABLES = '_written_tables'
+_SESSION_INFOS = '_session_connection_infos'
+_SESSION_WRITES = '_session_written_tables'
+
+# The table a raw SQL statement writes to, for writes that bypass the ORM
+# (exec_driver_sql batches, migrations). Schema changes count as writes.
+_WRITE_STATEMENT = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM|ALTER\s+TABLE'
+    r'|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|CREATE\s+(?:VIRTUAL\s+)?TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+["`\[]?(\w+)',
+    re.IGNORECASE
+)
+
+def written_table(statement: str) -> Optional[str]:
+    """The table an SQL statement writes to, or None for reads and statements it cannot tell."""
+    match = _WRITE_STATEMENT.match(statement)
+    return match.group(1) if match else None
+
+class TableVersions:
+    """
+    A write counter per table of one database, for caches that need to know
+    whether what they read is still current.
+
+    track() hooks a sessionmaker so every session made from it records the
+    tables it writes, through the unit of work, bulk update/delete/insert
+    statements or raw SQL on its connection, and bumps their counters once
+    the transaction commits. A rolled-back transaction bumps nothing. Since
+    counters only move after the commit, a reader that takes stamp() before
+    querying can never store new data under an old stamp, only old data
+    under a stamp that is then stale.
+
+    Raw writes on the engine outside any session (migrations, when a
+    database is connected and nothing reads it yet) are bumped as their
+    transaction commits and dropped if it rolls back.
+    """
+    def __init__(self):
+        # Commits come from the week-advance thread while the UI reads.
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def track(self, session_factory: sessionmaker):
+        event.listen(session_factory, "after_flush", self._record_flush)
+        event.listen(session_factory, "do_orm_execute", self._record_statement)
+        event.listen(session_factory, "after_begin", self._watch_connection)
+        event.listen(session_factory, "after_commit", self._bump_written)
+        event.listen(session_factory, "after_transaction_end", self._discard_written)
+        if (engine := session_factory.kw.get('bind')) is not None:
+            event.listen(engine, "after_cursor_execute", self._record_cursor_write)
+            event.listen(engine, "commit", self._bump_connection_writes)
+            event.listen(engine, "rollback", self._discard_connection_writes)
+
+    def stamp(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """The current counters of `tables`, in order."""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    @staticmethod
+    def _written(session: Session) -> Set[str]:
+        return session.info.setdefault(_WRITTEN_TABLES, set())
+
+    def _record_flush(self, session: Session, flush_context):
+        written = self._written(session)
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            written.update(table.name for table in inspect(obj).mapper.tables)
+
+    def _record_statement(self, orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            self._written(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+    def _watch_connection(self, session: Session, transaction, connection):
+        # Raw writes on a session's connection are recorded into the session's set.
+        connection.info[_SESSION_WRITES] = self._written(session)
+        session.info.setdefault(_SESSION_INFOS, []).append(connection.info)
+
+    def _record_cursor_write(self, conn, cursor, statement, parameters, context, executemany):
+        if table := written_table(statement):
+            written = conn.info.get(_SESSION_WRITES)
+            if written is None:
+                written = conn.info.setdefault(_WRITTEN_TABLES, set())
+            written.add(table)
+
+    def _bump_connection_writes(self, conn):
+        # Writes on a connection lent to a session are bumped by the session, after its commit.
+        written = conn.info.pop(_WRITTEN_TABLES, None)
+        if written:
+            self.bump(written)
+
+    def _discard_connection_writes(self, conn):
+        conn.info.pop(_WRITTEN_TABLES, None)
+
+    def _bump_written(self, session: Session):
+        written = session.info.pop(_WRITTEN_TABLES, None)
+        if written:
+            self.bump(written)
+
+    def _discard_written(self, session: Session, transaction):
+        # Runs after after_commit; only a rollback of the outermost transaction leaves anything to drop.
+        if transaction.parent is None:
+            session.info.pop(_WRITTEN_TABLES, None)
+            for info in session.info.pop(_SESSION_INFOS, ()):
+                info.pop(_SESSION_WRITES, None)
@@ -0,0 +1,71 @@
+import sqlite3
+from contextlib import closing
+from typing import List, Optional
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.orm import Session
+
+from database.db_models import TalentDB
+
+# FTS5 index of talent aliases, kept in sync with the talents table by triggers (schema version 6).
+ALIAS_INDEX_TABLE = "talent_alias_fts"
+# The trigram tokenizer indexes every 3-character substring; it was added in SQLite 3.34.
+TRIGRAM_MIN_SQLITE_VERSION = (3, 34, 0)
+# Trigram queries need at least one trigram; shorter text is matched with LIKE.
+MIN_INDEXED_QUERY_LENGTH = 3
+
+_alias_index = table(ALIAS_INDEX_TABLE, column("rowid"))
+
+def trigram_search_supported() -> bool:
+    if sqlite3.sqlite_version_info < TRIGRAM_MIN_SQLITE_VERSION:
+        return False
+    try:
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        # Built without FTS5.
+        return False
+
+def alias_index_exists(session: Session) -> bool:
+    return session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': ALIAS_INDEX_TABLE}
+    ).first() is not None
+
+def _match_expression(query: str) -> str:
+    # One quoted phrase, so the text is matched as a substring and never parsed as FTS5 syntax.
+    return '"' + query.replace('"', '""') + '"'
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def alias_matches(query: str, indexed: bool = True):
+    """
+    A filter on TalentDB for aliases containing `query`, case-insensitively.
+    Uses the alias index when `indexed` and the query is long enough for it.
+    """
+    if indexed and len(query) >= MIN_INDEXED_QUERY_LENGTH:
+        matching_ids = select(_alias_index.c.rowid).where(
+            text(f"{ALIAS_INDEX_TABLE} MATCH :alias_match").bindparams(alias_match=_match_expression(query))
+        )
+        return TalentDB.id.in_(matching_ids)
+    return TalentDB.alias.ilike(_like_pattern(query), escape="\\")
+
+def search_alias_ids(session: Session, query: str, limit: Optional[int] = None, indexed: bool = True) -> List[int]:
+    """
+    Ids of the talents whose alias contains `query`, best match first. Indexed
+    matches are ranked by FTS5's bm25, which puts shorter aliases (where the
+    text is more of the name) first; short queries come back in alias order.
+    """
+    if indexed and len(query) >= MIN_INDEXED_QUERY_LENGTH:
+        sql = (f"SELECT rowid FROM {ALIAS_INDEX_TABLE} WHERE {ALIAS_INDEX_TABLE} MATCH :alias_match "
+               f"ORDER BY rank, rowid")
+        params = {'alias_match': _match_expression(query)}
+    else:
+        sql = "SELECT id FROM talents WHERE alias LIKE :pattern ESCAPE '\\' ORDER BY alias, id"
+        params = {'pattern': _like_pattern(query)}
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params['limit'] = limit
+    return list(session.execute(text(sql), params).scalars())
@@ -0,0 +1,305 @@
+"""
+Headless simulation runner.
+
+Drives TimeService.advance_week for N weeks without a QApplication, wiring the
+ServiceContainer against HeadlessSignals. Interactive shoot events are resolved
+automatically by a pluggable policy. Reports weeks/sec and per-phase timings.
+
+Usage (from src/):
+    python headless.py --weeks 520 --save-dir /tmp/psm-soak
+    python headless.py --weeks 52 --load autosave_0 --policy random --seed 7 --json
+    python headless.py --compact-saves --save-dir ~/.psm/saves
+
+A policy is either one of the built-in names (see EVENT_POLICIES) or an import
+path 'package.module:attribute' naming a callable (or class) that takes
+(event_data, scene_id, talent_id) and returns a choice id.
+"""
+import argparse
+import importlib
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.headless_signals import HeadlessSignals
+from core.service_container import ServiceContainer
+from core.talent_generator import TalentGenerator
+from data.data_manager import DataManager
+from data.save_manager import SaveManager
+from services.game_session_service import GameSessionService
+from services.models.results import EventAction, WeekAdvancementResult
+from services.time_service import WEEK_PHASES
+
+logger = logging.getLogger("headless")
+
+PHASE_EVENTS = "events"
+PHASE_SAVE = "save"
+
+EventPolicy = Callable[[Dict, int, int], str]
+
+def first_choice_policy(event_data: Dict, scene_id: int, talent_id: int) -> str:
+    """Always picks the first listed choice."""
+    return event_data['choices'][0]['id']
+
+def last_choice_policy(event_data: Dict, scene_id: int, talent_id: int) -> str:
+    """Always picks the last listed choice."""
+    return event_data['choices'][-1]['id']
+
+def random_choice_policy(event_data: Dict, scene_id: int, talent_id: int) -> str:
+    """Picks a choice uniformly at random (seeded through --seed)."""
+    return random.choice(event_data['choices'])['id']
+
+EVENT_POLICIES: Dict[str, EventPolicy] = {
+    'first': first_choice_policy,
+    'last': last_choice_policy,
+    'random': random_choice_policy,
+}
+
+def resolve_policy(spec: str) -> EventPolicy:
+    """Returns a built-in policy by name, or imports one from 'module:attribute'."""
+    if spec in EVENT_POLICIES:
+        return EVENT_POLICIES[spec]
+    module_name, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"Unknown policy '{spec}'. Use one of {sorted(EVENT_POLICIES)} or 'module:attribute'.")
+    policy = getattr(importlib.import_module(module_name), attr)
+    return policy() if isinstance(policy, type) else policy
+
+class HeadlessRunError(RuntimeError):
+    """Raised when the simulation cannot continue (e.g. a failed week)."""
+
+@dataclass
+class SimulationReport:
+    weeks: int = 0
+    elapsed: float = 0.0
+    events_resolved: int = 0
+    scenes_shot: int = 0
+    scenes_edited: int = 0
+    final_week: int = 0
+    final_year: int = 0
+    final_money: int = 0
+    stopped_reason: Optional[str] = None
+    phase_totals: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    @property
+    def weeks_per_second(self) -> float:
+        return self.weeks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'weeks': self.weeks, 'elapsed_seconds': self.elapsed,
+            'weeks_per_second': self.weeks_per_second,
+            'events_resolved': self.events_resolved,
+            'scenes_shot': self.scenes_shot, 'scenes_edited': self.scenes_edited,
+            'final_date': {'week': self.final_week, 'year': self.final_year},
+            'final_money': self.final_money, 'stopped_reason': self.stopped_reason,
+            'phase_seconds': dict(self.phase_totals),
+        }
+
+class PhaseTimer:
+    """Accumulates wall-clock time spent between successive phase marks."""
+    def __init__(self, totals: Dict[str, float]):
+        self.totals = totals
+        self._current: Optional[str] = None
+        self._started = 0.0
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        if self._current:
+            self.totals[self._current] += now - self._started
+        self._current, self._started = phase, now
+
+    def stop(self):
+        if self._current:
+            self.totals[self._current] += time.perf_counter() - self._started
+        self._current = None
+
+class HeadlessSimulation:
+    """Builds a game session without Qt and advances it week by week."""
+    def __init__(self, save_dir: Path, policy: EventPolicy, autosave: bool = False,
+                 in_memory: Optional[bool] = None):
+        self.signals = HeadlessSignals()
+        self.data_manager = DataManager()
+        game_config = self.data_manager.game_config
+        if in_memory is None:
+            in_memory = game_config.get("live_session_in_memory", False)
+        self.save_manager = SaveManager(
+            save_dir, in_memory=in_memory,
+            checkpoint_interval=game_config.get("live_session_checkpoint_seconds", 60),
+            delta_saves=game_config.get("delta_saves", False),
+            compress_saves=game_config.get("save_compression", False)
+        )
+        self.container = ServiceContainer(self.data_manager, self.save_manager, self.signals)
+        self.policy = policy
+        self.autosave = autosave
+        self.game_state = None
+
+        self.game_over_threshold = game_config.get('game_over_threshold', -5000)
+        talent_generator = TalentGenerator(
+            game_config, self.data_manager.generator_data, self.data_manager.affinity_data,
+            self.data_manager.tag_definitions, self.data_manager.talent_archetypes
+        )
+        self.session_service = GameSessionService(self.save_manager, self.data_manager, self.signals, talent_generator)
+
+        self._pending_events: List[Tuple[Dict, int, int]] = []
+        self.signals.interactive_event_triggered.connect(
+            lambda event_data, scene_id, talent_id: self._pending_events.append((event_data, scene_id, talent_id))
+        )
+
+    def start(self, load_name: Optional[str] = None):
+        result = self.session_service.load_game(load_name) if load_name else self.session_service.start_new_game()
+        if not result:
+            raise HeadlessRunError(f"Could not {'load ' + load_name if load_name else 'start a new game'}.")
+        self.game_state, _ = result
+        # The container only needs somewhere to inject services; no GameController is involved.
+        self.container.initialize_and_populate_services(SimpleNamespace(), self.game_state)
+
+    def run(self, weeks: int) -> SimulationReport:
+        report = SimulationReport()
+        timer = PhaseTimer(report.phase_totals)
+        started = time.perf_counter()
+        try:
+            for _ in range(weeks):
+                result = self._advance_one_week(timer, report)
+                if self.autosave:
+                    timer.mark(PHASE_SAVE)
+                    self.save_manager.auto_save()
+                timer.stop()
+                report.weeks += 1
+                if result.new_money <= self.game_over_threshold:
+                    report.stopped_reason = "bankruptcy"
+                    break
+        finally:
+            timer.stop()
+            report.elapsed = time.perf_counter() - started
+            if self.game_state:
+                report.final_week, report.final_year = self.game_state.week, self.game_state.year
+                report.final_money = self.game_state.money
+        return report
+
+    def _advance_one_week(self, timer: PhaseTimer, report: SimulationReport) -> WeekAdvancementResult:
+        """Mirrors GameController.advance_week, resolving any interactive events inline."""
+        result = self.container.time_service.advance_week(on_phase=timer.mark)
+        while result.was_paused:
+            if not self._pending_events:
+                raise HeadlessRunError(f"Week {result.new_week}/{result.new_year} failed to advance.")
+            timer.mark(PHASE_EVENTS)
+            self._resolve_event(*self._pending_events.pop(0))
+            report.events_resolved += 1
+            result = self.container.time_service.advance_week(on_phase=timer.mark)
+
+        report.scenes_shot += result.scenes_shot
+        report.scenes_edited += result.scenes_edited
+        self.game_state.week, self.game_state.year, self.game_state.money = result.new_week, result.new_year, result.new_money
+        return result
+
+    def _resolve_event(self, event_data: Dict, scene_id: int, talent_id: int):
+        """Mirrors GameController.resolve_interactive_event, following chained events."""
+        while True:
+            choice_id = self.policy(event_data, scene_id, talent_id)
+            result = self.container.scene_event_command_service.resolve_interactive_event(
+                event_data['id'], scene_id, talent_id, choice_id
+            )
+            if result.next_action == EventAction.CHAIN_EVENT:
+                payload = result.chained_event_payload
+                event_data, scene_id, talent_id = payload['event_data'], payload['scene_id'], payload['talent_id']
+                continue
+            if result.next_action == EventAction.CANCEL_SCENE:
+                self.container.scene_command_service.delete_scene(scene_id, result.cancellation_penalty)
+            elif result.next_action == EventAction.CONTINUE_SHOOT:
+                self.container.scene_command_service.continue_shoot_scene_after_event(scene_id, result.shoot_modifiers)
+            return
+
+    def shutdown(self):
+        self.save_manager.cleanup_session_file()
+        self.data_manager.close()
+
+def print_report(report: SimulationReport):
+    print(f"Simulated {report.weeks} week(s) in {report.elapsed:.2f}s ({report.weeks_per_second:.1f} weeks/sec)")
+    print(f"Final date: week {report.final_week}, {report.final_year}  money: ${report.final_money:,}")
+    print(f"Scenes shot: {report.scenes_shot}  edited: {report.scenes_edited}  events resolved: {report.events_resolved}")
+    if report.stopped_reason:
+        print(f"Stopped early: {report.stopped_reason}")
+    print("Per-phase timings:")
+    weeks = max(report.weeks, 1)
+    for phase in (*WEEK_PHASES, PHASE_EVENTS, PHASE_SAVE):
+        if phase in report.phase_totals:
+            total = report.phase_totals[phase]
+            print(f"  {phase:<16} total {total:9.3f}s   per week {total / weeks * 1000:9.3f} ms")
+
+def compact_saves(save_dir: Path) -> int:
+    data_manager = DataManager()
+    game_config = data_manager.game_config
+    data_manager.close()
+    if not game_config.get("delta_saves", False):
+        # The game only lists saves in the store while delta saves are on, so moving them there would hide them.
+        logger.error("--compact-saves needs delta_saves enabled in game_config.json.")
+        return 1
+    save_manager = SaveManager(save_dir, delta_saves=True, compress_saves=game_config.get("save_compression", False))
+    store_path = save_manager.store.path
+    size_before = sum(p.stat().st_size for p in (store_path, *save_dir.glob("*.sqlite")) if p.exists())
+    moved = save_manager.compact_saves()
+    size_after = sum(p.stat().st_size for p in (store_path, *save_dir.glob("*.sqlite")) if p.exists())
+    print(f"Moved {moved} save(s) into {store_path.name}; saves now take {size_after / 1024:,.0f} KB "
+          f"(was {size_before / 1024:,.0f} KB)")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=52, help="Number of weeks to advance.")
+    parser.add_argument("--load", metavar="SAVE_NAME", help="Load this save (from --save-dir) instead of starting a new game.")
+    parser.add_argument("--save-dir", type=Path, help="Save directory to use. Defaults to a temporary directory.")
+    parser.add_argument("--policy", default="first", help="Interactive event policy: a built-in name or 'module:attribute'.")
+    parser.add_argument("--seed", type=int, help="Seed Python's and NumPy's RNGs for a reproducible run.")
+    parser.add_argument("--autosave", action="store_true", help="Autosave after every week, as the game does.")
+    parser.add_argument("--live-session", choices=("config", "memory", "disk"), default="memory",
+                        help="Keep the live game in memory or in session.sqlite, or follow game_config.json. "
+                             "Defaults to memory.")
+    parser.add_argument("--compact-saves", action="store_true",
+                        help="Move the saves in --save-dir into the delta save store, drop unused pages and exit. "
+                             "Needs delta_saves in game_config.json. Run while the game is closed.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log INFO messages to stderr.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.seed is not None:
+        import numpy as np
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+
+    if args.compact_saves:
+        if not args.save_dir:
+            parser.error("--compact-saves needs --save-dir")
+        return compact_saves(args.save_dir)
+
+    with tempfile.TemporaryDirectory(prefix="psm-headless-") as tmp_dir:
+        save_dir = args.save_dir or Path(tmp_dir)
+        in_memory = None if args.live_session == "config" else args.live_session == "memory"
+        simulation = HeadlessSimulation(save_dir, resolve_policy(args.policy), autosave=args.autosave,
+                                        in_memory=in_memory)
+        try:
+            simulation.start(args.load)
+            report = simulation.run(args.weeks)
+        except HeadlessRunError as e:
+            logger.error(str(e))
+            return 1
+        finally:
+            simulation.shutdown()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import dataclasses
+import logging
+from typing import Dict, Iterable, List
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+from data.game_state import Talent
+from database.db_models import (MarketGroupStateDB, TalentDB, TalentPopularityDB, TalentTagPreferenceDB,
+                                TalentHardLimitDB, TalentTagAffinityDB, TalentConcurrencyLimitDB,
+                                TalentPolicyRequirementDB)
+
+logger = logging.getLogger(__name__)
+
+# Talents per round of INSERTs; each round also writes their child rows.
+WORLD_INSERT_BATCH = 2000
+
+_TALENT_FIELDS = {f.name for f in dataclasses.fields(Talent)}
+# Columns filled straight from the dataclass field of the same name.
+_TALENT_COLUMNS = [c.name for c in TalentDB.__table__.columns if c.name in _TALENT_FIELDS]
+
+def _insert_sql(table: Table, columns: List[str]) -> str:
+    return f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+# Rows are written as plain tuples straight to the driver's executemany, which
+# skips SQLAlchemy's per-row parameter processing; every column here is a
+# plain SQLite type. Parents come before children, for the foreign keys.
+_INSERTS: Dict[str, str] = {
+    'talents': _insert_sql(TalentDB.__table__, [*_TALENT_COLUMNS, 'fatigue_end_date']),
+    'popularity': _insert_sql(TalentPopularityDB.__table__, ['talent_id', 'market_group_name', 'score', 'last_updated_week']),
+    'preferences': _insert_sql(TalentTagPreferenceDB.__table__, ['talent_id', 'tag', 'role', 'score']),
+    'hard_limits': _insert_sql(TalentHardLimitDB.__table__, ['talent_id', 'tag']),
+    'affinities': _insert_sql(TalentTagAffinityDB.__table__, ['talent_id', 'tag', 'score']),
+    'concurrency_limits': _insert_sql(TalentConcurrencyLimitDB.__table__, ['talent_id', 'concept', 'max_givers']),
+    'policies': _insert_sql(TalentPolicyRequirementDB.__table__, ['talent_id', 'policy_id', 'requirement']),
+}
+
+class WorldBuilder:
+    """
+    Writes a new game's starting world with multi-row INSERTs instead of
+    building an ORM object per row.
+
+    Talents are taken from any iterable, so a generator can stream them:
+    every `batch_size` talents, their rows and the rows of their child tables
+    (popularity, preferences, limits, affinities, policies) are written with
+    one executemany per table, and only that batch is held in memory. Nothing
+    is committed; the caller owns the transaction.
+    """
+    def __init__(self, session: Session, batch_size: int = WORLD_INSERT_BATCH):
+        self.session = session
+        self.batch_size = batch_size
+        self._rows: Dict[str, List[tuple]] = {kind: [] for kind in _INSERTS}
+
+    def add_market_groups(self, names: Iterable[str]):
+        rows = [{'name': name, 'current_saturation': 1.0, 'discovered_sentiments': {}} for name in names]
+        if rows:
+            self.session.execute(MarketGroupStateDB.__table__.insert(), rows)
+
+    def add_talents(self, talents: Iterable[Talent], start_date: int = 0) -> int:
+        """
+        Writes every talent, with popularity as of `start_date` (year * 52 + week).
+        Returns the number written.
+        """
+        count = 0
+        for talent in talents:
+            self._queue_talent(talent, start_date)
+            count += 1
+            if count % self.batch_size == 0:
+                self._flush()
+        self._flush()
+        logger.debug(f"Wrote {count} talents to the new world.")
+        return count
+
+    def _queue_talent(self, talent: Talent, start_date: int):
+        rows = self._rows
+        talent_id = talent.id
+        fatigue_end_date = talent.fatigue_end_year * 52 + talent.fatigue_end_week if talent.fatigue else 0
+        rows['talents'].append((*(getattr(talent, column) for column in _TALENT_COLUMNS), fatigue_end_date))
+        rows['popularity'].extend((talent_id, group, score, start_date) for group, score in talent.popularity.items())
+        rows['preferences'].extend(
+            (talent_id, tag, role, score) for tag, roles in talent.tag_preferences.items() for role, score in roles.items()
+        )
+        rows['hard_limits'].extend((talent_id, tag) for tag in dict.fromkeys(talent.hard_limits))
+        rows['affinities'].extend((talent_id, tag, score) for tag, score in talent.tag_affinities.items())
+        rows['concurrency_limits'].extend((talent_id, concept, limit) for concept, limit in talent.concurrency_limits.items())
+        # A policy listed as both required and refused keeps the last, as TalentDB.policy_requirements does.
+        requirements = {policy_id: requirement for requirement, policy_ids in talent.policy_requirements.items()
+                        for policy_id in policy_ids}
+        rows['policies'].extend((talent_id, policy_id, requirement) for policy_id, requirement in requirements.items())
+
+    def _flush(self):
+        connection = self.session.connection()
+        for kind, rows in self._rows.items():
+            if rows:
+                connection.exec_driver_sql(_INSERTS[kind], rows)
+                rows.clear()
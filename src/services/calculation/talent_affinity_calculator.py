@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from data.game_state import Talent
 from services.models.configs import SceneCalculationConfig
@@ -8,17 +8,37 @@ class TalentAffinityCalculator:
 
     def __init__(self, config: SceneCalculationConfig):
         self.config = config
+        self.age_affinity_table = self.compile_age_rules(config.age_based_affinity_rules or [])
+
+    @staticmethod
+    def compile_age_rules(rules: List[Dict]) -> Dict[int, Dict[str, int]]:
+        """
+        Resolves the age-based affinity rules into a lookup of age -> {tag: score}.
+        Rules are applied in order, so a later rule overrides an earlier one for
+        the same tag and age. Ages no rule covers are absent from the table.
+        """
+        table: Dict[int, Dict[str, int]] = {}
+        for rule in rules:
+            for age in range(rule.get('min_age'), rule.get('max_age') + 1):
+                table.setdefault(age, {})[rule.get('tag')] = rule.get('affinity_score', 0)
+        return table
+
+    def age_affinity_ranges(self) -> List[Tuple[int, int, Dict[str, int]]]:
+        """
+        The compiled table as (min_age, max_age, affinities) runs of consecutive
+        ages that share the same affinities, in ascending age order.
+        """
+        ranges: List[Tuple[int, int, Dict[str, int]]] = []
+        for age in sorted(self.age_affinity_table):
+            affinities = self.age_affinity_table[age]
+            if ranges and ranges[-1][1] == age - 1 and ranges[-1][2] == affinities:
+                ranges[-1] = (ranges[-1][0], age, affinities)
+            else:
+                ranges.append((age, age, affinities))
+        return ranges
 
     def recalculate_talent_age_affinities(self, talent: Talent) -> Dict:
         """Recalculates affinities affected by age."""
         new_affinities = talent.tag_affinities.copy()
-        rules = self.config.age_based_affinity_rules
-        
-        if not rules:
-            return new_affinities
-            
-        for rule in rules:
-            tag_name = rule.get('tag')
-            if talent.age >= rule.get('min_age') and talent.age <= rule.get('max_age'):
-                new_affinities[tag_name] = rule.get('affinity_score', 0)
-        return new_affinities
\ No newline at end of file
+        new_affinities.update(self.age_affinity_table.get(talent.age, {}))
+        return new_affinities
@@ -1,18 +1,60 @@
 import random
 from dataclasses import dataclass
 from collections import defaultdict
-from typing import Set, Dict, Optional, Union
+from enum import Enum
+from typing import Set, Dict, FrozenSet, List, Optional, Tuple, Union
+from sqlalchemy import select, tuple_, or_, and_, case, func, literal
 
 from data.game_state import Talent, Scene
-from database.db_models import TalentDB, ShootingBlocDB
+from database.db_models import (
+    TalentDB, ShootingBlocDB, TalentHardLimitDB, TalentTagPreferenceDB, TalentPolicyRequirementDB,
+    TalentConcurrencyLimitDB
+)
 from data.data_manager import DataManager
 from services.models.configs import HiringConfig
 
+class RefusalCode(Enum):
+    """Why a talent refuses a role, in the order the checks run. AVAILABLE means no refusal."""
+    AVAILABLE = 0
+    SCENE_PARTNERS = 1
+    HARD_LIMIT = 2
+    CONCURRENCY = 3
+    ORIENTATION = 4
+    PREFERENCE = 5
+    REQUIRED_POLICY = 6
+    REFUSED_POLICY = 7
+    LOW_TIER = 8
+
 @dataclass(frozen=True)
 class AvailabilityResult:
     """Represents the outcome of a talent availability check."""
     is_available: bool
     reason: Optional[str] = None
+    code: RefusalCode = RefusalCode.AVAILABLE
+
+@dataclass(frozen=True)
+class RoleContext:
+    """
+    Everything the availability checks need to know about one role (a virtual
+    performer in a scene and its bloc), derived once so that any number of
+    talent can be checked against it without re-expanding the scene.
+    """
+    vp_id: int
+    num_performers: int
+    action_tags: FrozenSet[str]
+    roles_by_tag: Dict[str, Set[str]]
+    # Hard limit names that rule the role out: each action tag and its base name.
+    limit_names: Dict[str, str]
+    # (concept, givers in the segment) for every segment where the role receives.
+    concurrency_demands: Tuple[Tuple[str, int], ...]
+    # None without a bloc: policies and production tiers are then not checked.
+    active_policies: Optional[FrozenSet[str]]
+    # (category, tier name) of the bloc's production settings on a low tier.
+    low_tier_settings: Tuple[Tuple[str, str], ...]
+
+    @property
+    def role_pairs(self) -> List[Tuple[str, str]]:
+        return [(tag, role) for tag, roles in self.roles_by_tag.items() for role in roles]
 
 class TalentAvailabilityChecker:
     """
@@ -22,16 +64,43 @@ class TalentAvailabilityChecker:
     def __init__(self, data_manager: DataManager, config: HiringConfig):
         self.data_manager = data_manager
         self.config = config
+        self._policy_names = {p['id']: p['name'] for p in data_manager.on_set_policies_data.values()}
+        self._low_tiers = {
+            (category, tier['tier_name'])
+            for category, tiers in data_manager.production_settings_data.items()
+            for tier in tiers if tier.get('is_low_tier', False)
+        }
+
+    @staticmethod
+    def rested_by(date_val):
+        """
+        SQL predicate for talent whose fatigue has worn off by the given absolute
+        date (year * 52 + week, or a SQL expression for it). Rested talent store
+        a fatigue_end_date of 0, so this is answered from the index.
+        """
+        return TalentDB.fatigue_end_date < date_val
 
     def get_vp_role_context(self, scene: Scene, vp_id: int) -> tuple[Set[str], Dict[str, Set[str]]]:
         """
-        Parses the scene's expanded segments once to extract all role context for a VP.
+        The action tags a VP performs and its roles in each, from role_context().
+        """
+        context = self.role_context(scene, vp_id, None)
+        return set(context.action_tags), context.roles_by_tag
+
+    def role_context(self, scene: Scene, vp_id: int, bloc_db: Optional[ShootingBlocDB],
+                     segments: Optional[List] = None) -> RoleContext:
+        """
+        Derives the RoleContext of a virtual performer, expanding the scene's
+        segments once. Pass the already expanded `segments` when deriving the
+        context of several performers in one scene.
         """
+        tag_definitions = self.data_manager.tag_definitions
+        if segments is None:
+            segments = scene.get_expanded_action_segments(tag_definitions)
         action_tags = set()
         roles_by_tag = defaultdict(set)
-        
-        expanded_segments = scene.get_expanded_action_segments(self.data_manager.tag_definitions)
-        for segment in expanded_segments:
+        vp_segments = []
+        for segment in segments:
             is_vp_in_segment = False
             for assignment in segment.slot_assignments:
                 if assignment.virtual_performer_id == vp_id:
@@ -41,82 +110,173 @@ class TalentAvailabilityChecker:
                     except ValueError:
                         role = "Performer" # Default role
                     roles_by_tag[segment.tag_name].add(role)
-            
             if is_vp_in_segment:
                 action_tags.add(segment.tag_name)
-                
-        return action_tags, dict(roles_by_tag)
-        
-    def check(self, talent: Union[Talent, TalentDB], scene: Scene, vp_id: int, bloc_db: Optional[ShootingBlocDB]) -> AvailabilityResult:
+                vp_segments.append(segment)
+
+        limit_names = {}
+        for full_tag_name in action_tags:
+            tag_def = tag_definitions.get(full_tag_name)
+            base_name = tag_def.get('name') if tag_def else full_tag_name
+            limit_names[full_tag_name] = base_name
+            if base_name:
+                limit_names[base_name] = base_name
+
+        concurrency_demands = []
+        for segment in vp_segments:
+            tag_def = tag_definitions.get(segment.tag_name)
+            if not tag_def or not (concept := tag_def.get('concept')):
+                continue
+            if 'Receiver' in roles_by_tag[segment.tag_name]:
+                num_givers = sum(1 for a in segment.slot_assignments if '_Giver_' in a.slot_id)
+                concurrency_demands.append((concept, num_givers))
+
+        active_policies = frozenset(bloc_db.on_set_policies or []) if bloc_db else None
+        low_tier_settings = tuple(
+            (category, tier_name) for category, tier_name in ((bloc_db.production_settings or {}).items() if bloc_db else ())
+            if (category, tier_name) in self._low_tiers
+        )
+        return RoleContext(
+            vp_id=vp_id, num_performers=len(scene.virtual_performers), action_tags=frozenset(action_tags),
+            roles_by_tag=dict(roles_by_tag), limit_names=limit_names,
+            concurrency_demands=tuple(concurrency_demands), active_policies=active_policies,
+            low_tier_settings=low_tier_settings
+        )
+
+    def refusal_conditions(self, context: RoleContext) -> List[Tuple[RefusalCode, object]]:
+        """
+        SQL predicates on TalentDB, in check order, that are true for talent
+        refusing the role for every reason but low production tiers (which
+        are random). Each comes with the code check() would report.
+        """
+        conditions = []
+        if context.num_performers > 1:
+            conditions.append((RefusalCode.SCENE_PARTNERS, TalentDB.max_scene_partners < context.num_performers - 1))
+
+        if context.limit_names:
+            conditions.append((RefusalCode.HARD_LIMIT, select(TalentHardLimitDB.talent_id).where(
+                TalentHardLimitDB.talent_id == TalentDB.id, TalentHardLimitDB.tag.in_(context.limit_names)
+            ).exists()))
+
+        default_limit = self.config.concurrency_default_limit
+        for concept, num_givers in context.concurrency_demands:
+            limit = select(TalentConcurrencyLimitDB.max_givers).where(
+                TalentConcurrencyLimitDB.talent_id == TalentDB.id, TalentConcurrencyLimitDB.concept == concept
+            ).scalar_subquery()
+            conditions.append((RefusalCode.CONCURRENCY, func.coalesce(limit, default_limit) < num_givers))
+
+        if role_pairs := context.role_pairs:
+            def refused_below(threshold: float):
+                return select(TalentTagPreferenceDB.talent_id).where(
+                    TalentTagPreferenceDB.talent_id == TalentDB.id,
+                    TalentTagPreferenceDB.score < threshold,
+                    tuple_(TalentTagPreferenceDB.tag, TalentTagPreferenceDB.role).in_(role_pairs)
+                ).exists()
+            conditions.append((RefusalCode.ORIENTATION, refused_below(
+                min(self.config.orientation_refusal_threshold, self.config.refusal_threshold))))
+            conditions.append((RefusalCode.PREFERENCE, refused_below(self.config.refusal_threshold)))
+
+        if context.active_policies is not None:
+            active_policies = list(context.active_policies)
+            conditions.append((RefusalCode.REQUIRED_POLICY, select(TalentPolicyRequirementDB.talent_id).where(
+                TalentPolicyRequirementDB.talent_id == TalentDB.id,
+                TalentPolicyRequirementDB.requirement == 'requires',
+                TalentPolicyRequirementDB.policy_id.notin_(active_policies)
+            ).exists()))
+            conditions.append((RefusalCode.REFUSED_POLICY, select(TalentPolicyRequirementDB.talent_id).where(
+                TalentPolicyRequirementDB.talent_id == TalentDB.id,
+                TalentPolicyRequirementDB.requirement == 'refuses',
+                TalentPolicyRequirementDB.policy_id.in_(active_policies)
+            ).exists()))
+        return conditions
+
+    def refusal_code(self, context: RoleContext):
+        """
+        A SQL expression giving each talent's RefusalCode value for the role,
+        the first of refusal_conditions() that applies, or 0 (AVAILABLE).
+        """
+        if not (conditions := self.refusal_conditions(context)):
+            return literal(RefusalCode.AVAILABLE.value)
+        return case(*[(condition, code.value) for code, condition in conditions],
+                    else_=RefusalCode.AVAILABLE.value)
+
+    def candidate_filters(self, scene: Scene, vp_id: int, bloc_db: Optional[ShootingBlocDB]) -> List:
+        """
+        SQL predicates for the checks in check() that the talent tables can answer:
+        scene partners, hard limits, concurrency limits, refused roles and on-set
+        policies. Only the random low-tier refusal is left to check().
+        """
+        return [~condition for _, condition in self.refusal_conditions(self.role_context(scene, vp_id, bloc_db))]
+
+    def pickiness_refusal(self, context: RoleContext, total_popularity: float, ambition: int) -> Optional[AvailabilityResult]:
+        """Rolls whether a talent of this popularity and ambition turns down the bloc's low production tiers."""
+        if not context.low_tier_settings:
+            return None
+        pickiness_score = (total_popularity * self.config.pickiness_popularity_scalar) + (ambition * self.config.pickiness_ambition_scalar)
+        for category, tier_name in context.low_tier_settings:
+            if random.random() * 100 < pickiness_score:
+                return AvailabilityResult(False, f"Considers the '{tier_name}' {category} setting beneath them.",
+                                          RefusalCode.LOW_TIER)
+        return None
+
+    def check(self, talent: Union[Talent, TalentDB], scene: Scene, vp_id: int, bloc_db: Optional[ShootingBlocDB],
+              context: Optional[RoleContext] = None) -> AvailabilityResult:
+        """Checks one talent against a role. Pass the role's `context` when checking several talent."""
+        if context is None:
+            context = self.role_context(scene, vp_id, bloc_db)
+
         # Check 1: Max Scene Partners
-        num_performers = len(scene.virtual_performers)
+        num_performers = context.num_performers
         if num_performers > 1 and (num_performers - 1) > talent.max_scene_partners:
-            return AvailabilityResult(False, f"Refuses scenes with more than {talent.max_scene_partners} partners.")
+            return AvailabilityResult(False, f"Refuses scenes with more than {talent.max_scene_partners} partners.",
+                                      RefusalCode.SCENE_PARTNERS)
 
         # Check 2: Hard Limits
-        role_action_tags, roles_by_tag = self.get_vp_role_context(scene, vp_id)
-        for full_tag_name in role_action_tags:
-            tag_def = self.data_manager.tag_definitions.get(full_tag_name)
-            base_name = tag_def.get('name') if tag_def else full_tag_name
-            if full_tag_name in talent.hard_limits or (base_name and base_name in talent.hard_limits):
-                return AvailabilityResult(False, f"Talent has a hard limit against '{base_name}'.")
+        for limit_name in talent.hard_limits:
+            if limit_name in context.limit_names:
+                return AvailabilityResult(False, f"Talent has a hard limit against '{context.limit_names[limit_name]}'.",
+                                          RefusalCode.HARD_LIMIT)
         
         # Check 3: Concurrency Limits
-        expanded_segments = scene.get_expanded_action_segments(self.data_manager.tag_definitions)
-        for segment in expanded_segments:
-            if not any(a.virtual_performer_id == vp_id for a in segment.slot_assignments):
-                continue
-            tag_def = self.data_manager.tag_definitions.get(segment.tag_name)
-            if not tag_def or not (concept := tag_def.get('concept')):
-                continue
-            if 'Receiver' in roles_by_tag.get(segment.tag_name, set()):
-                num_givers = sum(1 for a in segment.slot_assignments if '_Giver_' in a.slot_id)
-                limit = talent.concurrency_limits.get(concept, self.config.concurrency_default_limit)
-                if num_givers > limit:
-                    return AvailabilityResult(False, f"Concurrency limit for '{concept}' exceeded (Max: {limit}, Scene has: {num_givers}).")
-
-        # Check 4: Preference & Orientation Compatibility
-        refusal_threshold = self.config.refusal_threshold
-        orientation_threshold = self.config.orientation_refusal_threshold
-        for tag_name, roles_in_tag in roles_by_tag.items():
-            for role in roles_in_tag:
-                preference = talent.tag_preferences.get(tag_name, {}).get(role, 1.0)
-                if preference < refusal_threshold:
-                    if preference < orientation_threshold:
-                        reason = f"Role involves '{tag_name}', which conflicts with their sexual orientation."
-                    else:
-                        reason = f"Strongly dislikes performing the '{role}' role in '{tag_name}'."
-                    return AvailabilityResult(False, reason)
+        for concept, num_givers in context.concurrency_demands:
+            limit = talent.concurrency_limits.get(concept, self.config.concurrency_default_limit)
+            if num_givers > limit:
+                return AvailabilityResult(False, f"Concurrency limit for '{concept}' exceeded (Max: {limit}, Scene has: {num_givers}).",
+                                          RefusalCode.CONCURRENCY)
 
-        # Check 5: Policy & Production (requires bloc)
-        if bloc_db:
-            active_policies = set(bloc_db.on_set_policies or [])
-            policy_names = {p['id']: p['name'] for p in self.data_manager.on_set_policies_data.values()}
+        # Check 4: Preference & Orientation Compatibility (the least liked part of the role decides)
+        if role_pairs := context.role_pairs:
+            preference, tag_name, role = min(
+                (talent.tag_preferences.get(tag, {}).get(role, 1.0), tag, role) for tag, role in role_pairs
+            )
+            if preference < self.config.refusal_threshold:
+                if preference < self.config.orientation_refusal_threshold:
+                    return AvailabilityResult(False, f"Role involves '{tag_name}', which conflicts with their sexual orientation.",
+                                              RefusalCode.ORIENTATION)
+                return AvailabilityResult(False, f"Strongly dislikes performing the '{role}' role in '{tag_name}'.",
+                                          RefusalCode.PREFERENCE)
 
+        # Check 5: Policy & Production (requires bloc)
+        if context.active_policies is not None:
             if required_policies := talent.policy_requirements.get('requires'):
                 for policy_id in required_policies:
-                    if policy_id not in active_policies:
-                        policy_name = policy_names.get(policy_id, policy_id)
-                        return AvailabilityResult(False, f"Requires the '{policy_name}' policy to be active.")
+                    if policy_id not in context.active_policies:
+                        policy_name = self._policy_names.get(policy_id, policy_id)
+                        return AvailabilityResult(False, f"Requires the '{policy_name}' policy to be active.",
+                                                  RefusalCode.REQUIRED_POLICY)
             if refused_policies := talent.policy_requirements.get('refuses'):
                 for policy_id in refused_policies:
-                    if policy_id in active_policies:
-                        policy_name = policy_names.get(policy_id, policy_id)
-                        return AvailabilityResult(False, f"Refuses to work with the '{policy_name}' policy.")
+                    if policy_id in context.active_policies:
+                        policy_name = self._policy_names.get(policy_id, policy_id)
+                        return AvailabilityResult(False, f"Refuses to work with the '{policy_name}' policy.",
+                                                  RefusalCode.REFUSED_POLICY)
         
-            pop_scalar = self.config.pickiness_popularity_scalar
-            amb_scalar = self.config.pickiness_ambition_scalar
             # Handle popularity from either TalentDB or Talent dataclass
             if hasattr(talent, 'popularity_scores'): # TalentDB
                 total_popularity = sum(p.score for p in talent.popularity_scores)
             else: # Talent
                 total_popularity = sum(talent.popularity.values())
-            
-            pickiness_score = (total_popularity * pop_scalar) + (talent.ambition * amb_scalar)
-            
-            for category, tier_name in (bloc_db.production_settings or {}).items():
-                tier_data = next((t for t in self.data_manager.production_settings_data.get(category, []) if t['tier_name'] == tier_name), None)
-                if tier_data and tier_data.get('is_low_tier', False) and random.random() * 100 < pickiness_score:
-                    return AvailabilityResult(False, f"Considers the '{tier_name}' {category} setting beneath them.")
-
-        return AvailabilityResult(is_available=True)
\ No newline at end of file
+            if refusal := self.pickiness_refusal(context, total_popularity, talent.ambition):
+                return refusal
+
+        return AvailabilityResult(is_available=True)
@@ -1,11 +1,14 @@
 import logging
+import math
 import numpy as np
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import tuple_
 from sqlalchemy.orm import joinedload
 
 from data.data_manager import DataManager
 from data.game_state import Talent, Scene
-from database.db_models import SceneDB, ActionSegmentDB
+from database.db_models import SceneDB, ActionSegmentDB, TalentDB, TalentPopularityDB, TalentTagPreferenceDB
 from services.query.game_query_service import GameQueryService
 from services.models.configs import HiringConfig
 from services.calculation.role_performance_calculator import RolePerformanceCalculator
@@ -13,6 +16,9 @@ from services.calculation.talent_availability_checker import TalentAvailabilityC
 
 logger = logging.getLogger(__name__)
 
+# Candidates are looked up in chunks to stay under SQLite's variable limit.
+DEMAND_LOOKUP_CHUNK = 900
+
 class TalentDemandCalculator:
     def __init__(self, session_factory, data_manager: DataManager, query_service: GameQueryService,
                  config: HiringConfig, availability_checker: TalentAvailabilityChecker):
@@ -26,15 +32,17 @@ class TalentDemandCalculator:
         """Calculates demand multipliers from talent's core stats (performance, ambition, popularity)."""
         performance_multiplier = 1 + (talent.performance / self.config.demand_perf_divisor)
         ambition_multiplier = 1.0 + ((talent.ambition - self.config.median_ambition) / self.config.ambition_demand_divisor)
-        overall_popularity = sum(talent.popularity.values())
+        # fsum is exactly rounded, so the total does not depend on the order the groups were loaded in.
+        overall_popularity = math.fsum(talent.popularity.values())
         popularity_multiplier = 1.0 + (overall_popularity * self.config.popularity_demand_scalar)
         return performance_multiplier * ambition_multiplier * popularity_multiplier
 
-    def _calculate_role_modifier(self, scene: Scene, vp_id: int) -> float:
+    def _calculate_role_modifier(self, scene: Scene, vp_id: int, segments: Optional[List] = None) -> float:
         """Calculates the demand modifier based on the most demanding role the VP plays."""
         max_demand_mod = 1.0
-        action_segments_for_calc = scene.get_expanded_action_segments(self.data_manager.tag_definitions)
-        for segment in action_segments_for_calc:
+        if segments is None:
+            segments = scene.get_expanded_action_segments(self.data_manager.tag_definitions)
+        for segment in segments:
             slots = scene._get_slots_for_segment(segment, self.data_manager.tag_definitions)
             for assignment in segment.slot_assignments:
                 if assignment.virtual_performer_id == vp_id:
@@ -49,9 +57,11 @@ class TalentDemandCalculator:
                     max_demand_mod = max(max_demand_mod, final_mod)
         return max_demand_mod
 
-    def _calculate_preference_multiplier(self, talent: Talent, scene: Scene, vp_id: int) -> float:
+    def _calculate_preference_multiplier(self, talent: Talent, scene: Scene, vp_id: int,
+                                         roles_by_tag: Optional[Dict[str, Set[str]]] = None) -> float:
         """Calculates the average preference score for the roles the VP plays."""
-        _, roles_by_tag = self.availability_checker.get_vp_role_context(scene, vp_id)
+        if roles_by_tag is None:
+            _, roles_by_tag = self.availability_checker.get_vp_role_context(scene, vp_id)
         if not roles_by_tag:
             return 1.0
             
@@ -63,6 +73,25 @@ class TalentDemandCalculator:
         
         return np.mean(preference_scores) if preference_scores else 1.0
 
+    def calculate_demand(self, talent: Talent, scene: Scene, vp_id: int, segments: Optional[List] = None,
+                         roles_by_tag: Optional[Dict[str, Set[str]]] = None) -> int:
+        """
+        Calculates the hiring cost of an already loaded talent for a role without
+        touching the database. When pricing several roles of one scene, pass its
+        expanded `segments` and each role's `roles_by_tag` to avoid re-expanding it.
+        """
+        base_multipliers = self._calculate_base_multipliers(talent)
+        role_modifier = self._calculate_role_modifier(scene, vp_id, segments)
+        preference_multiplier = self._calculate_preference_multiplier(talent, scene, vp_id, roles_by_tag)
+
+        final_demand = self.config.base_talent_demand * base_multipliers * role_modifier
+
+        # A preference > 1 reduces cost; a preference < 1 increases it.
+        if preference_multiplier > 0:
+            final_demand /= preference_multiplier
+
+        return max(self.config.minimum_talent_demand, int(final_demand))
+
     def calculate_talent_demand(self, talent_id: int, scene_id: int, vp_id: int, scene: Optional[Scene] = None) -> int:
         """Calculates the hiring cost for a specific talent in a specific role."""
         session = self.session_factory()
@@ -78,19 +107,90 @@ class TalentDemandCalculator:
                 if not scene_db: return 0
                 scene = scene_db.to_dataclass(Scene)
 
-            base_multipliers = self._calculate_base_multipliers(talent)
-            role_modifier = self._calculate_role_modifier(scene, vp_id)
-            preference_multiplier = self._calculate_preference_multiplier(talent, scene, vp_id)
-            
-            final_demand = self.config.base_talent_demand * base_multipliers * role_modifier
-            
-            # A preference > 1 reduces cost; a preference < 1 increases it.
-            if preference_multiplier > 0:
-                final_demand /= preference_multiplier
-
-            return max(self.config.minimum_talent_demand, int(final_demand))
+            return self.calculate_demand(talent, scene, vp_id)
         except Exception as e:
             logger.error(f"Error calculating demand for talent {talent_id} in scene {scene_id}: {e}", exc_info=True)
             return 0
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    def calculate_demands(self, performance: np.ndarray, ambition: np.ndarray, total_popularity: np.ndarray,
+                          preference_scores: np.ndarray, role_modifier: float) -> np.ndarray:
+        """
+        calculate_demand for N candidates in one role at once. `performance`,
+        `ambition` and `total_popularity` hold one value per candidate and
+        `preference_scores` is N x R, a column per (tag, role) the role plays
+        (R may be 0). Returns the N demands, equal to the scalar path's.
+        """
+        performance_multiplier = 1 + (np.asarray(performance, dtype=float) / self.config.demand_perf_divisor)
+        ambition_multiplier = 1.0 + ((np.asarray(ambition, dtype=float) - self.config.median_ambition) / self.config.ambition_demand_divisor)
+        popularity_multiplier = 1.0 + (np.asarray(total_popularity, dtype=float) * self.config.popularity_demand_scalar)
+        base_multipliers = performance_multiplier * ambition_multiplier * popularity_multiplier
+
+        final_demand = self.config.base_talent_demand * base_multipliers * role_modifier
+
+        preference_scores = np.asarray(preference_scores, dtype=float)
+        if preference_scores.ndim == 2 and preference_scores.shape[1]:
+            # A preference > 1 reduces cost; a preference < 1 increases it.
+            preference_multiplier = preference_scores.mean(axis=1)
+            prefers = preference_multiplier > 0
+            final_demand[prefers] /= preference_multiplier[prefers]
+
+        return np.maximum(self.config.minimum_talent_demand, np.trunc(final_demand)).astype(np.int64)
+
+    def calculate_role_demands(self, scene_id: int, vp_id: int, talent_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Calculates the hiring cost of every given talent for one role, keyed by
+        talent id. The role is derived once, the candidates' stats are read with
+        a few queries per DEMAND_LOOKUP_CHUNK talent and priced by calculate_demands.
+        """
+        session = self.session_factory()
+        try:
+            scene_db = session.query(SceneDB).options(
+                joinedload(SceneDB.virtual_performers),
+                joinedload(SceneDB.action_segments).joinedload(ActionSegmentDB.slot_assignments)
+            ).get(scene_id)
+            if not scene_db: return {}
+            scene = scene_db.to_dataclass(Scene)
+
+            segments = scene.get_expanded_action_segments(self.data_manager.tag_definitions)
+            role_modifier = self._calculate_role_modifier(scene, vp_id, segments)
+            role_pairs = self.availability_checker.role_context(scene, vp_id, None, segments).role_pairs
+            column_of = {pair: column for column, pair in enumerate(role_pairs)}
+
+            talent_ids = list(dict.fromkeys(talent_ids))
+            row_of = {talent_id: row for row, talent_id in enumerate(talent_ids)}
+            performance = np.zeros(len(talent_ids))
+            ambition = np.zeros(len(talent_ids))
+            total_popularity = np.zeros(len(talent_ids))
+            preference_scores = np.ones((len(talent_ids), len(role_pairs)))
+            found = np.zeros(len(talent_ids), dtype=bool)
+
+            for start in range(0, len(talent_ids), DEMAND_LOOKUP_CHUNK):
+                chunk = talent_ids[start:start + DEMAND_LOOKUP_CHUNK]
+                for talent_id, talent_performance, talent_ambition in session.query(
+                        TalentDB.id, TalentDB.performance, TalentDB.ambition).filter(TalentDB.id.in_(chunk)):
+                    row = row_of[talent_id]
+                    performance[row], ambition[row], found[row] = talent_performance, talent_ambition, True
+                # Summed with fsum, as the scalar path does, so row order cannot change the total.
+                group_scores = defaultdict(list)
+                for talent_id, score in session.query(TalentPopularityDB.talent_id, TalentPopularityDB.score)\
+                        .filter(TalentPopularityDB.talent_id.in_(chunk)):
+                    group_scores[talent_id].append(score)
+                for talent_id, scores in group_scores.items():
+                    total_popularity[row_of[talent_id]] = math.fsum(scores)
+                if role_pairs:
+                    for talent_id, tag, role, score in session.query(
+                            TalentTagPreferenceDB.talent_id, TalentTagPreferenceDB.tag,
+                            TalentTagPreferenceDB.role, TalentTagPreferenceDB.score
+                    ).filter(TalentTagPreferenceDB.talent_id.in_(chunk),
+                             tuple_(TalentTagPreferenceDB.tag, TalentTagPreferenceDB.role).in_(role_pairs)):
+                        preference_scores[row_of[talent_id], column_of[(tag, role)]] = score
+
+            demands = self.calculate_demands(performance, ambition, total_popularity, preference_scores, role_modifier)
+            return {talent_id: int(demand) for talent_id, demand, is_found in zip(talent_ids, demands, found) if is_found}
+        except Exception as e:
+            logger.error(f"Error calculating demands for role {vp_id} in scene {scene_id}: {e}", exc_info=True)
+            return {}
+        finally:
+            session.close()
@@ -1,16 +1,18 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
-from core.game_signals import GameSignals
 from data.game_state import GameState, EmailMessage
 from database.db_models import EmailMessageDB
 
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
+
 logger = logging.getLogger(__name__)
 
 class EmailService:
     """Manages all database operations related to emails."""
 
-    def __init__(self, session_factory, signals: GameSignals, game_state: GameState):
+    def __init__(self, session_factory, signals: 'GameSignals', game_state: GameState):
         self.session_factory = session_factory
         self.signals = signals
         self.game_state = game_state
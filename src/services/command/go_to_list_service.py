@@ -1,15 +1,17 @@
 import logging
 from sqlalchemy import func
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
 from data.game_state import Talent
 from database.db_models import GoToListCategoryDB, GoToListAssignmentDB, TalentDB
-from core.game_signals import GameSignals
+
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
 
 logger = logging.getLogger(__name__)
 
 class GoToListService:
-    def __init__(self, session_factory, signals: GameSignals):
+    def __init__(self, session_factory, signals: 'GameSignals'):
         self.session_factory = session_factory
         self.signals = signals
     
@@ -1,10 +1,10 @@
 import logging
 import random
-from typing import Dict, List, Optional, DefaultDict
+from typing import Dict, List, Optional, DefaultDict, Tuple, TYPE_CHECKING
+from sqlalchemy import func
 from sqlalchemy.orm import selectinload, Session
 from sqlalchemy.orm.attributes import flag_modified
 
-from core.game_signals import GameSignals
 from data.game_state import Scene, Talent
 from data.data_manager import DataManager
 from database.db_models import ( SceneDB, VirtualPerformerDB, ActionSegmentDB, SlotAssignmentDB,
@@ -13,6 +13,7 @@ from database.db_models import ( SceneDB, VirtualPerformerDB, ActionSegmentDB, S
 from services.query.game_query_service import GameQueryService
 from services.command.talent_command_service import TalentCommandService
 from services.command.scene_processing_service import SceneProcessingService
+from services.command.shoot_context import ShootContext
 from services.command.email_service import EmailService
 from services.events.scene_event_trigger_service import SceneEventTriggerService
 from services.market_service import MarketService
@@ -20,6 +21,9 @@ from services.calculation.revenue_calculator import RevenueCalculator
 from services.calculation.bloc_cost_calculator import BlocCostCalculator
 from services.models.results import ShootCalculationResult
 
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
+
 logger = logging.getLogger(__name__)
 
 class SceneCommandService:
@@ -27,7 +31,7 @@ class SceneCommandService:
     Command service for scene-related database operations.
     """
     
-    def __init__(self, session_factory, signals: GameSignals, data_manager: DataManager, query_service: GameQueryService, 
+    def __init__(self, session_factory, signals: 'GameSignals', data_manager: DataManager, query_service: GameQueryService, 
              talent_command_service: TalentCommandService, market_service: MarketService, 
              email_service: EmailService, scene_processing_service: SceneProcessingService, revenue_calculator: RevenueCalculator,
              scene_event_trigger_service: SceneEventTriggerService, bloc_cost_calculator: BlocCostCalculator):
@@ -427,23 +431,18 @@ class SceneCommandService:
         finally:
             session.close()
 
-    def shoot_scene(self, session: Session, scene_db: SceneDB) -> bool:
+    def shoot_scene(self, session: Session, scene_db: SceneDB, context: ShootContext) -> bool:
         """
         Begins shooting a scene. This is the entry point from TimeService.
         It checks for an interactive event. If one occurs, it signals the UI and
         returns True to pause the time advancement. Otherwise, it completes
         the shoot and returns False.
+        `scene_db` must come from `context`, which holds everything the shoot reads.
         This method operates within the transaction managed by TimeService.
         """
-        # Ensure the dataclass is fully hydrated for the event check
-        hydrated_scene_db = session.query(SceneDB).options(
-            selectinload(SceneDB.virtual_performers),
-            selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments),
-            selectinload(SceneDB.cast)
-        ).get(scene_db.id)
-        scene_dc = hydrated_scene_db.to_dataclass(Scene)
+        scene_dc = scene_db.to_dataclass(Scene)
         
-        event_payload = self.scene_event_trigger_service.check_for_shoot_event(session, scene_dc)
+        event_payload = self.scene_event_trigger_service.check_for_shoot_event(scene_dc, context)
 
         if event_payload:
             # An event occurred. Emit signal and stop. Controller will resume.
@@ -455,14 +454,14 @@ class SceneCommandService:
             return True # Indicates that an event has paused the process
         else:
             # No event. Proceed with the full shooting process.
-            self._continue_shoot_scene(session, scene_dc.id, {})
+            self._continue_shoot_scene(session, scene_dc.id, {}, context)
             return False # Indicates the process completed normally
         
     def continue_shoot_scene_after_event(self, scene_id: int, shoot_modifiers: Dict) -> bool:
         """Public method to continue shooting after event resolution."""
         session = self.session_factory()
         try:
-            self._continue_shoot_scene(session, scene_id, shoot_modifiers)
+            self._continue_shoot_scene(session, scene_id, shoot_modifiers, ShootContext.for_scene(session, scene_id))
             session.commit()
             return True
         except Exception as e:
@@ -472,28 +471,52 @@ class SceneCommandService:
         finally:
             session.close()
 
-    def _continue_shoot_scene(self, session, scene_id: int, shoot_modifiers: Dict):
+    def _continue_shoot_scene(self, session, scene_id: int, shoot_modifiers: Dict, context: ShootContext):
         """
         The second part of the shooting process, either called directly if
         no event occurs, or by the controller after an event is resolved.
         This method operates within a transaction managed by its caller.
         """
-        scene_db = session.query(SceneDB).options(
-            selectinload(SceneDB.cast)
-        ).get(scene_id)
+        scene_db = context.get_scene(scene_id)
         
         if not scene_db:
             logger.error(f"[ERROR] _continue_shoot_scene: Scene ID {scene_id} not found.")
             return
 
         # Step 1: Prepare for the shoot (deduct costs, discover chemistry)
-        self.scene_processing_service.prepare_for_shoot_calculation(session, scene_db)
+        self.scene_processing_service.prepare_for_shoot_calculation(session, scene_db, context)
 
         # Step 2: Run all pure calculations and get a clean result object
-        shoot_result = self.scene_processing_service.run_shoot_calculations(session, scene_db, shoot_modifiers)
+        shoot_result = self.scene_processing_service.run_shoot_calculations(scene_db, shoot_modifiers, context)
 
         # Step 3: Apply the calculation results to the database
-        self.scene_processing_service.apply_shoot_calculation_results(session, scene_db, shoot_result)
+        self.scene_processing_service.apply_shoot_calculation_results(scene_db, shoot_result, context)
+
+    def weeks_until_next_production_event(self, session: Session, current_date_val: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns (weeks until the next scheduled scene, weeks until the next edit
+        finishes), each None if there is none. A value of 0 means advancing from
+        the current week would shoot, or finish editing, a scene.
+        """
+        scheduled_date = session.query(func.min(SceneDB.scheduled_year * 52 + SceneDB.scheduled_week)).filter(
+            SceneDB.status.in_(['design', 'casting', 'scheduled']),
+            SceneDB.scheduled_year * 52 + SceneDB.scheduled_week >= current_date_val
+        ).scalar()
+        min_editing_weeks = session.query(func.min(SceneDB.weeks_remaining)).filter(
+            SceneDB.status == 'in_editing'
+        ).scalar()
+        weeks_to_shoot = scheduled_date - current_date_val if scheduled_date is not None else None
+        weeks_to_edit = max(0, min_editing_weeks - 1) if min_editing_weeks is not None else None
+        return weeks_to_shoot, weeks_to_edit
+
+    def skip_post_production_weeks(self, session: Session, weeks: int) -> int:
+        """
+        Counts down editing by `weeks` without finishing any scene; callers must
+        stay below weeks_until_next_production_event. Returns the scenes touched.
+        """
+        return session.query(SceneDB).filter(SceneDB.status == 'in_editing').update(
+            {SceneDB.weeks_remaining: SceneDB.weeks_remaining - weeks}, synchronize_session=False
+        )
 
     def process_weekly_post_production(self, session: Session) -> List[SceneDB]:
         """
@@ -1,12 +1,13 @@
 import logging
 from typing import Dict, List
-from sqlalchemy.orm import selectinload, Session
+from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
 from data.game_state import Scene, Talent
 from data.data_manager import DataManager
-from database.db_models import SceneDB, TalentDB, GameInfoDB, ShootingBlocDB, ScenePerformerContributionDB, TalentChemistryDB
+from database.db_models import SceneDB, GameInfoDB, ShootingBlocDB, ScenePerformerContributionDB
 from services.command.talent_command_service import TalentCommandService
+from services.command.shoot_context import ShootContext
 from services.models.configs import SceneCalculationConfig
 from services.models.results import ShootCalculationResult
 from services.calculation.tag_validation_checker import TagValidationChecker
@@ -34,7 +35,7 @@ class SceneProcessingService:
         self.scene_quality_calculator = scene_quality_calc
         self.post_production_calculator = post_prod_calc
 
-    def prepare_for_shoot_calculation(self, session: Session, scene_db: SceneDB):
+    def prepare_for_shoot_calculation(self, session: Session, scene_db: SceneDB, context: ShootContext):
         """
         Handles preparatory database writes before the main calculation phase.
         This includes deducting costs and discovering chemistry.
@@ -42,35 +43,26 @@ class SceneProcessingService:
         # Deduct salary costs
         total_salary_cost = sum(c.salary for c in scene_db.cast)
         if total_salary_cost > 0:
-            money_info = session.query(GameInfoDB).filter_by(key='money').one()
+            # session.get() is served from the identity map once money has been loaded
+            money_info = session.get(GameInfoDB, 'money')
             money_info.value = str(int(float(money_info.value)) - total_salary_cost)
 
         # Discover and create chemistry between cast members
         talent_ids = [c.talent_id for c in scene_db.cast]
-        talents_db = session.query(TalentDB).options(
-            selectinload(TalentDB.chemistry_a).joinedload(TalentChemistryDB.talent_b),
-            selectinload(TalentDB.chemistry_b).joinedload(TalentChemistryDB.talent_a)
-        ).filter(TalentDB.id.in_(talent_ids)).all()
-        cast_talents_dc = [t.to_dataclass(Talent) for t in talents_db]
+        cast_talents_dc = [t.to_dataclass(Talent) for t in context.get_talents(talent_ids)]
         
-        self.talent_command_service.discover_and_create_chemistry(session, cast_talents_dc)
+        self.talent_command_service.discover_and_create_chemistry(session, cast_talents_dc, context.chemistry_pairs)
 
-    def run_shoot_calculations(self, session: Session, scene_db: SceneDB, shoot_modifiers: Dict) -> ShootCalculationResult:
+    def run_shoot_calculations(self, scene_db: SceneDB, shoot_modifiers: Dict, context: ShootContext) -> ShootCalculationResult:
         """
-        Fetches data, orchestrates pure calculators, and returns a consolidated DTO.
-        This method performs NO database writes.
+        Orchestrates pure calculators over the prefetched shoot context and
+        returns a consolidated DTO. This method performs NO database access.
         """
-        # --- 1. DATA FETCHING ---
+        # --- 1. DATA GATHERING ---
         scene = scene_db.to_dataclass(Scene)
         talent_ids = list(scene.final_cast.values())
-        talents_db = session.query(TalentDB).options(
-            selectinload(TalentDB.popularity_scores)
-        ).filter(TalentDB.id.in_(talent_ids)).all()
-        cast_talents_dc = [t.to_dataclass(Talent) for t in talents_db]
-
-        week_info = session.query(GameInfoDB).filter_by(key='week').one()
-        year_info = session.query(GameInfoDB).filter_by(key='year').one()
-        current_week, current_year = int(week_info.value), int(year_info.value)
+        cast_talents_dc = [t.to_dataclass(Talent) for t in context.get_talents(talent_ids)]
+        current_week, current_year = context.current_week, context.current_year
 
         # --- 2. DELEGATE TO PURE CALCULATORS ---
         talent_outcomes = self.shoot_results_calculator.calculate_talent_outcomes(
@@ -82,7 +74,7 @@ class SceneProcessingService:
         discovered_tags = self.tag_validation_checker.analyze_cast(cast_talents_dc, existing_tags)
         scene.auto_tags = discovered_tags
 
-        bloc_db = session.query(ShootingBlocDB).get(scene.bloc_id) if scene.bloc_id else None
+        bloc_db = context.get_bloc(scene.bloc_id)
         quality_result = self.scene_quality_calculator.calculate_quality(
             scene, cast_talents_dc, shoot_modifiers, bloc_db.production_settings if bloc_db else None
         )
@@ -94,22 +86,19 @@ class SceneProcessingService:
             discovered_tags=discovered_tags
         )
 
-    def apply_shoot_calculation_results(self, session: Session, scene_db: SceneDB, result: ShootCalculationResult):
+    def apply_shoot_calculation_results(self, scene_db: SceneDB, result: ShootCalculationResult, context: ShootContext):
         """
         Applies the data from a ShootCalculationResult DTO to the database models.
         """
-        talent_ids = [outcome.talent_id for outcome in result.talent_outcomes]
-        talents_db = session.query(TalentDB).filter(TalentDB.id.in_(talent_ids)).all()
-        talent_db_map = {t.id: t for t in talents_db}
-
         for outcome in result.talent_outcomes:
-            talent_db = talent_db_map.get(outcome.talent_id)
+            talent_db = context.talents.get(outcome.talent_id)
             if not talent_db: continue
             
             if outcome.fatigue_result:
                 talent_db.fatigue = outcome.fatigue_result.new_fatigue_level
                 talent_db.fatigue_end_week = outcome.fatigue_result.fatigue_end_week
                 talent_db.fatigue_end_year = outcome.fatigue_result.fatigue_end_year
+                talent_db.fatigue_end_date = talent_db.fatigue_end_year * 52 + talent_db.fatigue_end_week
             
             for skill, gain in outcome.skill_gains.items():
                 current_val = getattr(talent_db, skill)
@@ -0,0 +1,77 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import selectinload, Session
+
+from database.db_models import (
+    SceneDB, ShootingBlocDB, TalentDB, ActionSegmentDB, GameInfoDB
+)
+
+@dataclass
+class ShootContext:
+    """
+    Everything the shooting pipeline needs for a batch of scenes, loaded up
+    front in a fixed number of queries: the scenes with their performers,
+    segments, assignments, cast and contributions, their blocs, and every cast
+    talent with popularity and chemistry.
+
+    It is built once per week by TimeService (or once per scene when a shoot
+    resumes after an interactive event) and handed to the shoot, event and
+    quality steps, so none of them re-query what is already here. All objects
+    belong to the session that loaded them.
+    """
+    current_week: int
+    current_year: int
+    scenes: List[SceneDB] = field(default_factory=list)
+    blocs: Dict[int, ShootingBlocDB] = field(default_factory=dict)
+    talents: Dict[int, TalentDB] = field(default_factory=dict)
+    # Sorted (talent_a_id, talent_b_id) pairs that already have chemistry,
+    # including pairs created earlier in the same batch.
+    chemistry_pairs: Set[Tuple[int, int]] = field(default_factory=set)
+
+    @classmethod
+    def for_week(cls, session: Session, week: int, year: int) -> 'ShootContext':
+        """Loads every scene scheduled to shoot in the given week."""
+        scene_filter = (SceneDB.status == 'scheduled', SceneDB.scheduled_week == week, SceneDB.scheduled_year == year)
+        return cls._load(session, week, year, scene_filter)
+
+    @classmethod
+    def for_scene(cls, session: Session, scene_id: int) -> 'ShootContext':
+        """Loads a single scene, using the current game date."""
+        game_info = {row.key: row.value for row in session.query(GameInfoDB).filter(GameInfoDB.key.in_(('week', 'year')))}
+        return cls._load(session, int(game_info['week']), int(game_info['year']), (SceneDB.id == scene_id,))
+
+    @classmethod
+    def _load(cls, session: Session, week: int, year: int, scene_filter: Iterable) -> 'ShootContext':
+        scenes = session.query(SceneDB).options(
+            selectinload(SceneDB.bloc),
+            selectinload(SceneDB.virtual_performers),
+            selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments),
+            selectinload(SceneDB.cast),
+            selectinload(SceneDB.performer_contributions_rel)
+        ).filter(*scene_filter).order_by(SceneDB.id).all()
+
+        context = cls(current_week=week, current_year=year, scenes=scenes)
+        context.blocs = {s.bloc.id: s.bloc for s in scenes if s.bloc is not None}
+
+        talent_ids = {c.talent_id for s in scenes for c in s.cast}
+        if talent_ids:
+            talents = session.query(TalentDB).options(
+                selectinload(TalentDB.popularity_scores),
+                selectinload(TalentDB.chemistry_a),
+                selectinload(TalentDB.chemistry_b)
+            ).filter(TalentDB.id.in_(talent_ids)).all()
+            context.talents = {t.id: t for t in talents}
+            for talent in talents:
+                for chem in (*talent.chemistry_a, *talent.chemistry_b):
+                    context.chemistry_pairs.add(tuple(sorted((chem.talent_a_id, chem.talent_b_id))))
+        return context
+
+    def get_scene(self, scene_id: int) -> Optional[SceneDB]:
+        return next((s for s in self.scenes if s.id == scene_id), None)
+
+    def get_bloc(self, bloc_id: Optional[int]) -> Optional[ShootingBlocDB]:
+        return self.blocs.get(bloc_id) if bloc_id else None
+
+    def get_talents(self, talent_ids: Iterable[int]) -> List[TalentDB]:
+        """Returns the prefetched talents for the given ids, skipping unknown ones."""
+        return [self.talents[tid] for tid in dict.fromkeys(talent_ids) if tid in self.talents]
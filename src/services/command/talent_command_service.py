@@ -1,28 +1,39 @@
 import logging
 from itertools import combinations
-from sqlalchemy import tuple_
+from sqlalchemy import tuple_, select, values, column, true, Integer, String
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload, Session
-from typing import List
+from typing import List, Optional, Set, Tuple, TYPE_CHECKING
 
-from core.game_signals import GameSignals
 from data.game_state import Talent
 from services.models.configs import SceneCalculationConfig
-from database.db_models import SceneDB,TalentDB, TalentPopularityDB, TalentChemistryDB
+from database.db_models import (
+    SceneDB, TalentDB, TalentPopularityDB, TalentChemistryDB, TalentTagAffinityDB, current_date_value
+)
 from services.calculation.talent_affinity_calculator import TalentAffinityCalculator
 
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
+
 logger = logging.getLogger(__name__)
 
 class TalentCommandService:
     """Manages all state changes (writes/commands) related to talents."""
 
-    def __init__(self, signals: GameSignals, config: SceneCalculationConfig, talent_affinity_calculator: TalentAffinityCalculator):
+    def __init__(self, signals: 'GameSignals', config: SceneCalculationConfig, talent_affinity_calculator: TalentAffinityCalculator):
         self.signals = signals
         self.config = config
         self.talent_affinity_calculator = talent_affinity_calculator
 
-    def discover_and_create_chemistry(self, session: Session, cast_talents: List[Talent]):
+    def discover_and_create_chemistry(self, session: Session, cast_talents: List[Talent],
+                                      existing_pairs: Optional[Set[Tuple[int, int]]] = None):
         """Checks for new chemistry pairs during a scene shot and creates them in the database.
-        Called from SceneProcessingService"""
+        Called from SceneProcessingService.
+
+        `existing_pairs` is an optional set of sorted id pairs known to have
+        chemistry already (e.g. from a ShootContext); it saves the lookup query
+        and is updated with the pairs created here, so later scenes in the same
+        transaction do not create them twice."""
         if len(cast_talents) < 2:
             return
 
@@ -31,10 +42,11 @@ class TalentCommandService:
         if not all_possible_pairs:
             return
 
-        existing_pairs_query = session.query(TalentChemistryDB.talent_a_id, TalentChemistryDB.talent_b_id).filter(
-            tuple_(TalentChemistryDB.talent_a_id, TalentChemistryDB.talent_b_id).in_(all_possible_pairs)
-        )
-        existing_pairs = {tuple(sorted(pair)) for pair in existing_pairs_query.all()}
+        if existing_pairs is None:
+            existing_pairs_query = session.query(TalentChemistryDB.talent_a_id, TalentChemistryDB.talent_b_id).filter(
+                tuple_(TalentChemistryDB.talent_a_id, TalentChemistryDB.talent_b_id).in_(all_possible_pairs)
+            )
+            existing_pairs = {tuple(sorted(pair)) for pair in existing_pairs_query.all()}
 
         for t1, t2 in combinations(cast_talents, 2):
             id1, id2 = sorted((t1.id, t2.id))
@@ -44,6 +56,7 @@ class TalentCommandService:
             initial_score = 0
             new_chem = TalentChemistryDB(talent_a_id=id1, talent_b_id=id2, chemistry_score=initial_score)
             session.add(new_chem)
+            existing_pairs.add((id1, id2))
 
     def _calculate_new_popularity_score(self, current_pop: float, interest_score: float) -> float:
         """Calculates the popularity gain with diminishing returns."""
@@ -58,61 +71,96 @@ class TalentCommandService:
 
     def update_popularity_from_scene(self, session: Session, scene_id: int):
         """Updates the popularity for all cast members of a released scene.
-        Called from SceneCommandService."""
-        scene_db = session.query(SceneDB).options(selectinload(SceneDB.cast)).get(scene_id)
+        The gain is applied to the decayed score and stored as the new base
+        as of the current week. Called from SceneCommandService."""
+        scene_db = session.get(SceneDB, scene_id, options=[selectinload(SceneDB.cast)])
         if not (scene_db and scene_db.viewer_group_interest): return
         
         talent_ids = [c.talent_id for c in scene_db.cast]
         if not talent_ids: return
 
         talents = session.query(TalentDB).options(selectinload(TalentDB.popularity_scores)).filter(TalentDB.id.in_(talent_ids)).all()
+        current_date_val = session.scalar(select(current_date_value()))
         
         for talent_db in talents:
             pop_map = {p.market_group_name: p for p in talent_db.popularity_scores}
             for group_name, interest_score in scene_db.viewer_group_interest.items():
                 if group_name in pop_map:
                     pop_entry = pop_map[group_name]
-                    pop_entry.score = self._calculate_new_popularity_score(pop_entry.score, interest_score)
+                    pop_entry.base_score = self._calculate_new_popularity_score(pop_entry.score, interest_score)
+                    pop_entry.last_updated_week = current_date_val
                 else:
                     initial_score = self._calculate_new_popularity_score(0.0, interest_score)
-                    new_pop_entry = TalentPopularityDB(talent_id=talent_db.id, market_group_name=group_name, score=initial_score)
+                    new_pop_entry = TalentPopularityDB(
+                        talent_id=talent_db.id, market_group_name=group_name,
+                        base_score=initial_score, last_updated_week=current_date_val
+                    )
                     session.add(new_pop_entry)
 
-    def _apply_popularity_decay(self, talent: TalentDB, decay_rate: float):
-        """Applies a weekly decay to a talent's popularity scores."""
-        for pop_entry in talent.popularity_scores:
-            pop_entry.score *= decay_rate
-
-    def _update_fatigue_status(self, talent: TalentDB, current_date_val: int):
-        """Checks and resets a talent's fatigue if the recovery period has passed."""
-        if talent.fatigue > 0:
-            fatigue_end_val = talent.fatigue_end_year * 52 + talent.fatigue_end_week
-            if current_date_val >= fatigue_end_val:
-                talent.fatigue, talent.fatigue_end_week, talent.fatigue_end_year = 0, 0, 0
-
-    def _apply_new_year_updates(self, talent: TalentDB):
-        """Applies annual updates to a talent, such as aging and recalculating affinities."""
-        talent.age += 1
-        talent_obj = talent.to_dataclass(Talent)
-        new_affinities = self.talent_affinity_calculator.recalculate_talent_age_affinities(talent_obj)
-        talent.tag_affinities = new_affinities
+    def _update_fatigue_status(self, session: Session, current_date_val: int) -> int:
+        """Resets fatigue for every talent whose recovery period has passed.
+        Rested talent have a fatigue_end_date of 0, so this is a range scan over
+        the index that only touches talent whose fatigue ends by this date."""
+        return session.query(TalentDB).filter(
+            TalentDB.fatigue_end_date.between(1, current_date_val)
+        ).update(
+            {TalentDB.fatigue: 0, TalentDB.fatigue_end_week: 0, TalentDB.fatigue_end_year: 0,
+             TalentDB.fatigue_end_date: 0},
+            synchronize_session=False
+        )
+
+    def _apply_new_year_updates(self, session: Session):
+        """Ages every talent by one year, then re-applies the age-based affinity
+        rules with a single upsert. The rules are compiled by TalentAffinityCalculator
+        into runs of ages that share the same affinities; every (run, tag) pair
+        becomes one row of a VALUES table joined to the talent on their new age."""
+        session.query(TalentDB).update({TalentDB.age: TalentDB.age + 1}, synchronize_session=False)
+
+        rule_rows = [(min_age, max_age, tag, score)
+                     for min_age, max_age, affinities in self.talent_affinity_calculator.age_affinity_ranges()
+                     for tag, score in affinities.items()]
+        if not rule_rows: return
+        rules = values(
+            column('min_age', Integer), column('max_age', Integer), column('tag', String), column('score', Integer),
+            name='age_rules'
+        ).data(rule_rows).cte()
+        # SQLite needs a WHERE before ON CONFLICT when the SELECT has a join.
+        matches = select(TalentDB.id, rules.c.tag, rules.c.score)\
+            .join(rules, TalentDB.age.between(rules.c.min_age, rules.c.max_age)).where(true())
+        upsert = sqlite_insert(TalentTagAffinityDB).from_select(['talent_id', 'tag', 'score'], matches)
+        session.execute(upsert.on_conflict_do_update(
+            index_elements=[TalentTagAffinityDB.talent_id, TalentTagAffinityDB.tag],
+            set_={'score': upsert.excluded.score}
+        ))
     
     def process_weekly_updates(self, session: Session, current_date_val: int, new_year: bool) -> bool:
-        """Processes all weekly changes for talents.
+        """Processes all weekly changes for talents as set-based statements.
+        No ORM objects are loaded; fatigue expiry and aging are each a bulk
+        UPDATE regardless of the size of the talent pool. Popularity decay
+        needs no write at all: it is applied on read (see TalentPopularityDB.score).
         Called from TimeService."""
-        talents_to_update = session.query(TalentDB).options(
-            selectinload(TalentDB.popularity_scores),
-            selectinload(TalentDB.chemistry_a).joinedload(TalentChemistryDB.talent_b),
-            selectinload(TalentDB.chemistry_b).joinedload(TalentChemistryDB.talent_a)
-        ).all()
-        if not talents_to_update: return False
-
-        decay_rate = 1.0 - self.config.popularity_gain_scalar # Corrected decay
-        for talent in talents_to_update:
-            self._apply_popularity_decay(talent, decay_rate)
-            self._update_fatigue_status(talent, current_date_val)
-            
-            if new_year:
-                self._apply_new_year_updates(talent)
+        # Bulk statements bypass the identity map, so push any pending changes
+        # from earlier in the week (e.g. fatigue set during shooting) first.
+        session.flush()
+        if session.query(TalentDB.id).limit(1).scalar() is None: return False
+
+        self._update_fatigue_status(session, current_date_val)
+
+        if new_year:
+            self._apply_new_year_updates(session)
         
-        return True
\ No newline at end of file
+        return True
+
+    def process_skipped_weeks(self, session: Session, last_date_val: int, new_years: int) -> bool:
+        """Applies the talent updates of several skipped weeks at once.
+        `last_date_val` is the date of the last skipped week and `new_years`
+        the number of year boundaries crossed. Fatigue expiry is a range check
+        and popularity decays on read, so only aging repeats per year.
+        Called from TimeService.fast_forward."""
+        session.flush()
+        if session.query(TalentDB.id).limit(1).scalar() is None: return False
+
+        self._update_fatigue_status(session, last_date_val)
+        for _ in range(new_years):
+            self._apply_new_year_updates(session)
+        return True
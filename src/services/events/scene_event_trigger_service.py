@@ -1,11 +1,11 @@
 import logging
 import random
 from typing import Dict, List, Optional
-from sqlalchemy.orm import selectinload, Session
 
 from data.game_state import Scene, Talent
 from data.data_manager import DataManager
-from database.db_models import TalentDB, ShootingBlocDB
+from database.db_models import TalentDB
+from services.command.shoot_context import ShootContext
 from services.events.event_conditions import (
     PolicyActiveCondition, PolicyInactiveCondition, CastHasGenderCondition,
     SceneHasTagConceptCondition, CastSizeIsCondition,
@@ -39,15 +39,16 @@ class SceneEventTriggerService:
             'not_has_production_tier': NotHasProductionTierCondition(),
         }
 
-    def check_for_shoot_event(self, session: Session, scene: Scene) -> Optional[Dict]:
+    def check_for_shoot_event(self, scene: Scene, context: ShootContext) -> Optional[Dict]:
         """
         Checks if a random interactive event should trigger for a scene being shot.
-        This is the main entry point for event triggering.
+        This is the main entry point for event triggering. The bloc and cast are
+        read from the prefetched shoot context.
         """
         if not scene.bloc_id or not scene.final_cast:
             return None
 
-        bloc_db = session.query(ShootingBlocDB).get(scene.bloc_id)
+        bloc_db = context.get_bloc(scene.bloc_id)
         if not bloc_db:
             return None
 
@@ -65,16 +66,10 @@ class SceneEventTriggerService:
             if concept := tag_def.get('concept'):
                 scene_tag_concepts.add(concept)
         
-        cast_genders_db = session.query(TalentDB.gender).filter(TalentDB.id.in_(cast_talent_ids)).distinct().all()
-        cast_genders = {g[0] for g in cast_genders_db}
+        cast_talents_db = context.get_talents(cast_talent_ids)
+        cast_genders = {t.gender for t in cast_talents_db}
         cast_size = len(cast_talent_ids)
         
-        cast_talents_db = session.query(TalentDB).options(
-            selectinload(TalentDB.popularity_scores),
-            selectinload(TalentDB.chemistry_a),
-            selectinload(TalentDB.chemistry_b)
-        ).filter(TalentDB.id.in_(cast_talent_ids)).all()
-        
         event_to_trigger = None
         triggering_talent_id = None
         triggering_talent = None
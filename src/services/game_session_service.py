@@ -1,13 +1,15 @@
 import logging
-from typing import Optional, Tuple
+from typing import Optional, Tuple, TYPE_CHECKING
 
-from data.game_state import GameState, MarketGroupState
+from data.game_state import GameState
 from data.save_manager import SaveManager, LIVE_SESSION_NAME, QUICKSAVE_NAME, EXITSAVE_NAME
 from core.talent_generator import TalentGenerator
 from data.data_manager import DataManager
-from core.game_signals import GameSignals
-from database.db_models import (GameInfoDB, MarketGroupStateDB, TalentDB,
-GoToListCategoryDB, EmailMessageDB)
+from database.db_models import GameInfoDB, GoToListCategoryDB, EmailMessageDB, POPULARITY_DECAY_RATE_KEY
+from services.builders.world_builder import WorldBuilder
+
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ class GameSessionService:
     Manages the game session lifecycle: new, save, load, quit.
     """
     def __init__(self, save_manager: SaveManager, data_manager: DataManager,
-        signals: GameSignals, talent_generator: TalentGenerator):
+        signals: 'GameSignals', talent_generator: TalentGenerator):
         self.save_manager = save_manager
         self.data_manager = data_manager
         self.signals = signals
@@ -45,22 +47,19 @@ class GameSessionService:
             game_info_data = [
                 GameInfoDB(key='week', value=str(game_state.week)),
                 GameInfoDB(key='year', value=str(game_state.year)),
-                GameInfoDB(key='money', value=str(game_state.money))
+                GameInfoDB(key='money', value=str(game_state.money)),
+                GameInfoDB(key=POPULARITY_DECAY_RATE_KEY, value=str(self._popularity_decay_rate()))
             ]
             session.add_all(game_info_data)
 
-            # Initialize Market Groups
-            all_group_names = [g['name'] for g in self.market_data.get('viewer_groups', [])]
-            for group in self.market_data.get('viewer_groups', []):
-                if name := group.get('name'):
-                    market_state = MarketGroupState(name=name)
-                    session.add(MarketGroupStateDB.from_dataclass(market_state))
-            
-            # Generate initial talent pool
-            initial_talents = self.talent_generator.generate_multiple_talents(150, start_id=1)
-            for talent in initial_talents:
-                for name in all_group_names: talent.popularity[name] = 0.0
-                session.add(TalentDB.from_dataclass(talent))
+            # Initialize Market Groups and the initial talent pool. Talents are streamed
+            # from the generator into batched INSERTs; a talent with no popularity row
+            # in a group has 0 popularity there, so none are written up front.
+            world = WorldBuilder(session)
+            world.add_market_groups(g['name'] for g in self.market_data.get('viewer_groups', []) if g.get('name'))
+            pool_size = self.game_constant.get("initial_talent_pool_size", 150)
+            world.add_talents(self.talent_generator.iter_talents(pool_size, start_id=1),
+                              start_date=game_state.year * 52 + game_state.week)
 
             # Create default Go-To List category
             general_category = GoToListCategoryDB(name="General", is_deletable=False)
@@ -85,6 +84,19 @@ class GameSessionService:
         finally:
             session.close()
 
+    def _popularity_decay_rate(self) -> float:
+        """Weekly popularity retention factor, applied on read by TalentPopularityDB.score."""
+        return 1.0 - self.game_constant.get("popularity_gain_scalar", 0.05)
+
+    def _store_popularity_decay_rate(self):
+        """Writes the configured decay rate into the live session, so saves follow the current config."""
+        session = self.save_manager.db_manager.get_session()
+        try:
+            session.merge(GameInfoDB(key=POPULARITY_DECAY_RATE_KEY, value=str(self._popularity_decay_rate())))
+            session.commit()
+        finally:
+            session.close()
+
     def load_game(self, save_name: str) -> Optional[Tuple[GameState, str]]:
         """
         Loads a game from a save file by copying it to the live session.
@@ -99,6 +111,7 @@ class GameSessionService:
 
             # Step 3: Now that a connection is established, we can safely get the session.
             save_path = self.save_manager.get_current_session_path()
+            self._store_popularity_decay_rate()
             
             return game_state, save_path
         except FileNotFoundError:
@@ -126,6 +139,7 @@ class GameSessionService:
         if session and current_save_path:
             try:
                 session.commit() # Commit any pending changes.
+                self.save_manager.checkpoint_live_session()
                 self.save_manager.copy_save(current_save_path, save_name)
                 self.signals.saves_changed.emit()
             except Exception as e:
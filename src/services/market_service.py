@@ -2,6 +2,7 @@ import logging
 import random
 from collections import defaultdict
 from typing import Dict, List
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -16,17 +17,25 @@ class MarketService:
         self.tag_definitions = tag_definitions
         self.config = config
 
-    def recover_all_market_saturation(self, session: Session) -> bool:
-        market_changed = False
-        market_groups_db = session.query(MarketGroupStateDB).all()
-        for group_db in market_groups_db:
-            if group_db.current_saturation < 1.0:
-                saturation_deficit = 1.0 - group_db.current_saturation
-                recovery_amount = saturation_deficit * self.config.saturation_recovery_rate
-                group_db.current_saturation = min(1.0, group_db.current_saturation + recovery_amount)
-                market_changed = True
-        
-        return market_changed
+    def recover_all_market_saturation(self, session: Session, weeks: int = 1) -> bool:
+        """
+        Recovers every group's saturation by `weeks` weekly steps. Each step
+        closes a fixed share of the deficit, so n steps in one go leave
+        deficit * (1 - rate) ** n.
+
+        Runs as a single UPDATE over the groups below full saturation; the
+        market changed if any row matched. Bypasses the identity map, so
+        pending changes are flushed first.
+        """
+        if weeks <= 0: return False
+        remaining_share = (1.0 - self.config.saturation_recovery_rate) ** weeks
+        session.flush()
+        saturation = MarketGroupStateDB.current_saturation
+        changed_rows = session.query(MarketGroupStateDB).filter(saturation < 1.0).update(
+            {saturation: func.min(1.0, 1.0 - (1.0 - saturation) * remaining_share)},
+            synchronize_session=False
+        )
+        return changed_rows > 0
     
     def get_resolved_group_data(self, group_name: str) -> Dict:
         return self.resolver.get_resolved_group(group_name)
@@ -80,11 +89,15 @@ class MarketService:
         all_new_discoveries = defaultdict(list)
         made_any_discovery = False
 
-        for group_name, interest in viewer_group_interest.items():
-            if interest < discovery_threshold:
-                continue
+        interested_groups = [g for g, interest in viewer_group_interest.items() if interest >= discovery_threshold]
+        if not interested_groups:
+            return {}
+        market_states = {
+            m.name: m for m in session.query(MarketGroupStateDB).filter(MarketGroupStateDB.name.in_(interested_groups))
+        }
 
-            market_state_db = session.query(MarketGroupStateDB).get(group_name)
+        for group_name in interested_groups:
+            market_state_db = market_states.get(group_name)
             if not market_state_db: continue
 
             potential_discoveries = self.get_potential_discoveries(scene, group_name)
@@ -114,8 +127,18 @@ class MarketService:
         session: Session,
         market_saturation_updates: Dict[str, float]
     ):
-        """Updates market saturation based on release results. Operates within the caller's transaction."""
-        for group_name, cost in market_saturation_updates.items():
-            market_state_db = session.query(MarketGroupStateDB).get(group_name)
-            if market_state_db:
-                market_state_db.current_saturation = max(0, market_state_db.current_saturation - cost)
\ No newline at end of file
+        """
+        Updates market saturation based on release results. Operates within the caller's transaction.
+        All groups are written by one UPDATE that looks up each group's cost
+        with a CASE on its name; groups that do not exist are ignored.
+        """
+        if not market_saturation_updates: return
+        session.flush()
+        saturation = MarketGroupStateDB.current_saturation
+        cost = case(market_saturation_updates, value=MarketGroupStateDB.name, else_=0.0)
+        session.query(MarketGroupStateDB).filter(
+            MarketGroupStateDB.name.in_(list(market_saturation_updates))
+        ).update(
+            {saturation: func.max(0.0, saturation - cost)},
+            synchronize_session=False
+        )
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Compact, read-only rows for the UI's list views.
+
+A list only shows a few columns of each item, so these rows hold just those
+columns (and whatever is needed to compute what is shown, like the fuzzed
+skill ranges), selected straight from SQL. They use __slots__ and carry no
+ORM state; the full object is loaded by id when one item is opened.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True, slots=True)
+class TalentListRow:
+    """One row of the talent list: the displayed columns and the talent's total current popularity."""
+    id: int
+    alias: str
+    age: int
+    gender: str
+    ethnicity: str
+    orientation_score: int
+    dick_size: Optional[int]
+    boob_cup: Optional[str]
+    performance: float
+    acting: float
+    stamina: float
+    dom_skill: float
+    sub_skill: float
+    experience: float
+    popularity: float
+
+@dataclass(frozen=True, slots=True)
+class SceneListRow:
+    """One row of the scenes tab: the displayed columns and the aliases of the scene's cast, in casting order."""
+    id: int
+    title: str
+    status: str
+    scheduled_week: int
+    scheduled_year: int
+    revenue: int
+    weeks_remaining: int
+    role_count: int
+    cast_count: int
+    # Comma-separated, with "ID <n>?" for talent no longer in the database; None when uncast.
+    cast_aliases: Optional[str]
+
+    @property
+    def display_status(self) -> str:
+        status_text = self.status.replace('_', ' ').title()
+        if self.status == 'in_editing':
+            return f"{status_text} ({self.weeks_remaining}w left)"
+        if self.status == 'casting':
+            return f"Casting ({self.cast_count}/{self.role_count})"
+        return status_text
@@ -81,4 +81,22 @@ class WeekAdvancementResult:
     scenes_shot: int = 0
     scenes_edited: int = 0
     market_changed: bool = False
+    talent_pool_changed: bool = False
+
+class FastForwardStop(Enum):
+    """Why a fast-forward stopped where it did."""
+    SCHEDULED_SCENE = auto()  # A scene is scheduled for the new current week
+    EDITING_COMPLETE = auto() # Advancing from the new current week finishes an edit
+    WEEK_LIMIT = auto()       # The requested number of weeks was skipped
+
+@dataclass(frozen=True)
+class FastForwardResult:
+    """Represents the outcome of skipping several quiet weeks at once."""
+    new_week: int
+    new_year: int
+    new_money: int
+    weeks_advanced: int
+    stop_reason: FastForwardStop
+    scenes_in_editing: int = 0
+    market_changed: bool = False
     talent_pool_changed: bool = False
\ No newline at end of file
@@ -1,11 +1,13 @@
 import json
 import logging
-from typing import List
+from typing import List, TYPE_CHECKING
 from sqlalchemy.orm import Session
 
-from core.game_signals import GameSignals
 from database.db_models import GameInfoDB
 
+if TYPE_CHECKING:
+    from core.game_signals import GameSignals
+
 logger = logging.getLogger(__name__)
 
 class PlayerSettingsService:
@@ -13,7 +15,7 @@ class PlayerSettingsService:
     Manages player-specific settings that are persisted in the database,
     such as favorite tags.
     """
-    def __init__(self, session_factory, signals: GameSignals):
+    def __init__(self, session_factory, signals: 'GameSignals'):
         self.session_factory = session_factory
         self.signals = signals
         self._cache = {}
@@ -1,36 +1,84 @@
 from typing import List, Dict, Optional
 
 from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import or_
+from sqlalchemy import or_, func, select, literal
 
 from data.game_state import Talent, Scene, ShootingBloc, MarketGroupState, EmailMessage
 from database.db_models import (TalentDB, TalentChemistryDB, SceneDB, ShootingBlocDB, 
-                                SceneCastDB, ActionSegmentDB, GoToListAssignmentDB,
-                                GoToListCategoryDB, MarketGroupStateDB, EmailMessageDB )
+                                SceneCastDB, ActionSegmentDB, GoToListAssignmentDB, VirtualPerformerDB,
+                                GoToListCategoryDB, MarketGroupStateDB, EmailMessageDB,
+                                TalentPopularityDB, current_date_value )
+from database.talent_search import alias_index_exists, alias_matches, search_alias_ids
+from services.calculation.talent_availability_checker import TalentAvailabilityChecker
+from services.models.list_rows import TalentListRow, SceneListRow
+from services.query.query_cache import QueryCache
+
+# The tables each cached result is read from. Talent popularity decays with the clock in game_info.
+TALENT_TABLES = ('talents', 'talent_popularity', 'talent_chemistry', 'talent_tag_preferences',
+                 'talent_hard_limits', 'talent_tag_affinities', 'talent_concurrency_limits',
+                 'talent_policy_requirements', 'game_info')
+SCENE_TABLES = ('scenes', 'scene_cast', 'scene_performer_contributions', 'virtual_performers',
+                'action_segments', 'slot_assignments')
+GO_TO_LIST_TABLES = ('go_to_list_categories', 'go_to_list_assignments')
+SCENE_LIST_TABLES = ('scenes', 'scene_cast', 'virtual_performers', 'talents')
+
+# The columns of a TalentListRow, in field order, before the popularity total.
+TALENT_LIST_COLUMNS = (TalentDB.id, TalentDB.alias, TalentDB.age, TalentDB.gender, TalentDB.ethnicity,
+                       TalentDB.orientation_score, TalentDB.dick_size, TalentDB.boob_cup, TalentDB.performance,
+                       TalentDB.acting, TalentDB.stamina, TalentDB.dom_skill, TalentDB.sub_skill, TalentDB.experience)
+
+def talent_popularity_total():
+    """The talent's current popularity summed over all market groups, as a correlated subquery."""
+    return (select(func.coalesce(func.sum(TalentPopularityDB.score), 0.0))
+            .where(TalentPopularityDB.talent_id == TalentDB.id)
+            .scalar_subquery())
 
 class GameQueryService:
     """
     A unified, read-only service for fetching game data for the UI.
+
+    With a `cache`, the results the UI asks for on every refresh (single
+    talents, blocs and scenes, market states, emails...) are served from it
+    until a commit touches one of the tables they were read from.
     """
 
-    def __init__(self, session_factory):
+    def __init__(self, session_factory, cache: Optional[QueryCache] = None):
         self.session_factory = session_factory
+        self.cache = cache
+        self._alias_index: Optional[bool] = None
+
+    def _cached(self, kind: str, key, tables, loader):
+        if self.cache is None:
+            return loader()
+        return self.cache.get(kind, key, tables, loader)
+
+    def _has_alias_index(self, session) -> bool:
+        # Saves migrated on a SQLite build without FTS5 trigram support have no index.
+        if self._alias_index is None:
+            self._alias_index = alias_index_exists(session)
+        return self._alias_index
 
     # --- Talent Query Methods ---
 
-    def get_filtered_talents(self, all_filters: dict) -> List[TalentDB]:
-        """Fetches a list of TalentDB objects based on UI filters."""
+    def search_talent_ids(self, text: str, limit: Optional[int] = None) -> List[int]:
+        """Ids of the talents whose alias contains `text` (case-insensitive), best match first."""
+        if not text:
+            return []
         with self.session_factory() as session:
-            # Only load popularity_scores, skip unused chemistry relationships
-            query = session.query(TalentDB).options(
-                selectinload(TalentDB.popularity_scores),
-                selectinload(TalentDB.chemistry_a),
-                selectinload(TalentDB.chemistry_b)
-            )
+            return search_alias_ids(session, text, limit, indexed=self._has_alias_index(session))
+
+    def get_filtered_talents(self, all_filters: dict) -> List[TalentListRow]:
+        """
+        Fetches the talent list rows matching the UI filters, ordered by alias.
+        Only the listed columns are read, with popularity summed in SQL; use
+        get_talent_by_id for a full talent.
+        """
+        with self.session_factory() as session:
+            query = session.query(*TALENT_LIST_COLUMNS, talent_popularity_total())
             
             # Support both 'name' and 'text' keys for name filtering
             if name_filter := (all_filters.get('name') or all_filters.get('text')):
-                query = query.filter(TalentDB.alias.ilike(f"%{name_filter}%"))
+                query = query.filter(alias_matches(name_filter, indexed=self._has_alias_index(session)))
             
             if gender_filter := all_filters.get('gender'):
                 if gender_filter != 'Any':
@@ -67,6 +115,9 @@ class GameQueryService:
                 if dick_max < 20:  # Only filter if not the maximum value
                     query = query.filter(TalentDB.dick_size <= dick_max)
             
+            if all_filters.get('hide_fatigued'):
+                query = query.filter(TalentAvailabilityChecker.rested_by(current_date_value()))
+
             # Go-To List filtering
             if all_filters.get('go_to_list_only'):
                 query = query.join(GoToListAssignmentDB)
@@ -75,7 +126,7 @@ class GameQueryService:
                     query = query.filter(GoToListAssignmentDB.category_id == category_id)
                 query = query.distinct()
 
-            return query.order_by(TalentDB.alias).all()
+            return [TalentListRow(*row) for row in query.order_by(TalentDB.alias)]
 
     def get_talent_by_id(self, talent_id: int) -> Optional[Talent]:
         """
@@ -83,6 +134,9 @@ class GameQueryService:
         """
         if talent_id is None:
             return None
+        return self._cached('talent', talent_id, TALENT_TABLES, lambda: self._load_talent(talent_id))
+
+    def _load_talent(self, talent_id: int) -> Optional[Talent]:
         with self.session_factory() as session:
             t = session.query(TalentDB).options(
                 selectinload(TalentDB.popularity_scores),
@@ -95,6 +149,10 @@ class GameQueryService:
 
     def get_talent_chemistry(self, talent_id: int) -> Dict[int, Dict]:
         """Fetches all chemistry relationships for a given talent."""
+        return self._cached('talent_chemistry', talent_id, ('talents', 'talent_chemistry'),
+                            lambda: self._load_talent_chemistry(talent_id))
+
+    def _load_talent_chemistry(self, talent_id: int) -> Dict[int, Dict]:
         with self.session_factory() as session:
             chemistry_relations_db = session.query(TalentChemistryDB).options(
                 joinedload(TalentChemistryDB.talent_a),
@@ -125,6 +183,9 @@ class GameQueryService:
 
     def get_all_categories(self) -> List[Dict]:
         """Returns a list of all Go-To List categories for UI display."""
+        return self._cached('go_to_categories', None, GO_TO_LIST_TABLES, self._load_all_categories)
+
+    def _load_all_categories(self) -> List[Dict]:
         with self.session_factory() as session:
             categories_db = session.query(GoToListCategoryDB).order_by(GoToListCategoryDB.name).all()
             return [{'id': c.id, 'name': c.name, 'is_deletable': c.is_deletable} for c in categories_db]
@@ -144,6 +205,10 @@ class GameQueryService:
     
     def get_talent_categories(self, talent_id: int) -> List[Dict]:
         """Returns a list of all Go-To List categories a specific talent belongs to."""
+        return self._cached('talent_categories', talent_id, GO_TO_LIST_TABLES,
+                            lambda: self._load_talent_categories(talent_id))
+
+    def _load_talent_categories(self, talent_id: int) -> List[Dict]:
         with self.session_factory() as session:
             assignments = session.query(GoToListCategoryDB).\
                 join(GoToListAssignmentDB).\
@@ -167,22 +232,51 @@ class GameQueryService:
 
     def get_bloc_by_id(self, bloc_id: int) -> Optional[ShootingBloc]:
         """Fetches a single shooting bloc by its ID, without its scenes."""
+        return self._cached('bloc', bloc_id, ('shooting_blocs',), lambda: self._load_bloc(bloc_id))
+
+    def _load_bloc(self, bloc_id: int) -> Optional[ShootingBloc]:
         with self.session_factory() as session:
             bloc_db = session.query(ShootingBlocDB).get(bloc_id)
             return bloc_db.to_dataclass(ShootingBloc) if bloc_db else None
 
-    def get_shot_scenes(self) -> List[Scene]:
-        """Fetches all scenes that have been shot or released for the scenes tab."""
+    def get_shot_scenes(self) -> List[SceneListRow]:
+        """
+        Fetches the list rows of all scenes that have been shot or released for
+        the scenes tab, with their cast's aliases joined, from one query; use
+        get_scene_for_planner for a full scene.
+        """
+        return self._cached('shot_scenes', None, SCENE_LIST_TABLES, self._load_shot_scenes)
+
+    def _load_shot_scenes(self) -> List[SceneListRow]:
         with self.session_factory() as session:
-            scenes_db = session.query(SceneDB).populate_existing().options(
-                selectinload(SceneDB.performer_contributions_rel)
-            ).filter(
+            # group_concat keeps the order of its input: the cast in casting order.
+            cast_labels = select(
+                SceneCastDB.scene_id,
+                func.coalesce(TalentDB.alias, literal("ID ").concat(SceneCastDB.talent_id).concat("?")).label('label')
+            ).outerjoin(TalentDB, TalentDB.id == SceneCastDB.talent_id)\
+                .order_by(SceneCastDB.scene_id, SceneCastDB.id).subquery()
+            cast_summary = select(
+                cast_labels.c.scene_id,
+                func.count().label('cast_count'),
+                func.group_concat(cast_labels.c.label, ", ").label('cast_aliases')
+            ).group_by(cast_labels.c.scene_id).subquery()
+            role_count = select(func.count(VirtualPerformerDB.id))\
+                .where(VirtualPerformerDB.scene_id == SceneDB.id).scalar_subquery()
+
+            query = session.query(
+                SceneDB.id, SceneDB.title, SceneDB.status, SceneDB.scheduled_week, SceneDB.scheduled_year,
+                SceneDB.revenue, SceneDB.weeks_remaining, role_count,
+                func.coalesce(cast_summary.c.cast_count, 0), cast_summary.c.cast_aliases
+            ).outerjoin(cast_summary, cast_summary.c.scene_id == SceneDB.id).filter(
                 SceneDB.status.in_(['shot', 'in_editing', 'ready_to_release', 'released'])
-            ).all()
-            return [s.to_dataclass(Scene) for s in scenes_db]
+            ).order_by(SceneDB.id)
+            return [SceneListRow(*columns) for columns in query]
 
     def get_scene_for_planner(self, scene_id: int) -> Optional[Scene]:
         """Fetches a single scene with all its relationships for the SceneDialog."""
+        return self._cached('scene', scene_id, SCENE_TABLES, lambda: self._load_scene_for_planner(scene_id))
+
+    def _load_scene_for_planner(self, scene_id: int) -> Optional[Scene]:
         with self.session_factory() as session:
             scene_db = session.query(SceneDB).options(
                 selectinload(SceneDB.virtual_performers),
@@ -252,6 +346,9 @@ class GameQueryService:
 
     def get_all_market_states(self) -> Dict[str, MarketGroupState]:
         """Fetches all market group dynamic states from the database."""
+        return self._cached('market_states', None, ('market_state',), self._load_all_market_states)
+
+    def _load_all_market_states(self) -> Dict[str, MarketGroupState]:
         with self.session_factory() as session:
             results = session.query(MarketGroupStateDB).all()
             return {r.name: r.to_dataclass(MarketGroupState) for r in results}
@@ -260,6 +357,9 @@ class GameQueryService:
 
     def get_all_emails(self) -> List[EmailMessage]:
         """Fetches all emails, sorted by most recent."""
+        return self._cached('emails', None, ('emails',), self._load_all_emails)
+
+    def _load_all_emails(self) -> List[EmailMessage]:
         with self.session_factory() as session:
             emails_db = session.query(EmailMessageDB).order_by(
                 EmailMessageDB.year.desc(), 
@@ -270,5 +370,8 @@ class GameQueryService:
 
     def get_unread_email_count(self) -> int:
         """Returns the count of unread emails."""
+        return self._cached('unread_emails', None, ('emails',), self._count_unread_emails)
+
+    def _count_unread_emails(self) -> int:
         with self.session_factory() as session:
             return session.query(EmailMessageDB).filter_by(is_read=False).count()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Sequence, Tuple
+
+from database.table_versions import TableVersions
+
+logger = logging.getLogger(__name__)
+
+# Roughly the number of dataclass rows (talents, scenes, emails...) kept in memory.
+DEFAULT_MAX_ROWS = 20000
+
+class QueryCache:
+    """
+    A read-through LRU cache of query results, keyed by (kind, key) and
+    checked against the TableVersions of the tables each result was read from.
+
+    get() returns the cached value if none of its tables has been committed
+    to since it was loaded, and otherwise calls `loader` and keeps what it
+    returns. Entries are weighed by their row count (a list counts each
+    item, anything else one) and the least recently used are evicted once
+    the total passes `max_rows`. Callers get deep copies, so mutating a
+    result cannot corrupt the cache.
+    """
+    def __init__(self, versions: TableVersions, max_rows: int = DEFAULT_MAX_ROWS):
+        self.versions = versions
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._rows = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Tuple[int, ...], Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key: Hashable, tables: Sequence[str], loader: Callable[[], Any]) -> Any:
+        cache_key = (kind, key)
+        # Stamped before loading: a commit during the load leaves the entry stale, never wrong.
+        stamp = self.versions.stamp(tables)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+
+        value = loader()
+        weight = len(value) if isinstance(value, (list, dict)) else 1
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._rows -= old[2]
+            if weight <= self.max_rows:
+                self._entries[cache_key] = (stamp, value, weight)
+                self._rows += weight
+                self._evict()
+        return copy.deepcopy(value)
+
+    def _evict(self):
+        while self._rows > self.max_rows:
+            _, (_, _, weight) = self._entries.popitem(last=False)
+            self._rows -= weight
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts, and the entries and rows currently held."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'rows': self._rows}
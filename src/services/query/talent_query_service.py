@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import selectinload
 
 from data.game_state import Scene
@@ -8,10 +8,11 @@ from database.db_models import (
     TalentDB, SceneDB, ActionSegmentDB,
     ShootingBlocDB
 )
-from services.query.game_query_service import GameQueryService
+from services.query.game_query_service import GameQueryService, TALENT_LIST_COLUMNS, talent_popularity_total
 from services.calculation.talent_demand_calculator import TalentDemandCalculator
 from services.models.configs import HiringConfig
-from services.calculation.talent_availability_checker import TalentAvailabilityChecker
+from services.models.list_rows import TalentListRow
+from services.calculation.talent_availability_checker import TalentAvailabilityChecker, RoleContext, RefusalCode
 
 logger = logging.getLogger(__name__)
 
@@ -25,73 +26,112 @@ class TalentQueryService:
         self.config = config
         self.availability_checker = availability_checker
 
-    def _get_role_tags_for_display(self, scene: Scene, vp_id: int) -> List[str]:
+    def _get_role_tags_for_display(self, scene: Scene, vp_id: int,
+                                   roles_by_tag: Optional[Dict[str, Set[str]]] = None) -> List[str]:
         """Helper to get a formatted list of tags and roles for UI display."""
-        _, roles_by_tag = self.availability_checker.get_vp_role_context(scene, vp_id)
+        if roles_by_tag is None:
+            _, roles_by_tag = self.availability_checker.get_vp_role_context(scene, vp_id)
         tags_with_roles = [
             f"{tag_name} ({', '.join(sorted(list(roles)))})" 
             for tag_name, roles in sorted(roles_by_tag.items())
         ]
         return tags_with_roles
 
-    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentDB]:
+    def _role_candidates(self, session, scene_id: int, vp_id: int) -> Optional[Tuple[RoleContext, List]]:
         """
-        Gets a virtual performer from a scene and returns a list of talent that can be cast for the role.
+        The RoleContext of a virtual performer and the SQL filters for its
+        candidates: talent of its gender and ethnicity not already in the
+        scene. None if the scene or performer does not exist.
+        """
+        scene_db = session.get(SceneDB, scene_id, options=[
+            selectinload(SceneDB.virtual_performers),
+            selectinload(SceneDB.cast),
+            selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments)
+        ])
+        if not scene_db: return None
+        scene = scene_db.to_dataclass(Scene)
+
+        vp = next((v for v in scene.virtual_performers if v.id == vp_id), None)
+        if not vp: return None
+
+        bloc_db = session.get(ShootingBlocDB, scene_db.bloc_id) if scene_db.bloc_id else None
+        context = self.availability_checker.role_context(scene, vp.id, bloc_db)
+
+        filters = [TalentDB.gender == vp.gender]
+        if vp.ethnicity != "Any":
+            filters.append(TalentDB.ethnicity == vp.ethnicity)
+        if cast_talent_ids := {c.talent_id for c in scene_db.cast}:
+            filters.append(TalentDB.id.notin_(cast_talent_ids))
+        return context, filters
+
+    def get_eligible_talent_for_role(self, scene_id: int, vp_id: int) -> List[TalentListRow]:
+        """
+        Gets a virtual performer from a scene and returns the talent that can be
+        cast for the role, as talent list rows ordered by alias.
+
+        The role is analysed once; every check but the random low-tier
+        refusal is then settled for all candidates by one SQL query, and
+        only the candidates it returns are rolled for that.
         """
         session = self.session_factory()
         try:
-            scene_db = session.query(SceneDB).options(
-                selectinload(SceneDB.virtual_performers),
-                selectinload(SceneDB.cast),
-                selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments)
-            ).get(scene_id)
-            if not scene_db: return []
-            scene = scene_db.to_dataclass(Scene)
-
-            vp = next((v for v in scene.virtual_performers if v.id == vp_id), None)
-            if not vp: return []
-
-            bloc_db = session.query(ShootingBlocDB).get(scene_db.bloc_id) if scene_db.bloc_id else None
-            
-            query = session.query(TalentDB).options(
-                selectinload(TalentDB.popularity_scores),
-                selectinload(TalentDB.chemistry_a),
-                selectinload(TalentDB.chemistry_b)
-            )
-            query = query.filter(TalentDB.gender == vp.gender)
-            if vp.ethnicity != "Any":
-                query = query.filter(TalentDB.ethnicity == vp.ethnicity)
-            if cast_talent_ids := {c.talent_id for c in scene_db.cast}:
-                query = query.filter(TalentDB.id.notin_(cast_talent_ids))
-
-            potential_candidates_db = query.all()
-            eligible_talents_db = []
-
-            for talent_db in potential_candidates_db:
-                result = self.availability_checker.check(talent_db, scene, vp.id, bloc_db)
-                if result.is_available:
-                    eligible_talents_db.append(talent_db)
-                
-            return sorted(eligible_talents_db, key=lambda t: t.alias)
+            if not (candidates := self._role_candidates(session, scene_id, vp_id)): return []
+            context, filters = candidates
+            query = session.query(*TALENT_LIST_COLUMNS, talent_popularity_total(), TalentDB.ambition).filter(
+                *filters, *(~condition for _, condition in self.availability_checker.refusal_conditions(context))
+            ).order_by(TalentDB.alias)
+
+            eligible = []
+            for *columns, ambition in query:
+                row = TalentListRow(*columns)
+                if not self.availability_checker.pickiness_refusal(context, row.popularity, ambition):
+                    eligible.append(row)
+            return eligible
         except Exception as e:
             logger.error(f"Error getting eligible talent for role {vp_id} in scene {scene_id}: {e}", exc_info=True)
             return []
         finally:
             session.close()
 
+    def get_role_refusals(self, scene_id: int, vp_id: int) -> Dict[int, RefusalCode]:
+        """
+        The RefusalCode of every candidate for a role (talent of the right
+        gender and ethnicity not already in the scene), from one SQL query.
+        Low-tier refusals are random and rolled per casting, so they are not
+        reported here.
+        """
+        session = self.session_factory()
+        try:
+            if not (candidates := self._role_candidates(session, scene_id, vp_id)): return {}
+            context, filters = candidates
+            code = self.availability_checker.refusal_code(context)
+            return {talent_id: RefusalCode(value)
+                    for talent_id, value in session.query(TalentDB.id, code).filter(*filters)}
+        except Exception as e:
+            logger.error(f"Error getting refusals for role {vp_id} in scene {scene_id}: {e}", exc_info=True)
+            return {}
+        finally:
+            session.close()
+
     def find_available_roles_for_talent(self, talent_id: int) -> List[Dict]:
         """
         Finds all uncast roles that a talent is eligible for, calculating hiring cost and availability.
+
+        The talent is loaded once and every casting scene (with its bloc) is
+        fetched and expanded once, so the number of queries does not grow
+        with the number of roles.
         """
         session = self.session_factory()
         try:
             talent = self.query_service.get_talent_by_id(talent_id)
             if not talent: return []
+            tag_definitions = self.data_manager.tag_definitions
 
             available_roles = []
             scenes_in_casting = session.query(SceneDB)\
                 .options(selectinload(SceneDB.virtual_performers), selectinload(SceneDB.cast),
-                        selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments))\
+                        selectinload(SceneDB.action_segments).selectinload(ActionSegmentDB.slot_assignments),
+                        selectinload(SceneDB.performer_contributions_rel))\
                 .filter(SceneDB.status == 'casting').all()
             
             bloc_ids = {s.bloc_id for s in scenes_in_casting if s.bloc_id}
@@ -105,23 +145,25 @@ class TalentQueryService:
                 cast_talent_ids = {c.talent_id for c in scene_db.cast}
                 if talent.id in cast_talent_ids: continue
 
-                all_vp_ids = {vp.id for vp in scene_db.virtual_performers}
                 cast_vp_ids = {c.virtual_performer_id for c in scene_db.cast}
-                uncast_vp_ids = all_vp_ids - cast_vp_ids
-                
-                for vp_db in scene_db.virtual_performers:
-                    if vp_db.id not in uncast_vp_ids: continue
-                    if not (vp_db.gender == talent.gender and (vp_db.ethnicity == "Any" or vp_db.ethnicity == talent.ethnicity)): continue
-                    
-                    bloc_db = blocs_by_id.get(scene.bloc_id)
-                    result = self.availability_checker.check(talent, scene, vp_db.id, bloc_db)
-
-                    cost = self.demand_calculator.calculate_talent_demand(talent_id, scene_db.id, vp_db.id, scene=scene)
+                open_vps = [
+                    vp_db for vp_db in scene_db.virtual_performers
+                    if vp_db.id not in cast_vp_ids and vp_db.gender == talent.gender
+                    and (vp_db.ethnicity == "Any" or vp_db.ethnicity == talent.ethnicity)
+                ]
+                if not open_vps: continue
+
+                segments = scene.get_expanded_action_segments(tag_definitions)
+                bloc_db = blocs_by_id.get(scene.bloc_id)
+                for vp_db in open_vps:
+                    context = self.availability_checker.role_context(scene, vp_db.id, bloc_db, segments)
+                    result = self.availability_checker.check(talent, scene, vp_db.id, bloc_db, context)
+                    cost = self.demand_calculator.calculate_demand(talent, scene, vp_db.id, segments, context.roles_by_tag)
 
                     role_info = {
                         'scene_id': scene_db.id, 'scene_title': scene_db.title, 'virtual_performer_id': vp_db.id,
                         'vp_name': vp_db.name, 'cost': cost,
-                        'tags': self._get_role_tags_for_display(scene, vp_db.id),
+                        'tags': self._get_role_tags_for_display(scene, vp_db.id, context.roles_by_tag),
                         'is_available': result.is_available, 'refusal_reason': result.reason
                     }
                     
@@ -1,15 +1,23 @@
 import logging
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 from sqlalchemy.orm import selectinload, Session
 
 from database.db_models import GameInfoDB, SceneDB, TalentDB, Talent
 from services.command.scene_command_service import SceneCommandService
+from services.command.shoot_context import ShootContext
 from services.command.talent_command_service import TalentCommandService
 from services.market_service import MarketService
-from services.models.results import WeekAdvancementResult
+from services.models.results import WeekAdvancementResult, FastForwardResult, FastForwardStop
 
 logger = logging.getLogger(__name__)
 
+# Names of the phases reported through the `on_phase` hook of advance_week, in order.
+PHASE_MARKET = "market"
+PHASE_SHOOTING = "shooting"
+PHASE_POST_PRODUCTION = "post_production"
+PHASE_TALENTS = "talents"
+WEEK_PHASES = (PHASE_MARKET, PHASE_SHOOTING, PHASE_POST_PRODUCTION, PHASE_TALENTS)
+
 class TimeService:
     def __init__(self, session_factory, signals, scene_command_service: SceneCommandService, 
                  talent_command_service: TalentCommandService, market_service: MarketService):
@@ -25,8 +33,13 @@ class TimeService:
         year_info = session.query(GameInfoDB).filter_by(key='year').one()
         return int(week_info.value), int(year_info.value)
 
-    def advance_week(self) -> WeekAdvancementResult:
-        """Orchestrates all weekly game state changes within a single transaction."""
+    def advance_week(self, on_phase: Optional[Callable[[str], None]] = None) -> WeekAdvancementResult:
+        """Orchestrates all weekly game state changes within a single transaction.
+
+        If given, `on_phase` is called with the name of each phase (see WEEK_PHASES)
+        as it starts, so callers can report progress or time the individual steps.
+        """
+        notify_phase = on_phase or (lambda phase: None)
         session = self.session_factory()
         try:
             current_week, current_year = self._get_current_time(session)
@@ -34,18 +47,17 @@ class TimeService:
             money_info = session.query(GameInfoDB).filter_by(key='money').one()
         
             # --- 1. Perform all weekly updates ---
+            notify_phase(PHASE_MARKET)
             market_changed = self.market_service.recover_all_market_saturation(session)
             
             # Shoot scheduled scenes
-            scenes_to_shoot = session.query(SceneDB).filter_by(
-                status='scheduled',
-                scheduled_week=current_week,
-                scheduled_year=current_year
-            ).all()
+            notify_phase(PHASE_SHOOTING)
+            # Everything the shoot needs is loaded once for the whole week
+            shoot_context = ShootContext.for_week(session, current_week, current_year)
             
             scenes_shot_count = 0
-            for scene_db in scenes_to_shoot:
-                event_occurred = self.scene_command_service.shoot_scene(session, scene_db)
+            for scene_db in shoot_context.scenes:
+                event_occurred = self.scene_command_service.shoot_scene(session, scene_db, shoot_context)
                 scenes_shot_count += 1
                 if event_occurred:
                     # An event paused execution. Commit what we have and stop.
@@ -58,6 +70,7 @@ class TimeService:
                     )
 
             # Update post-production and advance time
+            notify_phase(PHASE_POST_PRODUCTION)
             edited_scenes = self.scene_command_service.process_weekly_post_production(session)
 
             next_week, next_year = (current_week + 1, current_year)
@@ -67,6 +80,7 @@ class TimeService:
                     next_year += 1
                     is_new_year = True
 
+            notify_phase(PHASE_TALENTS)
             talent_pool_changed = self.talent_command_service.process_weekly_updates(session, current_date_val, is_new_year)
 
             # --- 2. Persist the new time ---
@@ -90,4 +104,62 @@ class TimeService:
             # Return current state on failure
             return WeekAdvancementResult(new_week=current_week, new_year=current_year, new_money=int(float(money_info.value)), was_paused=True)
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    def fast_forward(self, max_weeks: int) -> Optional[FastForwardResult]:
+        """Skips up to `max_weeks` quiet weeks in a single transaction.
+
+        Stops early at the first week in which something would happen: a scene
+        scheduled to shoot, or an edit that finishes when advancing from it. That
+        week is left for advance_week to run normally. The skipped weeks are
+        applied in closed form: market recovery over n weeks at once, editing
+        counted down by n, one fatigue expiry pass for the whole range, and the
+        new-year aging once per year boundary crossed. Popularity decays on read,
+        so it needs no work at all. Returns None if the transaction failed.
+        """
+        session = self.session_factory()
+        try:
+            current_week, current_year = self._get_current_time(session)
+            current_date_val = current_year * 52 + current_week
+            money = int(float(session.query(GameInfoDB).filter_by(key='money').one().value))
+
+            weeks_to_shoot, weeks_to_edit = self.scene_command_service.weeks_until_next_production_event(
+                session, current_date_val
+            )
+            weeks, stop_reason = max(0, max_weeks), FastForwardStop.WEEK_LIMIT
+            if weeks_to_edit is not None and weeks_to_edit <= weeks:
+                weeks, stop_reason = weeks_to_edit, FastForwardStop.EDITING_COMPLETE
+            if weeks_to_shoot is not None and weeks_to_shoot <= weeks:
+                weeks, stop_reason = weeks_to_shoot, FastForwardStop.SCHEDULED_SCENE
+
+            if weeks == 0:
+                return FastForwardResult(
+                    new_week=current_week, new_year=current_year, new_money=money,
+                    weeks_advanced=0, stop_reason=stop_reason
+                )
+
+            market_changed = self.market_service.recover_all_market_saturation(session, weeks)
+            scenes_in_editing = self.scene_command_service.skip_post_production_weeks(session, weeks)
+
+            new_date_val = current_date_val + weeks
+            next_week, next_year = (new_date_val - 1) % 52 + 1, (new_date_val - 1) // 52
+            # The talent updates of the last skipped week run with that week's date.
+            talent_pool_changed = self.talent_command_service.process_skipped_weeks(
+                session, new_date_val - 1, next_year - current_year
+            )
+
+            session.query(GameInfoDB).filter_by(key='week').one().value = str(next_week)
+            session.query(GameInfoDB).filter_by(key='year').one().value = str(next_year)
+
+            session.commit()
+            return FastForwardResult(
+                new_week=next_week, new_year=next_year, new_money=money,
+                weeks_advanced=weeks, stop_reason=stop_reason, scenes_in_editing=scenes_in_editing,
+                market_changed=market_changed, talent_pool_changed=talent_pool_changed
+            )
+        except Exception as e:
+            logger.error(f"Error during fast-forward: {e}", exc_info=True)
+            session.rollback()
+            return None
+        finally:
+            session.close()
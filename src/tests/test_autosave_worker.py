@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from data.autosave_worker import AutosaveWorker, AUTOSAVE_MANIFEST_NAME
+
+@pytest.fixture
+def live_db(tmp_path):
+    """A small live session database with a single counter row."""
+    path = tmp_path / "session.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE game_info (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO game_info VALUES ('week', '1')")
+    conn.commit()
+    yield path, conn
+    conn.close()
+
+def _set_week(conn, week: int):
+    conn.execute("UPDATE game_info SET value = ? WHERE key = 'week'", (str(week),))
+    conn.commit()
+
+def _read_week(path) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT value FROM game_info WHERE key = 'week'").fetchone()[0]
+    finally:
+        conn.close()
+
+def _manifest(save_dir):
+    with open(save_dir / AUTOSAVE_MANIFEST_NAME, encoding='utf-8') as f:
+        return json.load(f)['slots']
+
+def test_snapshot_copies_committed_state(tmp_path, live_db):
+    path, conn = live_db
+    worker = AutosaveWorker(tmp_path, "autosave", 4, pages_per_step=1)
+
+    worker.submit(str(path))
+    assert worker.wait(timeout=5)
+
+    assert _read_week(tmp_path / "autosave_0.sqlite") == '1'
+    assert _manifest(tmp_path) == ["autosave_0"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_ring_reuses_oldest_slot(tmp_path, live_db):
+    path, conn = live_db
+    worker = AutosaveWorker(tmp_path, "autosave", 3)
+
+    for week in range(1, 6):
+        _set_week(conn, week)
+        worker.submit(str(path))
+        assert worker.wait(timeout=5)
+
+    slots = _manifest(tmp_path)
+    assert len(slots) == 3
+    # Newest first: weeks 5, 4, 3 survive and week 5 overwrote the oldest slot.
+    assert [_read_week(tmp_path / f"{s}.sqlite") for s in slots] == ['5', '4', '3']
+    assert sorted(p.stem for p in tmp_path.glob("autosave_*.sqlite")) == ["autosave_0", "autosave_1", "autosave_2"]
+
+def test_missing_manifest_falls_back_to_mtime_order(tmp_path, live_db):
+    path, conn = live_db
+    for i, name in enumerate(["autosave_1", "autosave_0"]):
+        (tmp_path / f"{name}.sqlite").write_bytes(b"")
+        os.utime(tmp_path / f"{name}.sqlite", (time.time() - 100 + i, time.time() - 100 + i))
+    worker = AutosaveWorker(tmp_path, "autosave", 2)
+
+    worker.submit(str(path))
+    assert worker.wait(timeout=5)
+
+    # autosave_1 was the older file, so it is the one that gets replaced.
+    assert _manifest(tmp_path) == ["autosave_1", "autosave_0"]
+    assert _read_week(tmp_path / "autosave_1.sqlite") == '1'
+
+def test_missing_source_is_skipped(tmp_path):
+    worker = AutosaveWorker(tmp_path, "autosave", 2)
+    worker.submit(str(tmp_path / "gone.sqlite"))
+    assert worker.wait(timeout=5)
+    assert not list(tmp_path.glob("autosave_*"))
@@ -0,0 +1,105 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.headless_signals import HeadlessSignals
+from database.db_models import Base, GameInfoDB, MarketGroupStateDB, TalentDB, SceneDB
+from services.calculation.talent_affinity_calculator import TalentAffinityCalculator
+from services.command.scene_command_service import SceneCommandService
+from services.command.talent_command_service import TalentCommandService
+from services.market_service import MarketService
+from services.models.results import FastForwardStop
+from services.time_service import TimeService
+
+AGE_RULES = [
+    {'tag': 'Teen', 'min_age': 18, 'max_age': 19, 'affinity_score': 5},
+    {'tag': 'Teen', 'min_age': 20, 'max_age': 99, 'affinity_score': 0},
+]
+
+def _build_world(scheduled_week=None, scheduled_year=None, editing_weeks=10):
+    """A fresh in-memory game at week 50 of 2010 with the real weekly services."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    with session_factory() as session:
+        session.add_all([GameInfoDB(key='week', value='50'), GameInfoDB(key='year', value='2010'),
+                         GameInfoDB(key='money', value='1000')])
+        session.add_all([MarketGroupStateDB(name="A", current_saturation=0.4),
+                         MarketGroupStateDB(name="B", current_saturation=1.0)])
+        session.add_all([
+            TalentDB(id=1, alias="T1", age=19, tag_affinities={'Teen': 5}, fatigue=40, fatigue_end_week=52, fatigue_end_year=2010,
+                     fatigue_end_date=2010 * 52 + 52),
+            TalentDB(id=2, alias="T2", age=30, tag_affinities={}, fatigue=40, fatigue_end_week=20, fatigue_end_year=2011,
+                     fatigue_end_date=2011 * 52 + 20),
+        ])
+        session.add(SceneDB(id=1, title="Editing", status='in_editing', weeks_remaining=editing_weeks))
+        if scheduled_week:
+            session.add(SceneDB(id=2, title="Scheduled", status='scheduled',
+                                scheduled_week=scheduled_week, scheduled_year=scheduled_year))
+        session.commit()
+
+    config = SimpleNamespace(popularity_gain_scalar=0.05, age_based_affinity_rules=AGE_RULES,
+                             saturation_recovery_rate=0.05)
+    talent_service = TalentCommandService(session_factory, config, TalentAffinityCalculator(config))
+    market_service = MarketService(None, {}, config)
+    scene_service = SceneCommandService(session_factory, HeadlessSignals(), None, None, talent_service,
+                                        market_service, None, None, None, None, None)
+    time_service = TimeService(session_factory, HeadlessSignals(), scene_service, talent_service, market_service)
+    return time_service, session_factory
+
+def _snapshot(session_factory):
+    with session_factory() as session:
+        return {
+            'date': {row.key: row.value for row in session.query(GameInfoDB)},
+            'saturation': {g.name: g.current_saturation for g in session.query(MarketGroupStateDB)},
+            'talents': {t.id: (t.age, t.tag_affinities, t.fatigue) for t in session.query(TalentDB)},
+            'editing': session.get(SceneDB, 1).weeks_remaining,
+        }
+
+def _assert_same_world(fast, slow):
+    assert fast['date'] == slow['date']
+    assert fast['talents'] == slow['talents']
+    assert fast['editing'] == slow['editing']
+    assert fast['saturation'] == pytest.approx(slow['saturation'])
+
+def test_fast_forward_matches_weekly_advancement():
+    fast_service, fast_factory = _build_world(scheduled_week=3, scheduled_year=2011)
+    slow_service, slow_factory = _build_world(scheduled_week=3, scheduled_year=2011)
+
+    result = fast_service.fast_forward(52)
+    for _ in range(result.weeks_advanced):
+        slow_service.advance_week()
+
+    # Week 50 of 2010 to week 3 of 2011 crosses one new year.
+    assert (result.weeks_advanced, result.new_week, result.new_year) == (5, 3, 2011)
+    assert result.stop_reason == FastForwardStop.SCHEDULED_SCENE
+    _assert_same_world(_snapshot(fast_factory), _snapshot(slow_factory))
+    assert _snapshot(fast_factory)['talents'][1] == (20, {'Teen': 0}, 0)
+
+def test_fast_forward_stops_before_edit_finishes():
+    time_service, session_factory = _build_world(editing_weeks=4)
+
+    result = time_service.fast_forward(52)
+
+    assert result.weeks_advanced == 3
+    assert result.stop_reason == FastForwardStop.EDITING_COMPLETE
+    assert _snapshot(session_factory)['editing'] == 1
+
+def test_fast_forward_respects_week_limit():
+    time_service, session_factory = _build_world(editing_weeks=100)
+
+    result = time_service.fast_forward(52)
+
+    assert (result.weeks_advanced, result.stop_reason) == (52, FastForwardStop.WEEK_LIMIT)
+    assert (result.new_week, result.new_year) == (50, 2011)
+
+def test_fast_forward_does_nothing_when_this_week_is_busy():
+    time_service, session_factory = _build_world(scheduled_week=50, scheduled_year=2010)
+    before = _snapshot(session_factory)
+
+    result = time_service.fast_forward(52)
+
+    assert result.weeks_advanced == 0
+    assert _snapshot(session_factory) == before
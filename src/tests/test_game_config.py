@@ -0,0 +1,56 @@
+import importlib.util
+import json
+import sqlite3
+
+import pytest
+
+from data.data_manager import DataManager
+from utils.paths import DATA_DIR
+
+def _load_migration_script():
+    spec = importlib.util.spec_from_file_location("migrate_to_sqlite", DATA_DIR / "scripts" / "migrate_to_sqlite.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def game_data(tmp_path):
+    """An empty static data database with the migrated game config."""
+    path = tmp_path / "game_data.sqlite"
+    migration = _load_migration_script()
+    with sqlite3.connect(path) as conn:
+        cursor = conn.cursor()
+        migration.create_tables(cursor)
+        migration.migrate_config(cursor, json.loads((DATA_DIR / "game_config.json").read_text()))
+    return path
+
+def _load_config(path) -> dict:
+    data_manager = DataManager(str(path))
+    try:
+        return data_manager.game_config
+    finally:
+        data_manager.close()
+
+def test_migrated_config_keeps_its_types(game_data):
+    with sqlite3.connect(game_data) as conn:
+        stored = conn.execute("SELECT value FROM game_config WHERE key = 'delta_saves'").fetchone()[0]
+    assert stored == 'false'
+
+    config = _load_config(game_data)
+
+    assert config['live_session_in_memory'] is False
+    assert config['delta_saves'] is False
+    assert config['save_compression'] is False
+    assert config['initial_money'] == 2000000
+    assert config['market_saturation_recovery_rate'] == 0.05
+    assert config['chemistry_discovery_weights']['0'] == 80
+
+def test_booleans_stored_by_older_migrations_load_as_booleans(game_data):
+    with sqlite3.connect(game_data) as conn:
+        conn.executemany("UPDATE game_config SET value = ? WHERE key = ?",
+                         [('False', 'live_session_in_memory'), ('True', 'delta_saves')])
+
+    config = _load_config(game_data)
+
+    assert config['live_session_in_memory'] is False
+    assert config['delta_saves'] is True
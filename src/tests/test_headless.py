@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from data.save_manager import SaveManager
+from data.save_store import SAVE_STORE_NAME
+from headless import PHASE_SAVE, main
+from services.time_service import WEEK_PHASES
+from utils.paths import GAME_DATA
+
+pytestmark = pytest.mark.skipif(not GAME_DATA.exists(), reason="needs data/game_data.sqlite (run data/scripts/migrate_to_sqlite.py)")
+
+def test_new_game_runs_two_weeks(tmp_path, capsys):
+    assert main(['--weeks', '2', '--save-dir', str(tmp_path), '--seed', '1', '--autosave', '--json']) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report['weeks'] == 2
+    assert report['stopped_reason'] is None
+    assert report['final_date'] == {'week': 3, 'year': 2010}
+    assert set(report['phase_seconds']) >= {*WEEK_PHASES, PHASE_SAVE}
+    assert all(seconds >= 0 for seconds in report['phase_seconds'].values())
+
+def test_text_report_lists_the_phase_timings(tmp_path, capsys):
+    assert main(['--weeks', '2', '--save-dir', str(tmp_path), '--seed', '1']) == 0
+
+    out = capsys.readouterr().out
+    assert "Simulated 2 week(s)" in out
+    for phase in WEEK_PHASES:
+        assert f"  {phase} " in out
+
+def test_autosaves_are_full_copies_with_the_shipped_config(tmp_path, capsys):
+    assert main(['--weeks', '2', '--save-dir', str(tmp_path), '--live-session', 'disk', '--autosave']) == 0
+
+    assert (tmp_path / "autosave_0.sqlite").exists()
+    assert not (tmp_path / SAVE_STORE_NAME).exists()
+
+def test_compacting_saves_needs_delta_saves(tmp_path, capsys):
+    assert main(['--weeks', '1', '--save-dir', str(tmp_path), '--live-session', 'disk', '--autosave']) == 0
+
+    assert main(['--compact-saves', '--save-dir', str(tmp_path)]) == 1
+    assert (tmp_path / "autosave_0.sqlite").exists()
+    assert SaveManager(tmp_path).has_saves()
+
+def test_runs_without_pyqt(tmp_path):
+    # A fresh interpreter, since other tests load PyQt6 into this one. None in sys.modules makes imports fail.
+    script = ("import sys; sys.modules['PyQt6'] = None\n"
+              "from headless import main\n"
+              f"sys.exit(main(['--weeks', '1', '--save-dir', {str(tmp_path)!r}, '--json']))")
+    run = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parents[1], capture_output=True, text=True)
+
+    assert run.returncode == 0, run.stderr
+    assert json.loads(run.stdout)['weeks'] == 1
+
+def test_missing_save_fails(tmp_path):
+    assert main(['--weeks', '1', '--save-dir', str(tmp_path), '--load', 'no_such_save']) == 1
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from data.save_manager import SaveManager, LIVE_SESSION_NAME, RECOVERED_SAVE_NAME
+from database.db_models import GameInfoDB
+from database.live_session import journal_path, memory_db_supported
+
+pytestmark = pytest.mark.skipif(not memory_db_supported(), reason="needs the SQLite memdb VFS")
+
+def _read_week(path):
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("SELECT value FROM game_info WHERE key = 'week'").fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+def _set_week(save_manager: SaveManager, week: int):
+    session = save_manager.db_manager.get_session()
+    try:
+        session.merge(GameInfoDB(key='week', value=str(week)))
+        session.commit()
+    finally:
+        session.close()
+
+@pytest.fixture
+def save_manager(tmp_path):
+    manager = SaveManager(tmp_path, in_memory=True)
+    manager.create_new_save_db(LIVE_SESSION_NAME)
+    yield manager
+    manager.cleanup_session_file()
+
+def test_live_session_stays_in_memory_until_checkpoint(tmp_path, save_manager):
+    session_path = tmp_path / f"{LIVE_SESSION_NAME}.sqlite"
+    assert save_manager.checkpoint_live_session(timeout=5)
+    _set_week(save_manager, 7)
+
+    # Commits do not reach the checkpoint file on their own.
+    assert _read_week(session_path) is None
+    assert save_manager.checkpoint_live_session(timeout=5)
+    assert _read_week(session_path) == '7'
+    assert journal_path(session_path).exists()
+
+def test_autosave_and_load_round_trip(tmp_path, save_manager):
+    _set_week(save_manager, 3)
+    save_manager.auto_save()
+    assert save_manager.wait_for_autosave(timeout=5)
+    assert _read_week(tmp_path / "autosave_0.sqlite") == '3'
+
+    state = save_manager.load_game("autosave_0")
+    assert state.week == 3
+
+def test_crashed_session_is_recovered_on_startup(tmp_path, save_manager):
+    _set_week(save_manager, 12)
+    assert save_manager.checkpoint_live_session(timeout=5)
+    # Simulate a crash: the checkpoint and its journal are left behind.
+    save_manager.db_manager.disconnect()
+
+    restarted = SaveManager(tmp_path, in_memory=True)
+
+    assert _read_week(tmp_path / f"{RECOVERED_SAVE_NAME}.sqlite") == '12'
+    assert not (tmp_path / f"{LIVE_SESSION_NAME}.sqlite").exists()
+    assert not journal_path(tmp_path / f"{LIVE_SESSION_NAME}.sqlite").exists()
+    assert RECOVERED_SAVE_NAME in [s['name'] for s in restarted.get_save_files()]
+
+def test_clean_shutdown_leaves_nothing_to_recover(tmp_path, save_manager):
+    assert save_manager.checkpoint_live_session(timeout=5)
+    save_manager.cleanup_session_file()
+
+    SaveManager(tmp_path, in_memory=True)
+
+    assert not (tmp_path / f"{RECOVERED_SAVE_NAME}.sqlite").exists()
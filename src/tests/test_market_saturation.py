@@ -0,0 +1,64 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import Base, MarketGroupStateDB
+from services.market_service import MarketService
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session(engine):
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db_session = Session()
+    db_session.add_all([MarketGroupStateDB(name=f"Group {i}", current_saturation=1.0) for i in range(200)])
+    db_session.commit()
+    yield db_session
+    db_session.close()
+
+@pytest.fixture
+def market_service():
+    return MarketService(None, {}, SimpleNamespace(saturation_recovery_rate=0.1))
+
+def _saturations(session):
+    session.expire_all()
+    return {m.name: m.current_saturation for m in session.query(MarketGroupStateDB)}
+
+def _count_updates(engine, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return sum(1 for s in statements if s.lstrip().upper().startswith("UPDATE"))
+
+def test_release_costs_are_one_update(engine, session, market_service):
+    costs = {f"Group {i}": 0.3 for i in range(100)}
+    costs.update({"Group 0": 1.5, "Missing": 0.5})
+
+    updates = _count_updates(engine, lambda: market_service.update_saturation_from_release(session, costs))
+    session.commit()
+
+    saturations = _saturations(session)
+    assert updates == 1
+    assert saturations["Group 0"] == 0.0
+    assert saturations["Group 1"] == pytest.approx(0.7)
+    assert saturations["Group 150"] == 1.0
+
+def test_recovery_reports_change_only_when_below_full(engine, session, market_service):
+    assert market_service.recover_all_market_saturation(session) is False
+
+    market_service.update_saturation_from_release(session, {"Group 3": 0.5})
+    updates = _count_updates(engine, lambda: market_service.recover_all_market_saturation(session, weeks=2))
+    session.commit()
+
+    assert updates == 1
+    assert _saturations(session)["Group 3"] == pytest.approx(1.0 - 0.5 * 0.9 ** 2)
@@ -0,0 +1,113 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import Base, GameInfoDB, TalentDB, EmailMessageDB, MarketGroupStateDB
+from database.table_versions import TableVersions
+from services.query.game_query_service import GameQueryService
+from services.query.query_cache import QueryCache
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as session:
+        session.add_all([GameInfoDB(key='week', value='5'), GameInfoDB(key='year', value='2010')])
+        session.add_all([TalentDB(id=i, alias=f"Talent {i}", age=25, gender="Female", ethnicity="White")
+                         for i in range(1, 4)])
+        session.add(MarketGroupStateDB(name="Mainstream", current_saturation=1.0, discovered_sentiments={}))
+        session.commit()
+    return factory
+
+@pytest.fixture
+def service(session_factory):
+    versions = TableVersions()
+    versions.track(session_factory)
+    return GameQueryService(session_factory, QueryCache(versions))
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+    event.listen(engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+    return executed
+
+def test_repeated_reads_cost_no_sql(service, statements):
+    assert service.get_talent_by_id(1).alias == "Talent 1"
+    assert service.get_all_market_states()["Mainstream"].current_saturation == 1.0
+    statements.clear()
+
+    for _ in range(3):
+        assert service.get_talent_by_id(1).alias == "Talent 1"
+        assert "Mainstream" in service.get_all_market_states()
+
+    assert statements == []
+    assert service.cache.stats()['hits'] == 6
+
+def test_commits_invalidate_only_the_tables_they_touch(service, session_factory):
+    talent = service.get_talent_by_id(1)
+    service.get_all_market_states()
+
+    with session_factory() as session:
+        session.add(EmailMessageDB(subject="Hi", body="", week=5, year=2010))
+        session.commit()
+    assert service.get_talent_by_id(1) == talent
+
+    with session_factory() as session:
+        session.get(TalentDB, 1).alias = "Renamed"
+        session.commit()
+    assert service.get_talent_by_id(1).alias == "Renamed"
+
+    with session_factory() as session:
+        session.query(MarketGroupStateDB).update({MarketGroupStateDB.current_saturation: 0.5},
+                                                 synchronize_session=False)
+        session.rollback()
+    assert service.get_all_market_states()["Mainstream"].current_saturation == 1.0
+
+    with session_factory() as session:
+        session.query(MarketGroupStateDB).update({MarketGroupStateDB.current_saturation: 0.5},
+                                                 synchronize_session=False)
+        session.commit()
+    assert service.get_all_market_states()["Mainstream"].current_saturation == 0.5
+    assert service.cache.stats()['misses'] == 4
+
+def test_raw_driver_writes_invalidate_the_cache(service, session_factory, engine):
+    service.get_talent_by_id(1)
+
+    with session_factory() as session:
+        session.connection().exec_driver_sql("UPDATE talents SET alias = 'Rolled back' WHERE id = 1")
+        session.rollback()
+    assert service.get_talent_by_id(1).alias == "Talent 1"
+
+    with session_factory() as session:
+        session.connection().exec_driver_sql("UPDATE talents SET alias = ? WHERE id = ?", [("Raw", 1)])
+        session.commit()
+    assert service.get_talent_by_id(1).alias == "Raw"
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql('UPDATE "talents" SET alias = \'Migrated\' WHERE id = 1')
+    assert service.get_talent_by_id(1).alias == "Migrated"
+
+def test_results_are_copies(service):
+    service.get_talent_by_id(1).alias = "Mutated"
+    assert service.get_talent_by_id(1).alias == "Talent 1"
+
+def test_least_recently_used_entries_are_evicted(session_factory):
+    versions = TableVersions()
+    versions.track(session_factory)
+    service = GameQueryService(session_factory, QueryCache(versions, max_rows=2))
+
+    service.get_talent_by_id(1)
+    service.get_talent_by_id(2)
+    service.get_talent_by_id(1)
+    service.get_talent_by_id(3)
+
+    stats = service.cache.stats()
+    assert (stats['entries'], stats['evictions']) == (2, 1)
+    service.get_talent_by_id(1)
+    assert service.cache.stats()['hits'] == 2
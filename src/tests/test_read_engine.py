@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from data.save_manager import SaveManager, LIVE_SESSION_NAME
+from database.db_models import GameInfoDB
+from database.live_session import memory_db_supported
+
+MODES = [False, pytest.param(True, marks=pytest.mark.skipif(not memory_db_supported(), reason="needs the SQLite memdb VFS"))]
+
+@pytest.fixture(params=MODES, ids=["disk", "memory"])
+def save_manager(tmp_path, request):
+    manager = SaveManager(tmp_path, in_memory=request.param)
+    manager.create_new_save_db(LIVE_SESSION_NAME)
+    with manager.db_manager.get_session() as session:
+        session.add(GameInfoDB(key='week', value='1'))
+        session.commit()
+    yield manager
+    manager.cleanup_session_file()
+
+def _read_week(read_factory) -> str:
+    with read_factory() as session:
+        return session.get(GameInfoDB, 'week').value
+
+def test_readers_see_last_commit_while_a_write_is_open(tmp_path):
+    # Disk only: the in-memory database has no WAL, so its readers wait for the writer.
+    manager = SaveManager(tmp_path)
+    manager.create_new_save_db(LIVE_SESSION_NAME)
+    db_manager = manager.db_manager
+    read_factory = db_manager.get_read_session_factory()
+    with db_manager.get_session() as session:
+        session.add(GameInfoDB(key='week', value='1'))
+        session.commit()
+
+    with db_manager.get_session() as writer:
+        writer.get(GameInfoDB, 'week').value = '2'
+        writer.flush()
+        # The write transaction holds its lock; readers neither wait nor see it.
+        assert _read_week(read_factory) == '1'
+        writer.commit()
+
+    assert _read_week(read_factory) == '2'
+    manager.cleanup_session_file()
+
+def test_readers_cannot_write(save_manager):
+    read_factory = save_manager.db_manager.get_read_session_factory()
+    with read_factory() as session:
+        with pytest.raises(OperationalError):
+            session.execute(text("UPDATE game_info SET value = '9' WHERE key = 'week'"))
+    assert _read_week(read_factory) == '1'
+
+def test_disk_session_uses_wal_and_saves_do_not(tmp_path):
+    manager = SaveManager(tmp_path)
+    path = manager.create_new_save_db(LIVE_SESSION_NAME)
+    with manager.db_manager.get_session() as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        session.add(GameInfoDB(key='week', value='3'))
+        session.commit()
+
+    # The commit is still in session.sqlite-wal; the save must include it.
+    assert manager.copy_save(path, "manual")
+    assert manager.get_save_files()[0]['week'] == 3
+    assert (tmp_path / "manual.sqlite").read_bytes()[18:20] == b"\x01\x01"
+
+    manager.cleanup_session_file()
+    assert not any(tmp_path.glob(f"{LIVE_SESSION_NAME}.sqlite*"))
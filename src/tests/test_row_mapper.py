@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.game_state import (
+    Talent, Scene, ShootingBloc, EmailMessage, MarketGroupState, VirtualPerformer, ActionSegment,
+    SlotAssignment, ScenePerformerContribution
+)
+from database.db_models import (
+    Base, GameInfoDB, TalentDB, TalentPopularityDB, TalentChemistryDB, MarketGroupStateDB, ShootingBlocDB,
+    SceneDB, VirtualPerformerDB, ActionSegmentDB, SlotAssignmentDB, SceneCastDB, ScenePerformerContributionDB,
+    EmailMessageDB
+)
+from database.row_mapper import compile_row_converter
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db_session = Session()
+    db_session.add_all([GameInfoDB(key='week', value='5'), GameInfoDB(key='year', value='2010'),
+                        MarketGroupStateDB(name="Straight Men", current_saturation=0.5,
+                                           discovered_sentiments={'action_sentiments': ['Anal']})])
+    db_session.add_all([
+        TalentDB(id=1, alias="A", age=25, ethnicity="White", gender="Female", performance=50.0, acting=40.0,
+                 stamina=30.0, dom_skill=20.0, sub_skill=10.0, ambition=5,
+                 tag_affinities={'Teen': 5.0}, tag_preferences={'Anal': {'Giver': 1}}, hard_limits=['Bondage']),
+        TalentDB(id=2, alias="B", age=30, ethnicity="Black", gender="Male", performance=60.0, acting=40.0,
+                 stamina=30.0, dom_skill=20.0, sub_skill=10.0, ambition=3, dick_size=7),
+        TalentDB(id=3, alias="C", age=40, ethnicity="Asian", gender="Female", performance=60.0, acting=40.0,
+                 stamina=30.0, dom_skill=20.0, sub_skill=10.0, ambition=3, tag_affinities=None),
+    ])
+    db_session.add_all([
+        TalentPopularityDB(talent_id=1, market_group_name="Straight Men", base_score=10.0, last_updated_week=2010 * 52 + 5),
+        TalentChemistryDB(talent_a_id=1, talent_b_id=2, chemistry_score=2),
+        TalentChemistryDB(talent_a_id=1, talent_b_id=3, chemistry_score=-1),
+    ])
+    db_session.add(ShootingBlocDB(id=1, name="Bloc", scheduled_week=5, scheduled_year=2010,
+                                  production_settings={'Camera': 'Basic'}, on_set_policies=['policy_condoms_mandatory']))
+    db_session.add(SceneDB(id=1, bloc_id=1, title="Scene", status='shot', focus_target="Straight Men",
+                           scheduled_week=5, scheduled_year=2010, assigned_tags={'Big Boobs': [10]},
+                           tag_qualities={'Anal': 3}, post_production_choices={'editing_tier': 'basic'}))
+    db_session.add_all([VirtualPerformerDB(id=10, scene_id=1, name="VP 1", gender="Female"),
+                        VirtualPerformerDB(id=11, scene_id=1, name="VP 2", gender="Male")])
+    db_session.add(ActionSegmentDB(id=100, scene_id=1, tag_name="Anal", runtime_percentage=50, parameters={'Giver': 1}))
+    db_session.add(SlotAssignmentDB(segment_id=100, slot_id="Anal_Giver_1", virtual_performer_id=11))
+    db_session.add_all([SceneCastDB(scene_id=1, virtual_performer_id=10, talent_id=1, salary=500),
+                        SceneCastDB(scene_id=1, virtual_performer_id=11, talent_id=2, salary=300)])
+    db_session.add(ScenePerformerContributionDB(scene_id=1, talent_id=1, contribution_key="Anal", quality_score=7.5))
+    db_session.add(EmailMessageDB(id=1, subject="Hi", body="Body", week=5, year=2010))
+    db_session.commit()
+    yield db_session
+    db_session.close()
+    engine.dispose()
+
+def _reference_to_dataclass(row, dataclass_type):
+    """The from_dict based conversion the generated converters replace."""
+    data = {key: getattr(row, key) for key in dataclass_type.__annotations__ if hasattr(row, key)}
+    if dataclass_type is Scene:
+        data['virtual_performers'] = [_reference_to_dataclass(vp, VirtualPerformer) for vp in row.virtual_performers]
+        data['action_segments'] = [_reference_to_dataclass(seg, ActionSegment) for seg in row.action_segments]
+        data['performer_contributions'] = [_reference_to_dataclass(c, ScenePerformerContribution)
+                                           for c in row.performer_contributions_rel]
+        data['final_cast'] = {str(c.virtual_performer_id): c.talent_id for c in row.cast}
+        data['pps_salaries'] = {str(c.talent_id): c.salary for c in row.cast}
+    elif dataclass_type is Talent:
+        data['popularity'] = {p.market_group_name: p.score for p in row.popularity_scores}
+        data['chemistry'] = {**{c.talent_b_id: c.chemistry_score for c in row.chemistry_a},
+                             **{c.talent_a_id: c.chemistry_score for c in row.chemistry_b}}
+    elif dataclass_type is ActionSegment:
+        data['slot_assignments'] = [_reference_to_dataclass(sa, SlotAssignment) for sa in row.slot_assignments]
+    elif dataclass_type is ShootingBloc:
+        data['scenes'] = [_reference_to_dataclass(s, Scene) for s in row.scenes]
+    return dataclass_type.from_dict(data)
+
+@pytest.mark.filterwarnings("ignore:'NoneType' object value:RuntimeWarning")
+@pytest.mark.parametrize("model_cls, dataclass_type", [
+    (TalentDB, Talent), (SceneDB, Scene), (ShootingBlocDB, ShootingBloc),
+    (EmailMessageDB, EmailMessage), (MarketGroupStateDB, MarketGroupState),
+])
+def test_converter_matches_from_dict(session, model_cls, dataclass_type):
+    for row in session.query(model_cls).order_by(*model_cls.__table__.primary_key.columns):
+        assert row.to_dataclass(dataclass_type) == _reference_to_dataclass(row, dataclass_type)
+
+def test_converter_coerces_and_copies(session):
+    row = session.get(TalentDB, 1)
+    talent = row.to_dataclass(Talent)
+
+    assert talent.tag_affinities == {'Teen': 5} and type(talent.tag_affinities['Teen']) is int
+    assert talent.chemistry == {2: 2, 3: -1}
+    assert session.get(TalentDB, 3).to_dataclass(Talent).tag_affinities == {}
+    talent.tag_preferences['Anal']['Giver'] = 0
+    talent.hard_limits.append('Anal')
+    assert row.tag_preferences == {'Anal': {'Giver': 1}}
+    assert row.hard_limits == ['Bondage']
+
+def test_unknown_required_field_is_rejected():
+    with pytest.raises(TypeError):
+        compile_row_converter(EmailMessageDB, Talent)
@@ -0,0 +1,65 @@
+import pytest
+
+from data.save_manager import SaveManager, LIVE_SESSION_NAME, QUICKSAVE_NAME
+from data.save_manifest import SAVE_MANIFEST_NAME
+from database.db_models import GameInfoDB, SceneDB
+
+def _play(save_manager: SaveManager, week: int, money: int, released: int = 0):
+    session = save_manager.db_manager.get_session()
+    try:
+        session.merge(GameInfoDB(key='week', value=str(week)))
+        session.merge(GameInfoDB(key='year', value='2010'))
+        session.merge(GameInfoDB(key='money', value=str(money)))
+        for _ in range(released):
+            session.add(SceneDB(title="Scene", status='released', revenue=1000))
+        session.commit()
+    finally:
+        session.close()
+
+def _no_scan(self):
+    raise AssertionError("saves were rescanned")
+
+@pytest.mark.parametrize("delta_saves", [False, True])
+def test_saves_are_listed_from_the_manifest(tmp_path, monkeypatch, delta_saves):
+    manager = SaveManager(tmp_path, delta_saves=delta_saves)
+    try:
+        manager.create_new_save_db(LIVE_SESSION_NAME)
+        _play(manager, week=3, money=5000, released=2)
+        assert manager.copy_save(manager.get_current_session_path(), QUICKSAVE_NAME)
+        _play(manager, week=4, money=7000)
+        manager.auto_save()
+        assert manager.wait_for_autosave(timeout=5)
+    finally:
+        manager.cleanup_session_file()
+
+    # A fresh manager (e.g. the next start) lists saves without reading any of them.
+    monkeypatch.setattr(SaveManager, "_scan_saves", _no_scan)
+    restarted = SaveManager(tmp_path, delta_saves=delta_saves)
+    saves = {s['name']: s for s in restarted.get_save_files()}
+
+    assert restarted.has_saves() and restarted.quick_load_exists()
+    assert set(saves) == {QUICKSAVE_NAME, "autosave_0"}
+    assert (saves[QUICKSAVE_NAME]['week'], saves[QUICKSAVE_NAME]['money']) == (3, 5000)
+    assert saves[QUICKSAVE_NAME]['stats'] == {'scenes_released': 2, 'total_revenue': 2000}
+    assert saves["autosave_0"]['week'] == 4
+    assert restarted.load_latest_save() == "autosave_0"
+
+    assert restarted.delete_save(QUICKSAVE_NAME)
+    assert not restarted.quick_load_exists()
+
+@pytest.mark.parametrize("delta_saves", [False, True])
+def test_lost_manifest_is_rebuilt_from_the_saves(tmp_path, delta_saves):
+    manager = SaveManager(tmp_path, delta_saves=delta_saves)
+    try:
+        manager.create_new_save_db(LIVE_SESSION_NAME)
+        _play(manager, week=9, money=123, released=1)
+        manager.copy_save(manager.get_current_session_path(), "career")
+    finally:
+        manager.cleanup_session_file()
+    expected = manager.manifest.entries()["career"]
+
+    (tmp_path / SAVE_MANIFEST_NAME).write_text("{not json", encoding='utf-8')
+    rebuilt = SaveManager(tmp_path, delta_saves=delta_saves).manifest.entries()["career"]
+
+    for key in ('week', 'year', 'money', 'stats', 'size', 'checksum', 'location'):
+        assert rebuilt[key] == expected[key]
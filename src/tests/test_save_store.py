@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+
+from data.save_manager import SaveManager, LIVE_SESSION_NAME
+from data.save_store import SaveStore, SAVE_STORE_NAME
+from database.db_models import GameInfoDB
+
+@pytest.fixture
+def live_db(tmp_path):
+    """A live session with a week counter and enough filler to span many pages."""
+    path = tmp_path / "live.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE game_info (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO game_info VALUES ('week', '1')")
+    conn.execute("CREATE TABLE filler (id INTEGER PRIMARY KEY, data TEXT)")
+    conn.executemany("INSERT INTO filler (data) VALUES (?)", ((f"row {i} " * 20,) for i in range(2000)))
+    conn.commit()
+    yield path, conn
+    conn.close()
+
+def _dump(path) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return list(conn.iterdump())
+    finally:
+        conn.close()
+
+def _set_week(conn, week: int):
+    conn.execute("UPDATE game_info SET value = ? WHERE key = 'week'", (str(week),))
+    conn.commit()
+
+def _read_week(path) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT value FROM game_info WHERE key = 'week'").fetchone()[0]
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_slot_round_trip(tmp_path, live_db, compress):
+    path, conn = live_db
+    store = SaveStore(tmp_path / SAVE_STORE_NAME, compress=compress)
+
+    store.write_slot("slot", str(path))
+    store.restore_slot("slot", tmp_path / "restored.sqlite")
+
+    assert _dump(tmp_path / "restored.sqlite") == _dump(path)
+    assert [s['name'] for s in store.list_slots()] == ["slot"]
+
+def test_later_saves_store_only_changed_pages(tmp_path, live_db):
+    path, conn = live_db
+    store = SaveStore(tmp_path / SAVE_STORE_NAME)
+
+    first = store.write_slot("autosave_0", str(path))
+    _set_week(conn, 2)
+    second = store.write_slot("autosave_1", str(path))
+
+    assert first.new_pages == first.page_count
+    # Only the game_info page and the header page change between the two saves.
+    assert second.new_pages <= 3
+    assert second.bytes_written < path.stat().st_size / 10
+    for name, week in (("autosave_0", '1'), ("autosave_1", '2')):
+        store.restore_slot(name, tmp_path / f"{name}.sqlite")
+        assert _read_week(tmp_path / f"{name}.sqlite") == week
+
+def test_compact_drops_unreferenced_pages(tmp_path, live_db):
+    path, conn = live_db
+    store = SaveStore(tmp_path / SAVE_STORE_NAME)
+    store.write_slot("a", str(path))
+    _set_week(conn, 2)
+    store.write_slot("b", str(path))
+
+    assert store.compact() == 0
+    store.delete_slot("a")
+    assert 0 < store.compact() <= 3
+    store.restore_slot("b", tmp_path / "b.sqlite")
+    assert _read_week(tmp_path / "b.sqlite") == '2'
+
+def _set_live_week(save_manager: SaveManager, week: int):
+    session = save_manager.db_manager.get_session()
+    try:
+        session.merge(GameInfoDB(key='week', value=str(week)))
+        session.commit()
+    finally:
+        session.close()
+
+def test_save_manager_saves_into_store(tmp_path):
+    legacy = SaveManager(tmp_path)
+    legacy.create_new_save_db(LIVE_SESSION_NAME)
+    _set_live_week(legacy, 4)
+    legacy.copy_save(legacy.get_current_session_path(), "old_save")
+    legacy.cleanup_session_file()
+
+    manager = SaveManager(tmp_path, delta_saves=True, compress_saves=True)
+    try:
+        manager.load_game("old_save")
+        _set_live_week(manager, 9)
+        manager.copy_save(manager.get_current_session_path(), "quicksave")
+        manager.auto_save()
+        assert manager.wait_for_autosave(timeout=5)
+
+        assert not (tmp_path / "quicksave.sqlite").exists()
+        assert {s['name'] for s in manager.get_save_files()} == {"old_save", "quicksave", "autosave_0"}
+        assert manager.quick_load_exists()
+        assert manager.load_game("quicksave").week == 9
+
+        assert manager.compact_saves() == 1
+        assert not (tmp_path / "old_save.sqlite").exists()
+        assert manager.load_game("old_save").week == 4
+        assert manager.delete_save("autosave_0")
+        assert {s['name'] for s in manager.get_save_files()} == {"old_save", "quicksave"}
+    finally:
+        manager.cleanup_session_file()
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import Base, SceneDB, SceneCastDB, VirtualPerformerDB, TalentDB
+from services.models.list_rows import SceneListRow
+from services.query.game_query_service import GameQueryService
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as session:
+        session.add_all([TalentDB(id=1, alias="Bea", age=30, gender="Female", ethnicity="Asian"),
+                         TalentDB(id=2, alias="Al", age=40, gender="Male", ethnicity="White")])
+        session.add_all([
+            SceneDB(id=1, title="Released", status='released', scheduled_week=3, scheduled_year=2010, revenue=12500),
+            SceneDB(id=2, title="Editing", status='in_editing', scheduled_week=5, scheduled_year=2010, weeks_remaining=2),
+            SceneDB(id=3, title="Casting", status='casting', scheduled_week=9, scheduled_year=2010),
+            SceneDB(id=4, title="Shot", status='shot', scheduled_week=6, scheduled_year=2010),
+        ])
+        session.add_all([VirtualPerformerDB(id=vp_id, scene_id=scene_id, name=f"VP {vp_id}", gender="Female", ethnicity="Any")
+                         for vp_id, scene_id in ((10, 1), (11, 1), (12, 1), (20, 2), (40, 4), (41, 4))])
+        # Cast out of alias order, with a talent that has since been removed.
+        session.add_all([SceneCastDB(scene_id=1, virtual_performer_id=10, talent_id=2, salary=100),
+                         SceneCastDB(scene_id=1, virtual_performer_id=11, talent_id=9, salary=100),
+                         SceneCastDB(scene_id=1, virtual_performer_id=12, talent_id=1, salary=100),
+                         SceneCastDB(scene_id=2, virtual_performer_id=20, talent_id=1, salary=100)])
+        session.commit()
+    yield factory
+    engine.dispose()
+
+def test_shot_scenes_are_rows_with_cast_aliases(session_factory):
+    rows = GameQueryService(session_factory).get_shot_scenes()
+
+    assert [row.id for row in rows] == [1, 2, 4]
+    released, editing, shot = rows
+    assert isinstance(released, SceneListRow) and not hasattr(released, '__dict__')
+    assert (released.revenue, released.scheduled_week, released.scheduled_year) == (12500, 3, 2010)
+    assert released.cast_aliases == "Al, ID 9?, Bea"
+    assert (released.cast_count, released.role_count) == (3, 3)
+    assert editing.display_status == "In Editing (2w left)"
+    assert (shot.cast_count, shot.role_count, shot.cast_aliases) == (0, 2, None)
+
+def test_shot_scenes_are_read_with_one_query(session_factory):
+    statements = []
+    event.listen(session_factory.kw['bind'], 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    GameQueryService(session_factory).get_shot_scenes()
+
+    assert len(statements) == 1
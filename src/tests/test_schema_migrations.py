@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import Session
+
+from database.db_models import (
+    Base, SceneDB, SceneCastDB, TalentDB, TalentPopularityDB, EmailMessageDB,
+    VirtualPerformerDB, ActionSegmentDB, SlotAssignmentDB, ScenePerformerContributionDB
+)
+from database.migrations import run_migrations, get_schema_version, LATEST_SCHEMA_VERSION
+
+MODEL_INDEXES = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def _indexes(conn) -> set:
+    return {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'")}
+
+def _plan(engine, statement) -> str:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+def test_new_database_is_stamped_with_latest_version(engine):
+    assert run_migrations(engine) == LATEST_SCHEMA_VERSION
+    assert run_migrations(engine) == 0
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == LATEST_SCHEMA_VERSION
+
+def test_unversioned_save_gets_the_model_indexes(engine):
+    with engine.begin() as conn:
+        # A save from before versioning: create_all never adds indexes to existing tables.
+        for name in _indexes(conn):
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert _indexes(conn) == MODEL_INDEXES
+        assert get_schema_version(conn) == LATEST_SCHEMA_VERSION
+
+HOT_QUERIES = {
+    "weekly shoot": (select(SceneDB.id).where(SceneDB.status == 'scheduled', SceneDB.scheduled_year == 2010,
+                                              SceneDB.scheduled_week == 5), "ix_scenes_status_schedule"),
+    "scenes by status": (select(SceneDB.id).where(SceneDB.status == 'in_editing'), "ix_scenes_status_schedule"),
+    "cast by scene": (select(SceneCastDB).where(SceneCastDB.scene_id.in_([1, 2])), "ix_scene_cast_scene_id"),
+    "scenes by talent": (select(SceneCastDB.scene_id).where(SceneCastDB.talent_id == 1), "ix_scene_cast_talent_scene"),
+    "popularity by talent": (select(TalentPopularityDB.id, TalentPopularityDB.base_score)
+                             .where(TalentPopularityDB.talent_id.in_([1, 2])), "ix_talent_popularity_talent_group"),
+    "talent filter": (select(TalentDB.id).where(TalentDB.gender == 'Female', TalentDB.ethnicity.in_(['White', 'Asian'])),
+                      "ix_talents_gender_ethnicity"),
+    "fatigue expiry": (select(TalentDB.id).where(TalentDB.fatigue_end_date.between(1, 104520)), "ix_talents_fatigue_end_date"),
+    "unread emails": (select(func.count()).select_from(EmailMessageDB).where(EmailMessageDB.is_read == False),
+                      "ix_emails_is_read"),
+    "performers by scene": (select(VirtualPerformerDB).where(VirtualPerformerDB.scene_id.in_([1])), "ix_virtual_performers_scene_id"),
+    "segments by scene": (select(ActionSegmentDB).where(ActionSegmentDB.scene_id.in_([1])), "ix_action_segments_scene_id"),
+    "assignments by segment": (select(SlotAssignmentDB).where(SlotAssignmentDB.segment_id.in_([1])), "ix_slot_assignments_segment_id"),
+    "contributions by scene": (select(ScenePerformerContributionDB).where(ScenePerformerContributionDB.scene_id.in_([1])),
+                               "ix_scene_performer_contributions_scene_id"),
+}
+
+@pytest.mark.parametrize("statement, index_name", HOT_QUERIES.values(), ids=HOT_QUERIES.keys())
+def test_hot_query_uses_index(engine, statement, index_name):
+    run_migrations(engine)
+    assert f"INDEX {index_name} " in _plan(engine, statement)
+
+def test_talent_json_columns_move_into_child_tables(engine):
+    with Session(engine) as session:
+        session.add_all([TalentDB(id=1, alias="A"), TalentDB(id=2, alias="B")])
+        session.commit()
+    with engine.begin() as conn:
+        # A version 4 save: preferences, limits and affinities were JSON columns on talents.
+        for table in ('talent_tag_preferences', 'talent_hard_limits', 'talent_tag_affinities',
+                      'talent_concurrency_limits', 'talent_policy_requirements'):
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+        for column in ('tag_preferences', 'hard_limits', 'tag_affinities', 'concurrency_limits', 'policy_requirements'):
+            conn.exec_driver_sql(f"ALTER TABLE talents ADD COLUMN {column} JSON")
+        conn.exec_driver_sql(
+            "UPDATE talents SET tag_preferences = ?, hard_limits = ?, tag_affinities = ?, concurrency_limits = ?, "
+            "policy_requirements = ? WHERE id = 1",
+            ('{"Anal": {"Giver": 0.5, "Receiver": 1.2}}', '["Bondage", "Anal"]', '{"Teen": 5}',
+             '{"DP": 2}', '{"requires": ["policy_condoms"], "refuses": ["policy_no_breaks"]}')
+        )
+        conn.exec_driver_sql("UPDATE talents SET tag_affinities = 'null', hard_limits = '[]' WHERE id = 2")
+        conn.exec_driver_sql("INSERT INTO game_info (key, value) VALUES ('schema_version', '4')")
+
+    assert run_migrations(engine) == LATEST_SCHEMA_VERSION - 4
+
+    with Session(engine) as session:
+        talent, plain = session.get(TalentDB, 1), session.get(TalentDB, 2)
+        assert talent.tag_preferences == {'Anal': {'Giver': 0.5, 'Receiver': 1.2}}
+        assert talent.hard_limits == ['Anal', 'Bondage']
+        assert talent.tag_affinities == {'Teen': 5}
+        assert talent.concurrency_limits == {'DP': 2}
+        assert talent.policy_requirements == {'refuses': ['policy_no_breaks'], 'requires': ['policy_condoms']}
+        assert (plain.tag_preferences, plain.hard_limits, plain.tag_affinities) == ({}, [], {})
+    with engine.connect() as conn:
+        columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(talents)")}
+    assert 'tag_preferences' not in columns and 'policy_requirements' not in columns
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import (
+    Base, GameInfoDB, ShootingBlocDB, SceneDB, VirtualPerformerDB, SceneCastDB,
+    TalentDB, TalentChemistryDB
+)
+from services.command.shoot_context import ShootContext
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session(engine):
+    """Creates a fresh, in-memory database session for each test."""
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+
+def _populate(session, scene_count: int, week: int = 5, year: int = 2010):
+    session.add_all([GameInfoDB(key='week', value=str(week)), GameInfoDB(key='year', value=str(year))])
+    session.add_all([
+        TalentDB(id=i, alias=f"Talent {i}", age=25, gender="Female", ethnicity="White", professionalism=5)
+        for i in range(1, 5)
+    ])
+    session.add(TalentChemistryDB(talent_a_id=1, talent_b_id=2, chemistry_score=1))
+    bloc = ShootingBlocDB(id=1, name="Bloc", scheduled_week=week, scheduled_year=year, production_settings={})
+    session.add(bloc)
+    for i in range(scene_count):
+        scene = SceneDB(id=i + 1, bloc_id=1, title=f"Scene {i}", status='scheduled',
+                        scheduled_week=week, scheduled_year=year)
+        session.add(scene)
+        for j in range(2):
+            vp = VirtualPerformerDB(id=(i + 1) * 10 + j, scene_id=scene.id, name=f"VP {j}", gender="Female")
+            session.add(vp)
+            session.add(SceneCastDB(scene_id=scene.id, virtual_performer_id=vp.id, talent_id=(i + j) % 4 + 1, salary=100))
+    # A scene in another week must not be loaded.
+    session.add(SceneDB(id=999, bloc_id=1, title="Later", status='scheduled', scheduled_week=week + 1, scheduled_year=year))
+    session.commit()
+    session.expunge_all()
+
+def _count_queries(engine, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+@pytest.mark.parametrize("scene_count", [1, 8])
+def test_for_week_uses_a_constant_number_of_queries(engine, session, scene_count):
+    _populate(session, scene_count)
+
+    context, loading_queries = _count_queries(engine, lambda: ShootContext.for_week(session, 5, 2010))
+
+    # Reading everything the shoot needs afterwards must not touch the database.
+    def walk():
+        for scene_db in context.scenes:
+            context.get_bloc(scene_db.bloc_id)
+            context.get_talents(c.talent_id for c in scene_db.cast)
+            [seg.slot_assignments for seg in scene_db.action_segments]
+            list(scene_db.virtual_performers), list(scene_db.performer_contributions_rel)
+        for talent in context.talents.values():
+            list(talent.popularity_scores), list(talent.chemistry_a), list(talent.chemistry_b)
+            talent.tag_preferences, talent.hard_limits, talent.tag_affinities
+            talent.concurrency_limits, talent.policy_requirements
+    _, walking_queries = _count_queries(engine, walk)
+
+    assert [s.id for s in context.scenes] == list(range(1, scene_count + 1))
+    # Includes one query per talent preference/limit/affinity table.
+    assert loading_queries <= 16
+    assert walking_queries == 0
+
+def test_for_week_collects_cast_and_chemistry(session):
+    _populate(session, 3)
+
+    context = ShootContext.for_week(session, 5, 2010)
+
+    assert set(context.talents) == {1, 2, 3, 4}
+    assert set(context.blocs) == {1}
+    assert context.chemistry_pairs == {(1, 2)}
+    assert [t.id for t in context.get_talents([3, 3, 99, 1])] == [3, 1]
+
+def test_for_scene_uses_current_date(session):
+    _populate(session, 2)
+
+    context = ShootContext.for_scene(session, 2)
+
+    assert (context.current_week, context.current_year) == (5, 2010)
+    assert [s.id for s in context.scenes] == [2]
+    assert context.get_scene(2) is context.scenes[0]
+    assert context.get_scene(1) is None
@@ -0,0 +1,209 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from data.game_state import Scene
+from database.db_models import (
+    Base, GameInfoDB, ShootingBlocDB, SceneDB, VirtualPerformerDB, ActionSegmentDB, SlotAssignmentDB, TalentDB,
+    TalentPopularityDB
+)
+from services.calculation.talent_availability_checker import TalentAvailabilityChecker, RefusalCode
+from services.calculation.talent_demand_calculator import TalentDemandCalculator
+from services.query.game_query_service import GameQueryService
+from services.query.talent_query_service import TalentQueryService
+
+CONFIG = SimpleNamespace(concurrency_default_limit=3, refusal_threshold=0.3, orientation_refusal_threshold=0.1,
+                         pickiness_popularity_scalar=0.0, pickiness_ambition_scalar=0.0,
+                         base_talent_demand=400, demand_perf_divisor=100.0, median_ambition=5.0,
+                         ambition_demand_divisor=10.0, popularity_demand_scalar=0.01, minimum_talent_demand=100)
+DATA_MANAGER = SimpleNamespace(tag_definitions={'Anal': {'name': 'Anal'}}, on_set_policies_data={},
+                               production_settings_data={})
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+def _talent(talent_id: int, **overrides) -> TalentDB:
+    values = dict(id=talent_id, alias=f"Talent {talent_id}", age=25, gender="Female", ethnicity="White", ambition=5,
+                  performance=50.0)
+    values.update(overrides)
+    return TalentDB(**values)
+
+def _populate(session_factory):
+    with session_factory() as session:
+        session.add_all([GameInfoDB(key='week', value='5'), GameInfoDB(key='year', value='2010')])
+        session.add(ShootingBlocDB(id=1, name="Bloc", scheduled_week=6, scheduled_year=2010,
+                                   production_settings={}, on_set_policies=['policy_condoms']))
+        session.add(SceneDB(id=1, bloc_id=1, title="Scene", status='casting'))
+        session.add_all([VirtualPerformerDB(id=10, scene_id=1, name="VP 1", gender="Female", ethnicity="Any"),
+                         VirtualPerformerDB(id=11, scene_id=1, name="VP 2", gender="Male", ethnicity="Any")])
+        session.add(ActionSegmentDB(id=100, scene_id=1, tag_name="Anal", runtime_percentage=100,
+                                    parameters={'Giver': 1, 'Receiver': 1}))
+        session.add_all([SlotAssignmentDB(segment_id=100, slot_id="Anal_Receiver_1", virtual_performer_id=10),
+                         SlotAssignmentDB(segment_id=100, slot_id="Anal_Giver_1", virtual_performer_id=11)])
+        session.add_all([
+            _talent(1),
+            _talent(2, hard_limits=['Anal']),
+            _talent(3, tag_preferences={'Anal': {'Receiver': 0.2}}),
+            _talent(4, policy_requirements={'requires': ['policy_no_breaks']}),
+            _talent(5, policy_requirements={'refuses': ['policy_condoms']}),
+            _talent(6, tag_preferences={'Anal': {'Receiver': 0.9, 'Giver': 0.1}},
+                    policy_requirements={'requires': ['policy_condoms']}),
+            _talent(7, max_scene_partners=0),
+            _talent(8, gender="Male"),
+        ])
+        session.commit()
+
+def test_eligibility_is_settled_in_sql(session_factory):
+    _populate(session_factory)
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    checked_ids = []
+    original_check = checker.check
+    def recording_check(talent, *args, **kwargs):
+        checked_ids.append(talent.id)
+        return original_check(talent, *args, **kwargs)
+    checker.check = recording_check
+    service = TalentQueryService(session_factory, DATA_MANAGER, None, None, CONFIG, checker)
+
+    eligible = service.get_eligible_talent_for_role(1, 10)
+
+    assert [t.id for t in eligible] == [1, 6]
+    # No candidate is checked one by one.
+    assert checked_ids == []
+
+def test_refusal_codes_match_check(session_factory):
+    _populate(session_factory)
+    with session_factory() as session:
+        session.add_all([_talent(9, concurrency_limits={'Anal': 0}), _talent(10, tag_preferences={'Anal': {'Receiver': 0.05}})])
+        session.commit()
+    data_manager = SimpleNamespace(**{**vars(DATA_MANAGER), 'tag_definitions': {'Anal': {'name': 'Anal', 'concept': 'Anal'}}})
+    checker = TalentAvailabilityChecker(data_manager, CONFIG)
+    service = TalentQueryService(session_factory, data_manager, None, None, CONFIG, checker)
+
+    refusals = service.get_role_refusals(1, 10)
+
+    assert refusals == {
+        1: RefusalCode.AVAILABLE, 2: RefusalCode.HARD_LIMIT, 3: RefusalCode.PREFERENCE,
+        4: RefusalCode.REQUIRED_POLICY, 5: RefusalCode.REFUSED_POLICY, 6: RefusalCode.AVAILABLE,
+        7: RefusalCode.SCENE_PARTNERS, 9: RefusalCode.CONCURRENCY, 10: RefusalCode.ORIENTATION,
+    }
+    with session_factory() as session:
+        scene = session.get(SceneDB, 1).to_dataclass(Scene)
+        bloc_db = session.get(ShootingBlocDB, 1)
+        context = checker.role_context(scene, 10, bloc_db)
+        checked = {t.id: checker.check(t, scene, 10, bloc_db, context).code
+                   for t in session.query(TalentDB).filter(TalentDB.gender == "Female")}
+    assert checked == refusals
+
+def test_least_liked_part_of_the_role_decides_the_refusal(session_factory):
+    _populate(session_factory)
+    with session_factory() as session:
+        session.add(ActionSegmentDB(id=101, scene_id=1, tag_name="Kissing", runtime_percentage=0, parameters={}))
+        session.add(SlotAssignmentDB(segment_id=101, slot_id="Kissing_Performer_1", virtual_performer_id=10))
+        session.add_all([
+            # Disliked Receiver role first, orientation conflict on Kissing.
+            _talent(11, tag_preferences={'Anal': {'Receiver': 0.2}, 'Kissing': {'Performer': 0.05}}),
+            _talent(12, tag_preferences={'Anal': {'Receiver': 0.05}, 'Kissing': {'Performer': 0.2}}),
+            _talent(13, tag_preferences={'Anal': {'Receiver': 0.9}, 'Kissing': {'Performer': 0.25}}),
+        ])
+        session.commit()
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    service = TalentQueryService(session_factory, DATA_MANAGER, None, None, CONFIG, checker)
+
+    refusals = service.get_role_refusals(1, 10)
+
+    assert [refusals[talent_id] for talent_id in (11, 12, 13)] == [
+        RefusalCode.ORIENTATION, RefusalCode.ORIENTATION, RefusalCode.PREFERENCE
+    ]
+    with session_factory() as session:
+        scene = session.get(SceneDB, 1).to_dataclass(Scene)
+        results = {t.id: checker.check(t, scene, 10, None) for t in session.query(TalentDB).filter(TalentDB.id >= 11)}
+    assert results[11].reason == "Role involves 'Kissing', which conflicts with their sexual orientation."
+    assert results[12].reason == "Role involves 'Anal', which conflicts with their sexual orientation."
+    assert results[13].reason == "Strongly dislikes performing the 'Performer' role in 'Kissing'."
+    assert {talent_id: result.code for talent_id, result in results.items()} == {
+        talent_id: refusals[talent_id] for talent_id in (11, 12, 13)
+    }
+
+def test_candidate_filters_agree_with_check(session_factory):
+    _populate(session_factory)
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    with session_factory() as session:
+        scene = session.get(SceneDB, 1).to_dataclass(Scene)
+        bloc_db = session.get(ShootingBlocDB, 1)
+        females = session.query(TalentDB).filter(TalentDB.gender == "Female")
+        passing = {t.id for t in females.filter(*checker.candidate_filters(scene, 10, bloc_db))}
+        accepted = {t.id for t in females if checker.check(t, scene, 10, bloc_db).is_available}
+
+    assert passing == accepted == {1, 6}
+
+def _add_casting_scene(session_factory, scene_id: int):
+    vp_id, segment_id = scene_id * 10, scene_id * 100
+    with session_factory() as session:
+        session.add(SceneDB(id=scene_id, bloc_id=1, title=f"Scene {scene_id}", status='casting'))
+        session.add_all([VirtualPerformerDB(id=vp_id, scene_id=scene_id, name="VP 1", gender="Female", ethnicity="Any"),
+                         VirtualPerformerDB(id=vp_id + 1, scene_id=scene_id, name="VP 2", gender="Male", ethnicity="Any")])
+        session.add(ActionSegmentDB(id=segment_id, scene_id=scene_id, tag_name="Anal", runtime_percentage=100,
+                                    parameters={'Giver': 1, 'Receiver': 1}))
+        session.add_all([SlotAssignmentDB(segment_id=segment_id, slot_id="Anal_Receiver_1", virtual_performer_id=vp_id),
+                         SlotAssignmentDB(segment_id=segment_id, slot_id="Anal_Giver_1", virtual_performer_id=vp_id + 1)])
+        session.commit()
+
+def test_available_roles_use_a_fixed_number_of_queries(session_factory):
+    _populate(session_factory)
+    checker = TalentAvailabilityChecker(DATA_MANAGER, CONFIG)
+    query_service = GameQueryService(session_factory)
+    demand_calculator = TalentDemandCalculator(session_factory, DATA_MANAGER, query_service, CONFIG, checker)
+    service = TalentQueryService(session_factory, DATA_MANAGER, demand_calculator, query_service, CONFIG, checker)
+    statements = []
+    event.listen(session_factory.kw['bind'], 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    def count_queries(talent_id: int):
+        statements.clear()
+        roles = service.find_available_roles_for_talent(talent_id)
+        return roles, len(statements)
+
+    roles, one_scene = count_queries(3)
+    assert [(r['scene_id'], r['virtual_performer_id'], r['is_available']) for r in roles] == [(1, 10, False)]
+
+    for scene_id in (2, 3, 4):
+        _add_casting_scene(session_factory, scene_id)
+    roles, four_scenes = count_queries(1)
+
+    assert four_scenes == one_scene
+    assert [r['virtual_performer_id'] for r in roles] == [10, 20, 30, 40]
+    assert all(r['is_available'] and r['tags'] == ['Anal (Receiver)'] for r in roles)
+    assert [r['cost'] for r in roles] == [demand_calculator.calculate_talent_demand(1, r['scene_id'], r['virtual_performer_id'])
+                                         for r in roles]
+
+def test_role_demands_match_the_scalar_path(session_factory):
+    _populate(session_factory)
+    with session_factory() as session:
+        for talent in session.query(TalentDB):
+            talent.performance = 13.7 * talent.id
+            talent.ambition = talent.id
+        session.add_all([TalentPopularityDB(talent_id=talent_id, market_group_name=group, base_score=base_score,
+                                            last_updated_week=2010 * 52 + week)
+                         for talent_id in (1, 3, 6)
+                         for group, base_score, week in (("Men", 31.3 * talent_id, 5), ("Women", 7.9, 2))])
+        # A total that a plain left-to-right sum gets wrong in some orders (0.0 instead of 1.0).
+        session.add_all([TalentPopularityDB(talent_id=2, market_group_name=group, base_score=base_score,
+                                            last_updated_week=2010 * 52 + 5)
+                         for group, base_score in (("Women", 1e16), ("Couples", -1e16), ("Men", 1.0))])
+        session.commit()
+    tag_definitions = {'Anal': {'name': 'Anal', 'slots': [{'role': 'Giver', 'demand_modifier': 1.1},
+                                                          {'role': 'Receiver', 'demand_modifier': 1.7}]}}
+    data_manager = SimpleNamespace(**{**vars(DATA_MANAGER), 'tag_definitions': tag_definitions})
+    checker = TalentAvailabilityChecker(data_manager, CONFIG)
+    demand_calculator = TalentDemandCalculator(session_factory, data_manager, GameQueryService(session_factory), CONFIG, checker)
+
+    demands = demand_calculator.calculate_role_demands(1, 10, [1, 2, 3, 4, 5, 6, 7, 99])
+
+    assert demands == {talent_id: demand_calculator.calculate_talent_demand(talent_id, 1, 10) for talent_id in range(1, 8)}
+    assert len(set(demands.values())) == len(demands)
+    role_modifier = 1.7
+    assert demands[2] == demand_calculator.calculate_demands([13.7 * 2], [2], [1.0], [[1.0]], role_modifier)[0]
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import (Base, GameInfoDB, TalentDB, TalentPopularityDB, MarketGroupStateDB,
+                                GoToListCategoryDB, GoToListAssignmentDB)
+from services.models.list_rows import TalentListRow
+from services.query.game_query_service import GameQueryService
+
+@pytest.fixture
+def service():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as session:
+        session.add_all([GameInfoDB(key='week', value='10'), GameInfoDB(key='year', value='2010'),
+                         GameInfoDB(key='popularity_decay_rate', value='0.5')])
+        session.add_all([MarketGroupStateDB(name=name, current_saturation=1.0) for name in ("Men", "Women")])
+        session.add_all([
+            TalentDB(id=1, alias="Bea", age=30, gender="Female", ethnicity="Asian", boob_cup="D", performance=60.0),
+            TalentDB(id=2, alias="Al", age=40, gender="Male", ethnicity="White", dick_size=7),
+            TalentDB(id=3, alias="Cy", age=22, gender="Male", ethnicity="White", dick_size=9),
+        ])
+        session.add_all([
+            TalentPopularityDB(talent_id=1, market_group_name="Men", base_score=40.0, last_updated_week=2010 * 52 + 10),
+            # Two weeks of decay at 0.5 a week.
+            TalentPopularityDB(talent_id=1, market_group_name="Women", base_score=20.0, last_updated_week=2010 * 52 + 8),
+        ])
+        session.add(GoToListCategoryDB(id=1, name="Favorites"))
+        session.add_all([GoToListAssignmentDB(category_id=1, talent_id=2), GoToListAssignmentDB(category_id=1, talent_id=3)])
+        session.commit()
+    yield GameQueryService(factory)
+    engine.dispose()
+
+def test_rows_hold_the_listed_columns_and_decayed_popularity(service):
+    rows = service.get_filtered_talents({})
+
+    assert [row.alias for row in rows] == ["Al", "Bea", "Cy"]
+    bea = rows[1]
+    assert isinstance(bea, TalentListRow) and not hasattr(bea, '__dict__')
+    assert (bea.id, bea.age, bea.boob_cup, bea.performance, bea.dick_size) == (1, 30, "D", 60.0, None)
+    assert bea.popularity == pytest.approx(40.0 + 20.0 * 0.25)
+    assert rows[0].popularity == 0.0
+
+@pytest.mark.parametrize("filters, expected", [
+    ({'gender': 'Male'}, [2, 3]),
+    ({'age_max': 30}, [1, 3]),
+    ({'go_to_list_only': True, 'go_to_category_id': 1, 'gender': 'Male'}, [2, 3]),
+    ({'go_to_list_only': True, 'go_to_category_id': -1, 'ethnicity': 'Asian'}, []),
+])
+def test_filters_apply_to_rows(service, filters, expected):
+    assert [row.id for row in service.get_filtered_talents(filters)] == expected
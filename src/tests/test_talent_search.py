@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.db_models import Base, TalentDB
+from database.migrations import run_migrations
+from database.talent_search import trigram_search_supported
+from services.query.game_query_service import GameQueryService
+
+pytestmark = pytest.mark.skipif(not trigram_search_supported(), reason="needs SQLite FTS5 with the trigram tokenizer")
+
+ALIASES = {1: "Ava Stone", 2: "Savannah Lee", 3: "Eva Avalon", 4: "Mia 100% Real", 5: 'Jo "JJ" Fox'}
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as session:
+        session.add_all([TalentDB(id=talent_id, alias=alias, age=25, gender="Female", ethnicity="White")
+                         for talent_id, alias in ALIASES.items()])
+        session.commit()
+    yield factory
+    engine.dispose()
+
+@pytest.mark.parametrize("text, expected", [
+    ("ava", {1, 2, 3}),       # case-insensitive substring, through the index
+    ("AVALON", {3}),
+    ("av", {1, 2, 3}),        # too short for a trigram: LIKE
+    ("100%", {4}),            # LIKE and FTS5 syntax are matched literally
+    ('"JJ"', {5}),
+    ("_", set()),
+    ("zzz", set()),
+])
+def test_search_matches_substrings(session_factory, text, expected):
+    service = GameQueryService(session_factory)
+    assert set(service.search_talent_ids(text)) == expected
+    assert {t.id for t in service.get_filtered_talents({'text': text})} == expected
+
+def test_best_matches_come_first(session_factory):
+    # The text is most of "Ava Stone" and least of "Savannah Lee".
+    assert GameQueryService(session_factory).search_talent_ids("ava") == [1, 3, 2]
+
+def test_index_follows_inserts_renames_and_deletes(session_factory):
+    service = GameQueryService(session_factory)
+    with session_factory() as session:
+        session.add(TalentDB(id=6, alias="Avery Black", age=30, gender="Female", ethnicity="White"))
+        session.get(TalentDB, 1).alias = "Lena Stone"
+        session.delete(session.get(TalentDB, 2))
+        session.commit()
+
+    assert set(service.search_talent_ids("ave")) == {6}
+    assert set(service.search_talent_ids("ava")) == {3}
+    assert service.search_talent_ids("stone") == [1]
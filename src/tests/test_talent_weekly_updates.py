@@ -0,0 +1,201 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, selectinload
+
+from data.game_state import Talent
+from database.db_models import (
+    Base, TalentDB, TalentPopularityDB, MarketGroupStateDB, GameInfoDB, SceneDB, SceneCastDB,
+    VirtualPerformerDB, POPULARITY_DECAY_RATE_KEY, DEFAULT_POPULARITY_DECAY_RATE
+)
+from database.migrations import run_migrations
+from services.command.talent_command_service import TalentCommandService
+from services.query.game_query_service import GameQueryService
+from services.calculation.talent_affinity_calculator import TalentAffinityCalculator
+
+AGE_RULES = [
+    {'tag': 'Teen', 'min_age': 18, 'max_age': 19, 'affinity_score': 5},
+    {'tag': 'Teen', 'min_age': 20, 'max_age': 99, 'affinity_score': 0},
+    {'tag': 'MILF', 'min_age': 35, 'max_age': 99, 'affinity_score': 4},
+]
+
+@pytest.fixture
+def session():
+    """Creates a fresh, in-memory database session for each test."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+    engine.dispose()
+
+@pytest.fixture
+def service():
+    config = SimpleNamespace(popularity_gain_scalar=0.05, age_based_affinity_rules=AGE_RULES)
+    return TalentCommandService(None, config, TalentAffinityCalculator(config))
+
+def _make_talent(talent_id: int, **overrides) -> TalentDB:
+    values = dict(
+        id=talent_id, alias=f"Talent {talent_id}", age=25, ethnicity="White", gender="Female",
+        performance=50.0, acting=50.0, stamina=50.0, dom_skill=50.0, sub_skill=50.0, ambition=5,
+        tag_affinities={}
+    )
+    values.update(overrides)
+    return TalentDB(**values)
+
+def _make_fatigued_talent(talent_id: int, fatigue: int, end_week: int, end_year: int) -> TalentDB:
+    return _make_talent(talent_id, fatigue=fatigue, fatigue_end_week=end_week, fatigue_end_year=end_year,
+                        fatigue_end_date=end_year * 52 + end_week)
+
+def test_empty_pool_reports_no_change(session, service):
+    assert service.process_weekly_updates(session, 2010 * 52 + 1, new_year=False) is False
+
+def _set_clock(session, week: int, year: int, decay_rate: float = None):
+    session.add_all([GameInfoDB(key='week', value=str(week)), GameInfoDB(key='year', value=str(year))])
+    if decay_rate is not None:
+        session.add(GameInfoDB(key=POPULARITY_DECAY_RATE_KEY, value=str(decay_rate)))
+
+def test_weekly_updates_do_not_write_popularity(session, service):
+    _set_clock(session, 1, 2010)
+    session.add(MarketGroupStateDB(name="Straight Men", current_saturation=1.0))
+    session.add(_make_talent(1))
+    session.add(TalentPopularityDB(talent_id=1, market_group_name="Straight Men", base_score=80.0, last_updated_week=2010 * 52 + 1))
+    session.commit()
+
+    assert service.process_weekly_updates(session, 2010 * 52 + 1, new_year=False) is True
+    session.commit()
+
+    row = session.query(TalentPopularityDB).filter_by(talent_id=1).one()
+    assert (row.base_score, row.last_updated_week) == (80.0, 2010 * 52 + 1)
+
+@pytest.mark.parametrize("decay_rate, expected_rate", [(None, DEFAULT_POPULARITY_DECAY_RATE), (0.9, 0.9)])
+def test_popularity_decays_on_read(session, decay_rate, expected_rate):
+    _set_clock(session, 10, 2010, decay_rate)
+    session.add(MarketGroupStateDB(name="Straight Men", current_saturation=1.0))
+    session.add(_make_talent(1))
+    session.add(TalentPopularityDB(talent_id=1, market_group_name="Straight Men", base_score=80.0, last_updated_week=2010 * 52 + 7))
+    session.commit()
+
+    talent = session.query(TalentDB).options(selectinload(TalentDB.popularity_scores)).one()
+    assert talent.popularity_scores[0].score == pytest.approx(80.0 * expected_rate ** 3)
+    assert talent.to_dataclass(Talent).popularity["Straight Men"] == pytest.approx(80.0 * expected_rate ** 3)
+
+def test_release_gain_builds_on_decayed_score(session, service):
+    _set_clock(session, 10, 2010)
+    session.add(MarketGroupStateDB(name="Straight Men", current_saturation=1.0))
+    session.add(_make_talent(1))
+    session.add(TalentPopularityDB(talent_id=1, market_group_name="Straight Men", base_score=50.0, last_updated_week=2010 * 52 + 8))
+    session.add(SceneDB(id=1, title="Scene", status='released', viewer_group_interest={"Straight Men": 10.0, "Gay Men": 4.0}))
+    session.add(VirtualPerformerDB(id=1, scene_id=1, name="VP"))
+    session.add(SceneCastDB(scene_id=1, virtual_performer_id=1, talent_id=1, salary=100))
+    session.commit()
+
+    service.update_popularity_from_scene(session, 1)
+    session.commit()
+
+    rows = {p.market_group_name: p for p in session.query(TalentPopularityDB)}
+    decayed = 50.0 * DEFAULT_POPULARITY_DECAY_RATE ** 2
+    assert rows["Straight Men"].base_score == pytest.approx(service._calculate_new_popularity_score(decayed, 10.0))
+    assert rows["Straight Men"].last_updated_week == 2010 * 52 + 10
+    assert rows["Gay Men"].score == pytest.approx(service._calculate_new_popularity_score(0.0, 4.0))
+
+def test_fatigue_expires_only_when_recovery_has_passed(session, service):
+    session.add_all([
+        _make_fatigued_talent(1, 30, 10, 2010),
+        _make_fatigued_talent(2, 30, 11, 2010),
+        _make_fatigued_talent(3, 30, 1, 2011),
+        _make_talent(4),
+    ])
+    session.commit()
+
+    service.process_weekly_updates(session, 2010 * 52 + 10, new_year=False)
+    session.commit()
+
+    fatigue = dict(session.query(TalentDB.id, TalentDB.fatigue).all())
+    assert fatigue == {1: 0, 2: 30, 3: 30, 4: 0}
+    expired = session.get(TalentDB, 1)
+    assert (expired.fatigue_end_week, expired.fatigue_end_year, expired.fatigue_end_date) == (0, 0, 0)
+
+def test_fatigue_expiry_uses_the_end_date_index(session, service):
+    plan = session.execute(text(
+        "EXPLAIN QUERY PLAN UPDATE talents SET fatigue = 0 WHERE fatigue_end_date BETWEEN 1 AND 100"
+    )).all()
+    assert any("ix_talents_fatigue_end_date" in row[-1] for row in plan)
+
+def test_hide_fatigued_filter_uses_current_date(session):
+    _set_clock(session, 10, 2010)
+    session.add_all([
+        _make_fatigued_talent(1, 30, 10, 2010),
+        _make_fatigued_talent(2, 30, 9, 2010),
+        _make_talent(3),
+    ])
+    session.commit()
+    query_service = GameQueryService(lambda: session)
+
+    assert [t.id for t in query_service.get_filtered_talents({'hide_fatigued': True})] == [2, 3]
+    assert len(query_service.get_filtered_talents({'hide_fatigued': False})) == 3
+
+def test_upgrade_backfills_fatigue_end_date(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.sqlite'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as old_session:
+        old_session.add_all([_make_fatigued_talent(1, 30, 12, 2010), _make_talent(2)])
+        old_session.commit()
+    with engine.begin() as conn:
+        # Turn it into a save from before fatigue_end_date existed.
+        conn.exec_driver_sql("DROP INDEX ix_talents_fatigue_end_date")
+        conn.exec_driver_sql("ALTER TABLE talents DROP COLUMN fatigue_end_date")
+
+    run_migrations(engine)
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        rows = dict(conn.exec_driver_sql("SELECT id, fatigue_end_date FROM talents").all())
+        indexes = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(talents)")}
+    engine.dispose()
+    assert rows == {1: 2010 * 52 + 12, 2: 0}
+    assert "ix_talents_fatigue_end_date" in indexes
+
+def test_new_year_ages_talent_and_reapplies_affinity_rules(session, service):
+    session.add_all([
+        _make_talent(1, age=18, tag_affinities={'Teen': 5, 'Petite': 3}),
+        _make_talent(2, age=19, tag_affinities={'Teen': 5}),
+        _make_talent(3, age=34, tag_affinities=None),
+    ])
+    session.commit()
+
+    service.process_weekly_updates(session, 2010 * 52 + 52, new_year=True)
+    session.commit()
+    session.expire_all()
+
+    t1, t2, t3 = (session.get(TalentDB, i) for i in (1, 2, 3))
+    assert (t1.age, t2.age, t3.age) == (19, 20, 35)
+    assert t1.tag_affinities == {'Teen': 5, 'Petite': 3}
+    assert t2.tag_affinities == {'Teen': 0}
+    assert t3.tag_affinities == {'Teen': 0, 'MILF': 4}
+
+def test_age_rules_compile_into_ranges(service):
+    ranges = service.talent_affinity_calculator.age_affinity_ranges()
+
+    # Teen 18-19 and 20-34 differ; from 35 the MILF rule joins the later Teen rule.
+    assert ranges == [
+        (18, 19, {'Teen': 5}),
+        (20, 34, {'Teen': 0}),
+        (35, 99, {'Teen': 0, 'MILF': 4}),
+    ]
+
+def test_new_year_matches_affinity_calculator(session, service):
+    """The bulk pass must agree with the per-talent calculator used elsewhere."""
+    session.add(_make_talent(1, age=36, tag_affinities={'Teen': 2}))
+    session.commit()
+
+    service.process_weekly_updates(session, 2010 * 52 + 52, new_year=True)
+    session.commit()
+    session.expire_all()
+
+    talent = session.get(TalentDB, 1)
+    expected = service.talent_affinity_calculator.recalculate_talent_age_affinities(
+        SimpleNamespace(age=37, tag_affinities={'Teen': 2})
+    )
+    assert talent.tag_affinities == expected
@@ -0,0 +1,106 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from core.game_controller import GameController
+from core.game_signals import GameSignals
+from services.models.results import WeekAdvancementResult
+
+DATA_MANAGER = SimpleNamespace(game_config={}, market_data={}, affinity_data={}, tag_definitions={},
+                               generator_data={}, talent_archetypes=[], help_topics={})
+
+class StubTimeService:
+    """Returns the queued results in order, blocking each call until `release` is set."""
+    def __init__(self, *results: WeekAdvancementResult):
+        self.results = list(results)
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def advance_week(self, on_phase=None):
+        self.release.wait(5)
+        self.calls += 1
+        return self.results.pop(0)
+
+@pytest.fixture(scope="module")
+def qt_app():
+    yield QCoreApplication.instance() or QCoreApplication([])
+
+@pytest.fixture
+def controller(qt_app):
+    signals = GameSignals()
+    save_manager = SimpleNamespace(auto_save=lambda: None)
+    controller = GameController(None, DATA_MANAGER, None, save_manager, signals, None)
+    controller.game_state.week, controller.game_state.year, controller.game_state.money = 1, 2010, 1000
+    controller.query_service = SimpleNamespace(get_incomplete_scenes_for_week=lambda week, year: [])
+    controller.scene_command_service = SimpleNamespace(cast_talent_for_role=lambda *args: pytest.fail("cast while advancing"))
+    emitted = {name: [] for name in ('time_changed', 'scenes_changed', 'notification_posted')}
+    for name, calls in emitted.items():
+        getattr(signals, name).connect(lambda *args, calls=calls: calls.append(args))
+    controller.emitted = emitted
+    yield controller
+    controller.wait_for_week_advance()
+
+def _deliver(controller):
+    """Lets the running worker finish and delivers its queued result on this thread."""
+    controller.thread_pool.waitForDone()
+    QCoreApplication.processEvents()
+
+def test_paused_week_continues_when_the_event_is_resolved_before_the_worker_reports(controller):
+    controller.time_service = StubTimeService(
+        WeekAdvancementResult(new_week=1, new_year=2010, new_money=900, was_paused=True, scenes_shot=1),
+        WeekAdvancementResult(new_week=2, new_year=2010, new_money=800),
+    )
+    controller.time_service.release.clear()
+
+    controller.advance_week()
+    # The interactive event is resolved while the worker that raised it is still running.
+    controller._continue_week()
+    controller.time_service.release.set()
+    _deliver(controller)
+    assert controller.emitted['scenes_changed'] == [()]
+    _deliver(controller)
+
+    assert controller.time_service.calls == 2
+    assert not controller.is_advancing_week
+    assert (controller.game_state.week, controller.game_state.money) == (2, 800)
+    assert controller.emitted['time_changed'] == [(2, 2010)]
+
+def test_paused_week_waits_for_the_event(controller):
+    controller.time_service = StubTimeService(
+        WeekAdvancementResult(new_week=1, new_year=2010, new_money=900, was_paused=True)
+    )
+
+    controller.advance_week()
+    _deliver(controller)
+
+    assert controller.time_service.calls == 1
+    assert not controller.is_advancing_week
+    assert controller.game_state.money == 900
+    assert controller.emitted['time_changed'] == []
+
+def test_wait_for_week_advance_drops_the_pending_result(controller):
+    controller.time_service = StubTimeService(WeekAdvancementResult(new_week=2, new_year=2010, new_money=500))
+
+    controller.advance_week()
+    controller.wait_for_week_advance()
+    QCoreApplication.processEvents()
+
+    assert controller.time_service.calls == 1
+    assert not controller.is_advancing_week
+    assert (controller.game_state.week, controller.game_state.money) == (1, 1000)
+    assert controller.emitted['time_changed'] == []
+
+def test_write_commands_are_refused_while_advancing(controller):
+    controller.time_service = StubTimeService(WeekAdvancementResult(new_week=2, new_year=2010, new_money=500))
+    controller.time_service.release.clear()
+
+    controller.advance_week()
+    controller.cast_talent_for_virtual_performer(1, 1, 1, 100)
+    controller.time_service.release.set()
+    _deliver(controller)
+
+    assert controller.emitted['notification_posted'] == [("Please wait for the week to finish advancing.",)]
+    assert controller.game_state.money == 500
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.game_state import Talent
+from database.db_models import Base, GameInfoDB, MarketGroupStateDB, TalentDB
+from services.builders.world_builder import WorldBuilder
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+def _talent(talent_id: int, **overrides) -> Talent:
+    values = dict(id=talent_id, alias=f"Talent {talent_id}", age=20 + talent_id, ethnicity="White", gender="Female",
+                  performance=50.0, acting=40.0, stamina=60.0, dom_skill=30.0, sub_skill=70.0, ambition=5)
+    values.update(overrides)
+    return Talent(**values)
+
+def test_bulk_written_talents_load_back_unchanged(session_factory):
+    talents = [
+        _talent(1),
+        _talent(2, boob_cup="C", tag_affinities={'White': 100, 'Young': 40}, hard_limits=['Anal', 'Choking'],
+                tag_preferences={'Blowjob': {'Giver': 1.2}, 'Kissing': {'Giver': 0.9, 'Receiver': 1.0}}),
+        _talent(3, gender="Male", dick_size=8, concurrency_limits={'Anal': 1, 'Oral': 2},
+                policy_requirements={'requires': ['policy_condoms'], 'refuses': ['policy_no_breaks']},
+                popularity={'Mainstream': 12.5}),
+        _talent(4, fatigue=10, fatigue_end_week=8, fatigue_end_year=2010),
+        _talent(5),
+    ]
+    with session_factory() as session:
+        session.add_all([GameInfoDB(key='week', value='5'), GameInfoDB(key='year', value='2010')])
+        world = WorldBuilder(session, batch_size=2)
+        world.add_market_groups(["Mainstream", "Fetish"])
+        assert world.add_talents(iter(talents), start_date=2010 * 52 + 5) == 5
+        session.commit()
+
+    with session_factory() as session:
+        assert {m.name: m.current_saturation for m in session.query(MarketGroupStateDB)} == {"Mainstream": 1.0, "Fetish": 1.0}
+        loaded = [t.to_dataclass(Talent) for t in session.query(TalentDB).order_by(TalentDB.id)]
+        assert session.get(TalentDB, 4).fatigue_end_date == 2010 * 52 + 8
+        assert session.get(TalentDB, 1).fatigue_end_date == 0
+
+    assert loaded == talents
@@ -93,6 +93,8 @@ class SaveLoadDialog(GeometryManagerMixin, QDialog):
         for save in saves:
             # Format the display text
             display_text = f"{save['name']}\n"
+            display_text += f"W{save['week']}, {save['year']} | ${save['money']:,} | "
+            display_text += f"{save['stats']['scenes_released']} scenes released\n"
             display_text += f"Date: {save['date'].strftime('%Y-%m-%d %H:%M:%S')}\n"
             display_text += f"Size: {save['size']/1024:.1f} KB"
             
@@ -98,6 +98,13 @@ class TalentFilterDialog(GeometryManagerMixin, QDialog):
         go_to_layout.addWidget(self.category_combo)
         main_layout.addWidget(go_to_group)
 
+        # --- Availability Filter ---
+        availability_group = QGroupBox("Availability")
+        availability_layout = QVBoxLayout(availability_group)
+        self.hide_fatigued_checkbox = QCheckBox("Hide fatigued talent")
+        availability_layout.addWidget(self.hide_fatigued_checkbox)
+        main_layout.addWidget(availability_group)
+
         # --- Gender Filter ---
         gender_group = QGroupBox("Gender")
         gender_layout = QHBoxLayout(gender_group)
@@ -245,6 +252,9 @@ class TalentFilterDialog(GeometryManagerMixin, QDialog):
         index = self.category_combo.findData(filters.get('go_to_category_id', -1))
         if index != -1: self.category_combo.setCurrentIndex(index)
 
+        # Availability
+        self.hide_fatigued_checkbox.setChecked(filters.get('hide_fatigued', False))
+
         # Gender
         gender = filters.get('gender', 'Any')
         if gender == "Female": self.gender_female_radio.setChecked(True)
@@ -284,6 +294,7 @@ class TalentFilterDialog(GeometryManagerMixin, QDialog):
         return {
             'go_to_list_only': self.go_to_only_checkbox.isChecked(),
             'go_to_category_id': self.category_combo.currentData(),
+            'hide_fatigued': self.hide_fatigued_checkbox.isChecked(),
             'gender': 'Female' if self.gender_female_radio.isChecked() else 'Male' if self.gender_male_radio.isChecked() else 'Any',
             'age_min': age_min, 'age_max': age_max,
             'performance_min': perf_min, 'performance_max': perf_max,
@@ -1,12 +1,12 @@
 from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, QSortFilterProxyModel
 from typing import List
-from data.game_state import Scene
+from services.models.list_rows import SceneListRow
 from ui.view_models import SceneViewModel
 
 class SceneSortFilterProxyModel(QSortFilterProxyModel):
     """
     Custom proxy model to handle sorting specific columns numerically
-    instead of lexicographically. It operates on the raw Scene object
+    instead of lexicographically. It operates on the raw SceneListRow
     stored in the UserRole of the source model.
     """
     def __init__(self, parent=None):
@@ -31,9 +31,9 @@ class SceneSortFilterProxyModel(QSortFilterProxyModel):
         source_model = self.sourceModel()
         col = left.column()
 
-        # Get the underlying raw Scene objects for comparison
-        left_scene: Scene = source_model.data(left, Qt.ItemDataRole.UserRole)
-        right_scene: Scene = source_model.data(right, Qt.ItemDataRole.UserRole)
+        # Get the underlying raw SceneListRows for comparison
+        left_scene: SceneListRow = source_model.data(left, Qt.ItemDataRole.UserRole)
+        right_scene: SceneListRow = source_model.data(right, Qt.ItemDataRole.UserRole)
 
         if not left_scene or not right_scene:
             return super().lessThan(left, right)
@@ -63,7 +63,7 @@ class SceneTableModel(QAbstractTableModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._scenes_vm: List[SceneViewModel] = []
-        self._raw_scenes: List[Scene] = []
+        self._raw_scenes: List[SceneListRow] = []
         self._headers = ["Title", "Status", "Date", "Revenue", "Cast"]
 
     def rowCount(self, parent=QModelIndex()):
@@ -91,7 +91,7 @@ class SceneTableModel(QAbstractTableModel):
             elif col == 3: return vm.revenue_str
             elif col == 4: return vm.cast_str
         
-        # The UserRole provides the raw Scene object, which is used by the
+        # The UserRole provides the raw SceneListRow, which is used by the
         # SceneSortFilterProxyModel for accurate numerical sorting.
         if role == Qt.ItemDataRole.UserRole:
             if row < len(self._raw_scenes):
@@ -105,7 +105,7 @@ class SceneTableModel(QAbstractTableModel):
             return self._headers[section]
         return None
 
-    def update_data(self, scenes_vm: List[SceneViewModel], raw_scenes: List[Scene]):
+    def update_data(self, scenes_vm: List[SceneViewModel], raw_scenes: List[SceneListRow]):
         """
         Receives new data from the presenter and refreshes the model.
         """
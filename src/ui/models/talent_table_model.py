@@ -51,8 +51,9 @@ class TalentTableModel(QAbstractTableModel):
             if col == 13 and self.mode == 'casting': return item.demand
         
         elif role == Qt.ItemDataRole.UserRole:
-            # The ViewModel stores the full Talent dataclass for easy access
-            # by other parts of the UI (like opening a profile).
+            # The ViewModel stores the listed talent (a Talent dataclass, or a
+            # TalentListRow in the talent tab) for other parts of the UI, like
+            # opening a profile.
             return item.talent_obj
  
         return None
@@ -99,7 +100,7 @@ class TalentTableModel(QAbstractTableModel):
         if isinstance(item, CastingTalentCache):
             # Casting mode with CastingTalentCache - use all pre-calculated values
             cache_item = item
-            talent_obj = cache_item.talent_db
+            talent_obj = cache_item.talent
             demand = cache_item.demand
             # Use pre-calculated fuzzing from cache (eliminates duplicate calculation!)
             perf_fuzzed = cache_item.perf_range
@@ -111,7 +112,7 @@ class TalentTableModel(QAbstractTableModel):
         elif isinstance(item, TalentFilterCache):
             # Default mode: TalentFilterCache with pre-calculated fuzzing
             cache_item = item
-            talent_obj = cache_item.talent_db
+            talent_obj = cache_item.talent
             demand = 0
             # Use pre-calculated fuzzing from cache
             perf_fuzzed = cache_item.perf_range
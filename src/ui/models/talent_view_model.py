@@ -3,6 +3,7 @@ from typing import Union
 
 from data.game_state import Talent
 from database.db_models import TalentDB
+from services.models.list_rows import TalentListRow
 
 @dataclass
 class TalentViewModel:
@@ -14,7 +15,8 @@ class TalentViewModel:
     making the table model's `data()` and `sort()` methods extremely fast and simple.
     """
     # The original data object, preserved for UserRole lookups (e.g., for opening a profile).
-    talent_obj: Union[Talent, TalentDB]
+    # A TalentListRow in the talent tab; open the full talent by its id.
+    talent_obj: Union[Talent, TalentDB, TalentListRow]
 
     # --- Pre-formatted Display Strings (for DisplayRole) ---
     alias: str
@@ -3,7 +3,7 @@ from PyQt6.QtWidgets import QDialog
 from typing import TYPE_CHECKING, List
 
 from core.interfaces import IGameController
-from data.game_state import Talent
+from services.models.list_rows import TalentListRow
 from utils.formatters import get_fuzzed_skill_range
 from ui.presenters.talent_filter_cache import CastingTalentCache
 
@@ -28,36 +28,34 @@ class RoleCastingPresenter(QObject):
     
     def _load_initial_data(self):
         """Loads eligible talents and builds a cache with pre-calculated fuzzing and demand."""
-        # Get all TalentDB objects who are eligible and willing
-        eligible_talents_db = self.controller.get_eligible_talent_for_role(
+        # Get the list rows of all talent who are eligible and willing
+        eligible_talents = self.controller.get_eligible_talent_for_role(
              self.scene_id, self.vp_id
          )
+        # Price them all for the role at once
+        demands = self.controller.calculate_role_demands(
+            self.scene_id, self.vp_id, [row.id for row in eligible_talents]
+        )
         
         # Build CastingTalentCache objects with all pre-calculated values
         self._casting_cache = []
-        for t_db in eligible_talents_db:
+        for row in eligible_talents:
             # Calculate all 5 fuzzed skill ranges
-            perf_fuzzed = get_fuzzed_skill_range(t_db.performance, t_db.experience, t_db.id)
-            act_fuzzed = get_fuzzed_skill_range(t_db.acting, t_db.experience, t_db.id)
-            stam_fuzzed = get_fuzzed_skill_range(t_db.stamina, t_db.experience, t_db.id)
-            dom_fuzzed = get_fuzzed_skill_range(t_db.dom_skill, t_db.experience, t_db.id)
-            sub_fuzzed = get_fuzzed_skill_range(t_db.sub_skill, t_db.experience, t_db.id)
-            
-            # Pre-calculate popularity
-            popularity = round(sum(p.score for p in t_db.popularity_scores) if t_db.popularity_scores else 0)
-            
-            # Calculate role-specific demand
-            demand = self.controller.calculate_talent_demand(t_db.id, self.scene_id, self.vp_id)
+            perf_fuzzed = get_fuzzed_skill_range(row.performance, row.experience, row.id)
+            act_fuzzed = get_fuzzed_skill_range(row.acting, row.experience, row.id)
+            stam_fuzzed = get_fuzzed_skill_range(row.stamina, row.experience, row.id)
+            dom_fuzzed = get_fuzzed_skill_range(row.dom_skill, row.experience, row.id)
+            sub_fuzzed = get_fuzzed_skill_range(row.sub_skill, row.experience, row.id)
             
             cache_item = CastingTalentCache(
-                talent_db=t_db,
+                talent=row,
                 perf_range=(perf_fuzzed, perf_fuzzed) if isinstance(perf_fuzzed, int) else perf_fuzzed,
                 act_range=(act_fuzzed, act_fuzzed) if isinstance(act_fuzzed, int) else act_fuzzed,
                 stam_range=(stam_fuzzed, stam_fuzzed) if isinstance(stam_fuzzed, int) else stam_fuzzed,
                 dom_range=(dom_fuzzed, dom_fuzzed) if isinstance(dom_fuzzed, int) else dom_fuzzed,
                 sub_range=(sub_fuzzed, sub_fuzzed) if isinstance(sub_fuzzed, int) else sub_fuzzed,
-                popularity=popularity,
-                demand=demand
+                popularity=round(row.popularity),
+                demand=demands.get(row.id, 0)
             )
             self._casting_cache.append(cache_item)
 
@@ -79,23 +77,23 @@ class RoleCastingPresenter(QObject):
 
     @pyqtSlot(str)
     def _on_name_filter_changed(self, text: str):
-        """Filters the cached talent list by name."""
-        text_lower = text.lower()
-        if not text_lower:
+        """Filters the cached talent list by name, best matches first."""
+        if not text:
             self.view.update_talent_table(self._casting_cache)
             return
         
+        cache_by_id = {cache_item.talent.id: cache_item for cache_item in self._casting_cache}
         filtered_cache = [
-            cache_item for cache_item in self._casting_cache
-            if text_lower in cache_item.talent_db.alias.lower()
+            cache_by_id[talent_id] for talent_id in self.controller.search_talent_ids(text)
+            if talent_id in cache_by_id
         ]
         self.view.update_talent_table(filtered_cache)
         
     @pyqtSlot(object)
-    def _on_hire_requested(self, talent: Talent):
+    def _on_hire_requested(self, talent: TalentListRow):
         """Handles hiring - finds the cached demand instead of recalculating."""
         # Find the cached demand for this talent
-        cache_item = next((c for c in self._casting_cache if c.talent_db.id == talent.id), None)
+        cache_item = next((c for c in self._casting_cache if c.talent.id == talent.id), None)
         cost = cache_item.demand if cache_item else self.controller.calculate_talent_demand(talent.id, self.scene_id, self.vp_id)
         self.controller.cast_talent_for_virtual_performer(talent.id, self.scene_id, self.vp_id, cost)
         self.view.accept()
\ No newline at end of file
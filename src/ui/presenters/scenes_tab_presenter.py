@@ -3,7 +3,7 @@ from PyQt6.QtCore import QObject, pyqtSlot
 from PyQt6 import sip
 
 from core.interfaces import IGameController
-from data.game_state import Scene
+from services.models.list_rows import SceneListRow
 from ui.view_models import SceneViewModel
 
 if TYPE_CHECKING:
@@ -39,18 +39,18 @@ class ScenesTabPresenter(QObject):
         if not self.view or sip.isdeleted(self.view):
             return
             
-        raw_scenes = self.controller.get_shot_scenes()
-        view_models = self._create_view_models(raw_scenes)
+        scene_rows = self.controller.get_shot_scenes()
+        view_models = self._create_view_models(scene_rows)
         
-        # Pass both raw scenes (for sorting model) and view models (for display model)
-        self.view.update_scene_list(view_models, raw_scenes)
+        # Pass both raw rows (for sorting model) and view models (for display model)
+        self.view.update_scene_list(view_models, scene_rows)
         
         # After a refresh, the selection is cleared, so update buttons accordingly.
         self.on_selection_changed(None)
 
-    def _create_view_models(self, scenes: List[Scene]) -> List[SceneViewModel]:
+    def _create_view_models(self, scenes: List[SceneListRow]) -> List[SceneViewModel]:
         """
-        Converts a list of raw Scene data objects into a list of display-ready
+        Converts a list of scene list rows into a list of display-ready
         SceneViewModel objects. This isolates data processing logic from the view.
         """
         view_models = []
@@ -64,15 +64,11 @@ class ScenesTabPresenter(QObject):
             # --- Revenue String ---
             revenue_str = f"${scene.revenue:,}" if scene.status == 'released' else "N/A"
 
-            # --- Cast String (Complex logic now lives here) ---
-            if not scene.final_cast:
-                cast_str = f"({len(scene.virtual_performers)} roles uncast)"
+            # --- Cast String (aliases are joined by the query) ---
+            if not scene.cast_count:
+                cast_str = f"({scene.role_count} roles uncast)"
             else:
-                talent_aliases = []
-                for talent_id in scene.final_cast.values():
-                    talent = self.controller.get_talent_by_id(talent_id)
-                    talent_aliases.append(talent.alias if talent else f"ID {talent_id}?")
-                cast_str = ", ".join(talent_aliases)
+                cast_str = scene.cast_aliases
 
             vm = SceneViewModel(
                 scene_id=scene.id,
@@ -1,12 +1,12 @@
 from dataclasses import dataclass
 from typing import Tuple
 
-from database.db_models import TalentDB
+from services.models.list_rows import TalentListRow
 
 @dataclass
 class TalentFilterCache:
     """A lightweight container for pre-calculated talent data used for fast filtering and display."""
-    talent_db: TalentDB
+    talent: TalentListRow
     # Fuzzed skill ranges for filtering
     perf_range: Tuple[int, int]
     act_range: Tuple[int, int]
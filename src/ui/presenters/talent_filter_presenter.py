@@ -21,6 +21,7 @@ class TalentFilterPresenter(QObject):
         self.default_filters = {
             'go_to_list_only': False,
             'go_to_category_id': -1,
+            'hide_fatigued': False,
             'gender': 'Any',
             'age_min': 18, 'age_max': 99,
             'performance_min': 0, 'performance_max': 100,
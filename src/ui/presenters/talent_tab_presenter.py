@@ -5,7 +5,7 @@ from core.interfaces import IGameController
 from ui.tabs.talent_tab import TalentTab
 from ui.dialogs.talent_filter_dialog import TalentFilterDialog
 from data.game_state import Talent
-from database.db_models import TalentDB
+from services.models.list_rows import TalentListRow
 from utils.formatters import get_fuzzed_skill_range
 from ui.presenters.talent_filter_cache import TalentFilterCache
 
@@ -21,7 +21,7 @@ class TalentTabPresenter(QObject):
         self.filter_dialog = None
 
         # --- Caching Mechanism ---
-        self._all_talents_for_filtering: List[TalentDB] = []
+        self._all_talents_for_filtering: List[TalentListRow] = []
         self._talent_filter_cache: Dict[int, TalentFilterCache] = {}
         self._cache_is_dirty = True
 
@@ -61,25 +61,22 @@ class TalentTabPresenter(QObject):
         self._all_talents_for_filtering = self.controller.get_filtered_talents({})
         self._talent_filter_cache.clear()
 
-        for t_db in self._all_talents_for_filtering:
+        for row in self._all_talents_for_filtering:
             # Calculate all 5 fuzzed skill ranges
-            perf_fuzzed = get_fuzzed_skill_range(t_db.performance, t_db.experience, t_db.id)
-            act_fuzzed = get_fuzzed_skill_range(t_db.acting, t_db.experience, t_db.id)
-            stam_fuzzed = get_fuzzed_skill_range(t_db.stamina, t_db.experience, t_db.id)
-            dom_fuzzed = get_fuzzed_skill_range(t_db.dom_skill, t_db.experience, t_db.id)
-            sub_fuzzed = get_fuzzed_skill_range(t_db.sub_skill, t_db.experience, t_db.id)
-            
-            # Pre-calculate popularity
-            popularity = round(sum(p.score for p in t_db.popularity_scores) if t_db.popularity_scores else 0)
-
-            self._talent_filter_cache[t_db.id] = TalentFilterCache(
-                talent_db=t_db,
+            perf_fuzzed = get_fuzzed_skill_range(row.performance, row.experience, row.id)
+            act_fuzzed = get_fuzzed_skill_range(row.acting, row.experience, row.id)
+            stam_fuzzed = get_fuzzed_skill_range(row.stamina, row.experience, row.id)
+            dom_fuzzed = get_fuzzed_skill_range(row.dom_skill, row.experience, row.id)
+            sub_fuzzed = get_fuzzed_skill_range(row.sub_skill, row.experience, row.id)
+
+            self._talent_filter_cache[row.id] = TalentFilterCache(
+                talent=row,
                 perf_range=(perf_fuzzed, perf_fuzzed) if isinstance(perf_fuzzed, int) else perf_fuzzed,
                 act_range=(act_fuzzed, act_fuzzed) if isinstance(act_fuzzed, int) else act_fuzzed,
                 stam_range=(stam_fuzzed, stam_fuzzed) if isinstance(stam_fuzzed, int) else stam_fuzzed,
                 dom_range=(dom_fuzzed, dom_fuzzed) if isinstance(dom_fuzzed, int) else dom_fuzzed,
                 sub_range=(sub_fuzzed, sub_fuzzed) if isinstance(sub_fuzzed, int) else sub_fuzzed,
-                popularity=popularity
+                popularity=round(row.popularity)
             )
         self._cache_is_dirty = False
 
@@ -133,12 +130,12 @@ class TalentTabPresenter(QObject):
 
         # Step 3: Apply slow Python-side filters using the pre-calculated cache.
         # Iterate over the filtered DB results (Proposal 3 optimization)
-        # Pass cache items (with pre-calculated fuzzing) instead of raw TalentDB objects
+        # Pass cache items (with pre-calculated fuzzing) instead of raw list rows
         cache_items_passing_skills = [
-            self._talent_filter_cache[t_db.id]
-            for t_db in talents_from_db
-            if t_db.id in self._talent_filter_cache and 
-               self._talent_passes_cached_skill_filters(self._talent_filter_cache[t_db.id], all_filters)
+            self._talent_filter_cache[row.id]
+            for row in talents_from_db
+            if row.id in self._talent_filter_cache and 
+               self._talent_passes_cached_skill_filters(self._talent_filter_cache[row.id], all_filters)
         ]
         
         self.view.update_talent_list(cache_items_passing_skills)
@@ -172,11 +169,12 @@ class TalentTabPresenter(QObject):
         self.filter_dialog = None
     
     @pyqtSlot(object)
-    def on_open_talent_profile(self, talent: Union[Talent, TalentDB]):
-        # The UserRole might now return a TalentDB object, handle both cases.
-        if isinstance(talent, TalentDB):
-            talent = talent.to_dataclass(Talent)
-        self.ui_manager.show_talent_profile(talent)
+    def on_open_talent_profile(self, talent: Union[Talent, TalentListRow]):
+        # The list holds TalentListRows; the profile needs the full talent.
+        if isinstance(talent, Talent):
+            self.ui_manager.show_talent_profile(talent)
+        else:
+            self.ui_manager.show_talent_profile_by_id(talent.id)
 
     @pyqtSlot(str)
     def on_help_requested(self, topic_key: str):
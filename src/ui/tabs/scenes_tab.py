@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex
 
-from data.game_state import Scene
+from services.models.list_rows import SceneListRow
 from ui.models.scene_table_models import SceneTableModel, SceneSortFilterProxyModel
 from ui.view_models import SceneViewModel
 
@@ -53,7 +53,7 @@ class ScenesTab(QWidget):
         # Initial state
         self.manage_scene_btn.setEnabled(False)
 
-    def update_scene_list(self, scene_vms: List[SceneViewModel], raw_scenes: List['Scene']):
+    def update_scene_list(self, scene_vms: List[SceneViewModel], raw_scenes: List[SceneListRow]):
         """Receives new data from the presenter and updates the table model."""
         self.source_model.update_data(scene_vms, raw_scenes)
 
@@ -5,6 +5,14 @@ from PyQt6.QtWidgets import ( QHBoxLayout, QLabel, QPushButton, QSizePolicy,
 
 from ui.widgets.help_button import HelpButton
 
+WEEK_PHASE_LABELS = {
+    "market": "Updating market",
+    "shooting": "Shooting scenes",
+    "post_production": "Post-production",
+    "talents": "Updating talent",
+    "save": "Autosaving",
+}
+
 class TopBarWidget(QWidget):
     help_requested = pyqtSignal(str)
     def __init__(self, controller, parent=None):
@@ -15,6 +23,8 @@ class TopBarWidget(QWidget):
 
         self.controller.signals.money_changed.connect(self.update_money_display)
         self.controller.signals.time_changed.connect(self.update_time_display)
+        self.controller.signals.week_advance_running.connect(self.set_week_advance_running)
+        self.controller.signals.week_advance_progress.connect(self.update_week_progress)
 
     def setup_ui(self):
         layout = QHBoxLayout(self)
@@ -24,10 +34,19 @@ class TopBarWidget(QWidget):
         menu_btn.clicked.connect(self._on_menu_clicked)
         layout.addWidget(menu_btn)
 
-        next_week_btn = QPushButton("Next Week ►")
-        next_week_btn.setToolTip("Advance to the next week")
-        next_week_btn.clicked.connect(self.controller.advance_week)
-        layout.addWidget(next_week_btn)
+        self.next_week_btn = QPushButton("Next Week ►")
+        self.next_week_btn.setToolTip("Advance to the next week")
+        self.next_week_btn.clicked.connect(self.controller.advance_week)
+        layout.addWidget(self.next_week_btn)
+
+        self.fast_forward_btn = QPushButton("Skip ►►")
+        self.fast_forward_btn.setToolTip("Advance until the next scheduled shoot or finished edit")
+        self.fast_forward_btn.clicked.connect(lambda: self.controller.fast_forward())
+        layout.addWidget(self.fast_forward_btn)
+
+        self.week_progress_label = QLabel()
+        self.week_progress_label.setVisible(False)
+        layout.addWidget(self.week_progress_label)
 
         layout.addStretch()
         help_btn = HelpButton("overview", self)
@@ -61,6 +80,16 @@ class TopBarWidget(QWidget):
     def update_time_display(self, week: int, year: int):
         self.time_label.setText(f"Week {week}, {year}")
 
+    def set_week_advance_running(self, running: bool):
+        self.next_week_btn.setEnabled(not running)
+        self.fast_forward_btn.setEnabled(not running)
+        self.week_progress_label.setVisible(running)
+        if not running:
+            self.week_progress_label.clear()
+
+    def update_week_progress(self, phase: str):
+        self.week_progress_label.setText(f"{WEEK_PHASE_LABELS.get(phase, phase)}...")
+
     def update_initial_state(self):
         self.update_money_display(self.controller.game_state.money)
         self.update_time_display(